@@ -0,0 +1,56 @@
+"""
+Animated SurfaceGlobe: a day of hourly fields played back on a fixed grid
+
+The geometry is sent once; playing or scrubbing only swaps the per-frame
+values. By default all frames are preloaded as uint8 codes:
+
+    python animated_globe.py
+
+or streamed one frame at a time from Python as the frame changes:
+
+    bokeh serve --show animated_globe.py --args stream
+"""
+import sys
+
+import numpy as np
+from bokeh.io import curdoc, show, output_file
+from bokeh.layouts import column
+from surface_globe import create_globe, frame_controls
+
+STREAM = "stream" in sys.argv[1:]
+
+# Generate data
+n_lat, n_lon = 90, 180
+lats = np.linspace(-89, 89, n_lat)
+lons = np.linspace(-179, 179, n_lon)
+lon_grid, lat_grid = np.meshgrid(lons, lats)
+hours = np.arange(24)
+
+
+def temperature(hour):
+    # Latitude gradient plus a diurnal bump that follows the sun westwards
+    solar_lon = 180 - 15 * hour
+    diurnal = 8 * np.cos(np.radians(lon_grid - solar_lon)).clip(0) * np.cos(np.radians(lat_grid))
+    return 30 - 50 * np.abs(lat_grid) / 90 + diurnal
+
+
+labels = [f"Hour {hour:02d}:00 UTC" for hour in hours]
+
+if STREAM:
+    # Only the first frame up front; n_frames lets the browser drive playback
+    globe = create_globe(lon_grid.ravel(), lat_grid.ravel(), temperature(0).ravel(), n_lat, n_lon,
+                         vmin=-20, vmax=38, show_coastlines=True, width=900, height=800)
+    globe.n_frames = len(hours)
+
+    def update_frame(attr, old, new):
+        globe.values = temperature(hours[new]).ravel().astype(np.float32)
+
+    globe.on_change('frame', update_frame)
+    curdoc().add_root(column(globe, frame_controls(globe, labels=labels)))
+else:
+    frames = np.stack([temperature(hour) for hour in hours])
+    globe = create_globe(lon_grid.ravel(), lat_grid.ravel(), None, n_lat, n_lon,
+                         frames=frames, quantize=True, frame_rate=6,
+                         show_coastlines=True, width=900, height=800)
+    output_file("animated_globe.html")
+    show(column(globe, frame_controls(globe, labels=labels)))
@@ -19,9 +19,9 @@ temps = 30 - 50 * np.abs(lat_grid) / 90
 temps += 10 * np.sin(np.radians(lon_grid) * 3) * np.cos(np.radians(lat_grid) * 2)
 
 # Flatten
-lons_flat = lon_grid.flatten().tolist()
-lats_flat = lat_grid.flatten().tolist()
-temps_flat = temps.flatten().tolist()
+lons_flat = lon_grid.ravel()
+lats_flat = lat_grid.ravel()
+temps_flat = temps.ravel()
 
 # Create the globe widget
 globe = create_globe(
@@ -98,6 +98,14 @@ palette_select = Select(
     width=180
 )
 
+# Renderer dropdown
+backend_select = Select(
+    title="Renderer",
+    value="canvas",
+    options=["canvas", "webgl"],
+    width=180
+)
+
 # vmin input
 vmin_input = TextInput(
     title="vmin (leave empty for auto)",
@@ -128,7 +136,7 @@ apply_button = Button(
 
 # Hover checkbox
 hover_checkbox = CheckboxGroup(
-    labels=["Enable Hover Tooltip"],
+    labels=["Enable Hover Tooltip", "Show Frame Time"],
     active=[0],
     width=180
 )
@@ -140,6 +148,7 @@ rotation_slider.js_link('value', globe, 'rotation')
 tilt_slider.js_link('value', globe, 'tilt')
 zoom_slider.js_link('value', globe, 'zoom')
 rotation_speed_slider.js_link('value', globe, 'rotation_speed')
+backend_select.js_link('value', globe, 'output_backend')
 
 # Projection change callback - disable rotation for flat projections
 projection_callback = CustomJS(
@@ -234,6 +243,7 @@ hover_callback = CustomJS(
     args=dict(globe=globe),
     code="""
     globe.enable_hover = cb_obj.active.includes(0);
+    globe.show_fps = cb_obj.active.includes(1);
     """
 )
 hover_checkbox.js_on_change('active', hover_callback)
@@ -256,7 +266,7 @@ controls_row1 = row(rotation_slider, tilt_slider)
 controls_row2 = row(zoom_slider, rotation_speed_slider)
 controls_row3 = row(projection_select, palette_select, autorotate_button)
 controls_row4 = row(vmin_input, vmax_input, apply_button)
-controls_row5 = row(hover_checkbox)
+controls_row5 = row(backend_select, hover_checkbox)
 
 controls = column(
     controls_row1,
@@ -294,5 +304,7 @@ print("""
 - Projection: Switch between views
 - Palette: Change color scheme
 - Auto-Rotate: Sphere only (continues from current position)
+- Renderer: canvas or webgl (WebGL keeps dragging fine grids smooth)
 - Hover Tooltip: Toggle on/off
+- Show Frame Time: render ms/frame and fps overlay
 """) 
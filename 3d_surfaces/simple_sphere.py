@@ -17,9 +17,9 @@ temps = 30 - 50 * np.abs(lat_grid) / 90
 temps += 10 * np.sin(np.radians(lon_grid) * 3) * np.cos(np.radians(lat_grid) * 2)
 
 # Flatten
-lons_flat = lon_grid.flatten().tolist()
-lats_flat = lat_grid.flatten().tolist()
-temps_flat = temps.flatten().tolist()
+lons_flat = lon_grid.ravel()
+lats_flat = lat_grid.ravel()
+temps_flat = temps.ravel()
 
 # Create the globe widget
 globe = create_globe(
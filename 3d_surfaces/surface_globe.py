@@ -1,10 +1,37 @@
 """
 SurfaceGlobe - High-level Bokeh widget for gridded data visualization
 """
-from bokeh.core.properties import Bool, Float, Int, List, String, Any
+import os
+import sys
+
+from bokeh.core.properties import Any, Array, Bool, Float, Int, Seq, String
 from bokeh.models import LayoutDOM
 import numpy as np
 
+# coastlines.py (shared coastline cache) lives in the repository root
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+# Data arrays travel as binary typed-array buffers; float32 halves them again
+TRANSPORT_DTYPE = np.float32
+# Quantized frames: uint8 codes 0-254 spread over the value range, 255 is NaN
+FRAME_NAN_CODE = 255
+
+
+def _float_array(values, dtype=TRANSPORT_DTYPE):
+    """Flat, contiguous ``dtype`` copy (or view) of ``values`` for the binary transport."""
+    return np.ascontiguousarray(values, dtype=dtype).ravel()
+
+
+def FloatArray(help):
+    """
+    A NumPy array property sent as one binary buffer. Arrays are kept as
+    given (pass float64 for full precision); lists and tuples are converted
+    to ``TRANSPORT_DTYPE``. NaN marks missing values and line breaks.
+    """
+    return Array(Any, default=lambda: np.zeros(0, dtype=TRANSPORT_DTYPE), help=help).accepts(Seq(Any), _float_array)
+
 
 class SurfaceGlobe(LayoutDOM):
     """
@@ -27,14 +54,25 @@ class SurfaceGlobe(LayoutDOM):
     __implementation__ = "surface_globe.ts"
     
     # Data
-    lons = List(Float, default=[], help="Flattened longitude array (or X for surface_3d)")
-    lats = List(Float, default=[], help="Flattened latitude array (or Y for surface_3d)")
-    values = List(Float, default=[], help="Flattened values array (or Z for surface_3d)")
+    lons = FloatArray(help="Flattened longitude array (or X for surface_3d)")
+    lats = FloatArray(help="Flattened latitude array (or Y for surface_3d)")
+    values = FloatArray(help="Flattened values array (or Z for surface_3d)")
     n_lat = Int(default=30, help="Number of latitude/Y points")
     n_lon = Int(default=60, help="Number of longitude/X points")
     
+    # Time series: geometry is sent once, then only values change
+    frames = FloatArray(help="Preloaded (T, n_lat * n_lon) block of values, float32 or uint8 codes (see quantize_frames); when set it replaces values")
+    frame = Int(default=0, help="Frame shown from frames, or the frame whose values Python streams into values; preloaded playback advances it in the browser and syncs it back on pause")
+    n_frames = Int(default=0, help="Frame count for playback when values are streamed from Python instead of preloaded")
+    frame_scale = Float(default=1.0, help="uint8 frames: value = frame_offset + frame_scale * code")
+    frame_offset = Float(default=0.0, help="uint8 frames: value = frame_offset + frame_scale * code")
+    playing = Bool(default=False, help="Advance frame in the browser at frame_rate, looping")
+    frame_rate = Float(default=10.0, help="Playback speed in frames per second")
+    
     # Projection
     projection = String(default='sphere', help="'sphere', 'mollweide', 'natural_earth', 'plate_carree', or 'surface_3d'")
+    render_mode = String(default='patches', help="Flat maps: 'patches' (one polygon per cell) or 'raster' (per-pixel inverse projection into one image)")
+    output_backend = String(default='canvas', help="'canvas' (2D context) or 'webgl' (sphere and surface_3d drawn with WebGL2 and depth testing; falls back to canvas where unavailable)")
     
     # Color mapping
     palette = String(default='Turbo256', help="Palette name")
@@ -56,11 +94,13 @@ class SurfaceGlobe(LayoutDOM):
     show_coastlines = Bool(default=True, help="Show coastlines (for geographic projections)")
     coastline_color = String(default='#000000', help="Coastline color")
     coastline_width = Float(default=1.2, help="Coastline width")
-    coast_lons = List(Any, default=[], help="Coastline longitudes")
-    coast_lats = List(Any, default=[], help="Coastline latitudes")
+    coast_lons = FloatArray(help="Coastline longitudes, lines separated by NaN")
+    coast_lats = FloatArray(help="Coastline latitudes, lines separated by NaN")
     
     # Interaction
     enable_hover = Bool(default=True, help="Enable hover tooltip")
+    frame_time_target = Float(default=16.0, help="Frame-time budget (ms) while dragging, zooming or autorotating: when full resolution would exceed it, a 2x/4x/8x block-mean decimated grid is drawn until the interaction ends; 0 always draws full resolution")
+    show_fps = Bool(default=False, help="Overlay the render time per frame and the frame rate (for benchmarking)")
 
 
 def create_globe(lons, lats, values, n_lat, n_lon,
@@ -70,14 +110,18 @@ def create_globe(lons, lats, values, n_lat, n_lon,
                 autorotate=False,
                 show_coastlines=True,
                 enable_hover=True,
-                width=800, height=800):
+                width=800, height=800,
+                render_mode='patches',
+                dtype=TRANSPORT_DTYPE,
+                output_backend='canvas',
+                frames=None, quantize=False, frame_rate=10.0):
     """
     High-level function to create a globe with coastlines.
     
     Args:
         lons: Flattened longitude array (or X values for surface_3d)
         lats: Flattened latitude array (or Y values for surface_3d)
-        values: Flattened data values (or Z values for surface_3d)
+        values: Flattened data values (or Z values for surface_3d); may be None with frames
         n_lat: Number of latitude/Y points
         n_lon: Number of longitude/X points
         projection: 'sphere', 'mollweide', 'natural_earth', 'plate_carree', or 'surface_3d'
@@ -89,44 +133,57 @@ def create_globe(lons, lats, values, n_lat, n_lon,
         enable_hover: Enable hover tooltip to show values
         width: Widget width
         height: Widget height
+        render_mode: 'patches' or 'raster' for mollweide/natural_earth/plate_carree;
+            'raster' draws the grid as one image, which scales to fine grids
+        dtype: Transport dtype of the data arrays (float32; np.float64 for full precision)
+        output_backend: 'canvas' or 'webgl'; 'webgl' keeps dragging fine sphere and
+            surface_3d grids smooth, and falls back to canvas without WebGL2
+        frames: Optional (T, n_lat, n_lon) time series, preloaded for playback
+            (see frame_controls); the geometry is sent once
+        quantize: Send frames as uint8 codes (a quarter of float32) instead of dtype
+        frame_rate: Playback speed in frames per second
     
     Returns:
         SurfaceGlobe widget
     """
     
     # Load coastlines (only for geographic projections)
-    coast_lons_data = []
-    coast_lats_data = []
+    coast_lons_data = np.zeros(0, dtype=dtype)
+    coast_lats_data = np.zeros(0, dtype=dtype)
     
     if show_coastlines and projection != 'surface_3d':
         try:
-            import cartopy.feature as cfeature
-            from shapely.geometry import LineString, MultiLineString
+            from coastlines import load_coastlines
             
-            coastlines = cfeature.NaturalEarthFeature('physical', 'coastline', '110m')
-            for geom in coastlines.geometries():
-                if isinstance(geom, LineString):
-                    coords = np.array(geom.coords)
-                    coast_lons_data.extend(coords[:, 0].tolist() + [None])
-                    coast_lats_data.extend(coords[:, 1].tolist() + [None])
-                elif isinstance(geom, MultiLineString):
-                    for line in geom.geoms:
-                        coords = np.array(line.coords)
-                        coast_lons_data.extend(coords[:, 0].tolist() + [None])
-                        coast_lats_data.extend(coords[:, 1].tolist() + [None])
+            coast_lons, coast_lats = load_coastlines('110m')
+            # NaN separators survive the binary transport; the TypeScript side breaks lines at them
+            coast_lons_data = _float_array(coast_lons, dtype)
+            coast_lats_data = _float_array(coast_lats, dtype)
         except ImportError:
             print("Warning: cartopy not available")
             show_coastlines = False
     
+    frame_data = {}
+    if frames is not None:
+        frames = np.asarray(frames)
+        frames = frames.reshape(len(frames), -1)
+        if quantize:
+            codes, scale, offset = quantize_frames(frames, vmin, vmax)
+            frame_data = dict(frames=codes, frame_scale=scale, frame_offset=offset)
+        else:
+            frame_data = dict(frames=np.ascontiguousarray(frames, dtype=dtype))
+        # The frames replace values, so don't send a copy of one
+        values = np.zeros(0) if values is None else values
+    
     if vmin is None:
         vmin = float('nan')
     if vmax is None:
         vmax = float('nan')
     
     return SurfaceGlobe(
-        lons=lons,
-        lats=lats,
-        values=values,
+        lons=_float_array(lons, dtype),
+        lats=_float_array(lats, dtype),
+        values=_float_array(values, dtype),
         n_lat=n_lat,
         n_lon=n_lon,
         projection=projection,
@@ -134,18 +191,89 @@ def create_globe(lons, lats, values, n_lat, n_lon,
         vmin=vmin,
         vmax=vmax,
         autorotate=autorotate,
+        render_mode=render_mode,
+        output_backend=output_backend,
         show_coastlines=show_coastlines,
         coast_lons=coast_lons_data,
         coast_lats=coast_lats_data,
         enable_hover=enable_hover,
         width=width,
-        height=height
+        height=height,
+        frame_rate=frame_rate,
+        **frame_data
     )
 
 
+def quantize_frames(frames, vmin=None, vmax=None):
+    """
+    Quantize a block of frames to uint8 for ``SurfaceGlobe.frames``.
+    
+    Values are spread linearly over codes 0-254 between vmin and vmax
+    (default: the finite min/max of all frames) and clipped; NaN becomes
+    FRAME_NAN_CODE. At 256 palette colours this loses nothing visible.
+    
+    Returns:
+        (codes, frame_scale, frame_offset): value = frame_offset + frame_scale * code
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    finite = np.isfinite(frames)
+    if vmin is None:
+        vmin = float(frames[finite].min()) if finite.any() else 0.0
+    if vmax is None:
+        vmax = float(frames[finite].max()) if finite.any() else 1.0
+    scale = (vmax - vmin) / (FRAME_NAN_CODE - 1) if vmax > vmin else 1.0
+    
+    codes = np.full(frames.shape, FRAME_NAN_CODE, dtype=np.uint8)
+    codes[finite] = np.clip(np.rint((frames[finite] - vmin) / scale), 0, FRAME_NAN_CODE - 1)
+    return codes, scale, vmin
+
+
+def frame_controls(globe, n_frames=None, labels=None, width=600):
+    """
+    Play button and frame slider for a SurfaceGlobe time series, linked in
+    the browser: playing and scrubbing only switch which frame's values
+    colour the quads. While preloaded frames play, neither the frame nor the
+    slider is synced to the server; both are once playback pauses. Streamed
+    frames sync every step, since the server has to send their values.
+    
+    Args:
+        globe: SurfaceGlobe with frames (or n_frames, for values streamed from Python)
+        n_frames: Frame count (default: from globe.frames or globe.n_frames)
+        labels: Optional label per frame (e.g. timestamps) shown above the slider
+        width: Slider width
+    
+    Returns:
+        row(play_button, slider)
+    """
+    from bokeh.layouts import row
+    from bokeh.models import CustomJS, Slider, Toggle
+    
+    if n_frames is None:
+        n_frames = len(globe.frames) if len(globe.frames) else globe.n_frames
+    
+    play_button = Toggle(label="▶ Play", active=globe.playing, width=90)
+    slider = Slider(start=0, end=max(n_frames - 1, 1), value=globe.frame, step=1,
+                    title=labels[globe.frame] if labels else "Frame", width=width)
+    
+    play_button.js_link('active', globe, 'playing')
+    globe.js_link('playing', play_button, 'active')
+    play_button.js_on_change('active', CustomJS(code="cb_obj.label = cb_obj.active ? '⏸ Pause' : '▶ Play'"))
+    slider.js_link('value', globe, 'frame')
+    globe.js_on_change('frame', CustomJS(args=dict(slider=slider, labels=labels or []), code="""
+    const changes = {value: cb_obj.frame};
+    if (labels.length > 0) {
+        changes.title = labels[cb_obj.frame];
+    }
+    // During playback the slider only follows along in the browser
+    slider.setv(changes, {sync: !cb_obj.playing});
+    """))
+    return row(play_button, slider)
+
+
 def create_surface(Z_func, x_range=(-3, 3), y_range=(-3, 3), n_points=40,
                    elev_deg=25, azim_deg=45, palette='Viridis256',
-                   autorotate=False, title="3D Surface", width=800, height=800):
+                   autorotate=False, title="3D Surface", width=800, height=800,
+                   output_backend='canvas'):
     """
     Create a 3D surface plot from a function Z(X, Y).
     
@@ -161,6 +289,7 @@ def create_surface(Z_func, x_range=(-3, 3), y_range=(-3, 3), n_points=40,
         title: Plot title
         width: Widget width
         height: Widget height
+        output_backend: 'canvas' or 'webgl'
     
     Returns:
         SurfaceGlobe widget configured as a 3D surface
@@ -180,9 +309,9 @@ def create_surface(Z_func, x_range=(-3, 3), y_range=(-3, 3), n_points=40,
     Z = Z_func(X, Y)
     
     # Flatten
-    x_flat = X.flatten().tolist()
-    y_flat = Y.flatten().tolist()
-    z_flat = Z.flatten().tolist()
+    x_flat = X.ravel()
+    y_flat = Y.ravel()
+    z_flat = Z.ravel()
     
     # Create and return the widget
     widget = create_globe(
@@ -195,7 +324,8 @@ def create_surface(Z_func, x_range=(-3, 3), y_range=(-3, 3), n_points=40,
         palette=palette,
         show_coastlines=False,
         width=width,
-        height=height
+        height=height,
+        output_backend=output_backend
     )
     
     # Set rotation, tilt, and autorotate
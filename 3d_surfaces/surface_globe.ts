@@ -1,6 +1,7 @@
 import * as p from "core/properties"
 import {LayoutDOM, LayoutDOMView} from "models/layouts/layout_dom"
 import {div} from "core/dom"
+import type {Arrayable} from "core/types"
 
 const Turbo256 = ["#30123b","#311542","#32184a","#341b51","#351e58","#36215f","#372566","#38286d","#392b74","#3a2e7b","#3b3181","#3c3488","#3c378e","#3d3a94","#3e3d9a","#3e40a0","#3e43a5","#3f46ab","#3f49b0","#3f4cb5","#3f4fba","#3f52bf","#3f55c4","#3e58c8","#3e5bcc","#3e5ed0","#3d61d4","#3d64d8","#3c68dc","#3c6bdf","#3b6ee2","#3a71e5","#3974e8","#3977eb","#387aed","#377df0","#3680f2","#3583f4","#3486f6","#3389f8","#328cfa","#318ffc","#2f92fd","#2e95fe","#2d98ff","#2c9bff","#2b9eff","#2aa1ff","#2aa4ff","#29a7fe","#28aafe","#28adfd","#28b0fc","#28b2fb","#28b5fa","#28b8f9","#28bbf8","#28bef6","#28c1f5","#29c3f3","#29c6f2","#2ac9f0","#2accee","#2bceec","#2cd1ea","#2dd3e8","#2ed6e6","#2fd8e4","#31dbe1","#32dddf","#34e0dd","#36e2da","#38e4d8","#3ae6d5","#3ce8d2","#3fead0","#41eccd","#44eeca","#46f0c7","#49f1c4","#4cf3c1","#4ff5be","#52f6bb","#55f8b8","#58f9b4","#5bfbb1","#5efcae","#62fdab","#65fea8","#69ffa4","#6cffa1","#70ff9e","#73ff9b","#77ff98","#7aff95","#7eff92","#81ff8f","#85ff8c","#88ff89","#8cff87","#8fff84","#93ff81","#96fe7f","#9afe7c","#9dfd7a","#a1fd77","#a4fc75","#a7fc73","#abfb71","#aefa6f","#b2f96d","#b5f86b","#b8f769","#bcf667","#bff665","#c2f564","#c5f462","#c9f360","#ccf25f","#cff15d","#d2f05c","#d5ef5a","#d9ee59","#dced57","#dfec56","#e2eb55","#e5ea53","#e8e952","#ebe851","#eee750","#f1e64f","#f4e54e","#f7e34d","#f9e24c","#fce14b","#ffe049","#ffdf48","#ffde47","#ffdd46","#ffdb45","#ffda43","#ffd942","#ffd741","#ffd640","#ffd53e","#ffd33d","#ffd23c","#ffd03a","#ffcf39","#ffcd37","#ffcc36","#ffca35","#ffc933","#ffc732","#ffc630","#ffc42f","#ffc32d","#ffc12c","#ffc02a","#ffbe29","#ffbd27","#ffbb26","#ffba24","#ffb823","#ffb621","#ffb520","#ffb31e","#ffb21d","#ffb01b","#ffaf1a","#ffad18","#ffac17","#ffaa15","#ffa914","#ffa712","#ffa611","#ffa40f","#ffa30e","#ffa10c","#ffa00b","#ff9e09","#ff9d08","#ff9b06","#ff9a05","#ff9803","#ff9702","#ff9500"]
 
@@ -14,6 +15,393 @@ const Cividis256 = ["#00204d","#00204e","#00214f","#002150","#002251","#002251",
 
 
 
+const GL_VERTEX_SHADER = `#version 300 es
+in vec3 position;
+in float color_t;
+// Rows give screen x, screen y and depth (towards the viewer) in model units
+uniform mat3 view;
+uniform vec2 scale;
+uniform vec2 offset;
+uniform vec2 depth_range;
+flat out float v_t;
+void main() {
+  vec3 p = view * position;
+  gl_Position = vec4(p.x * scale.x + offset.x, p.y * scale.y + offset.y,
+                     -(p.z - depth_range.x) * depth_range.y, 1.0);
+  v_t = color_t;
+}`
+
+const GL_FRAGMENT_SHADER = `#version 300 es
+precision highp float;
+flat in float v_t;
+uniform sampler2D palette;
+uniform float n_colors;
+uniform vec3 nan_color;
+uniform vec3 background;
+uniform float alpha;
+uniform vec4 solid;
+out vec4 frag_color;
+void main() {
+  vec3 c;
+  if (solid.a > 0.0) {
+    c = solid.rgb;
+  } else if (v_t < 0.0) {
+    c = nan_color;
+  } else {
+    // Same bin as value_to_color: floor(t * (n - 1)), read from the texel centre
+    c = texture(palette, vec2((floor(v_t * (n_colors - 1.0)) + 0.5) / n_colors, 0.5)).rgb;
+  }
+  frag_color = vec4(mix(background, c, alpha), 1.0);
+}`
+
+type GLView = {
+  view: number[]          // column-major mat3
+  scale: [number, number]
+  offset: [number, number]
+  depth_range: [number, number]
+}
+
+/**
+ * WebGL2 mesh renderer for the sphere and surface_3d views.
+ *
+ * Positions, per-quad palette positions and triangle indices are uploaded
+ * once per data change; a frame only sets the view uniforms and draws, with
+ * the depth buffer in place of the canvas path's per-frame depth sort. Each
+ * quad is flat-shaded from its first corner (the provoking vertex of both
+ * triangles), so colours match the canvas path's per-quad average.
+ */
+class GlobeGL {
+  readonly canvas: HTMLCanvasElement
+  private readonly gl: WebGL2RenderingContext
+  private readonly program: WebGLProgram
+  private readonly uniforms: {[name: string]: WebGLUniformLocation | null} = {}
+  private readonly vao: WebGLVertexArrayObject
+  private readonly position_buffer: WebGLBuffer
+  private readonly color_buffer: WebGLBuffer
+  private readonly index_buffer: WebGLBuffer
+  private readonly line_buffer: WebGLBuffer
+  private readonly palette_texture: WebGLTexture
+  private n_indices: number = 0
+  private n_line_indices: number = 0
+  private grid_key?: string
+  private positions_key?: unknown[]
+  private colors_key?: unknown[]
+  private palette_key?: Uint8Array
+  lost: boolean = false
+
+  // Positions as uploaded, for the surface_3d screen bounds
+  positions: Float32Array = new Float32Array(0)
+
+  static create(width: number, height: number): GlobeGL | null {
+    const canvas = document.createElement('canvas')
+    canvas.width = width
+    canvas.height = height
+    // preserveDrawingBuffer keeps the last frame readable for the hover tooltip
+    const gl = canvas.getContext('webgl2', {antialias: true, preserveDrawingBuffer: true})
+    if (gl === null) return null
+    try {
+      return new GlobeGL(canvas, gl)
+    } catch (error) {
+      console.warn(`SurfaceGlobe: WebGL setup failed, using the canvas renderer (${error})`)
+      return null
+    }
+  }
+
+  private constructor(canvas: HTMLCanvasElement, gl: WebGL2RenderingContext) {
+    this.canvas = canvas
+    this.gl = gl
+    canvas.addEventListener('webglcontextlost', () => { this.lost = true })
+
+    this.program = gl.createProgram()!
+    for (const [type, source] of [[gl.VERTEX_SHADER, GL_VERTEX_SHADER], [gl.FRAGMENT_SHADER, GL_FRAGMENT_SHADER]] as const) {
+      const shader = gl.createShader(type)!
+      gl.shaderSource(shader, source)
+      gl.compileShader(shader)
+      if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) {
+        throw new Error(gl.getShaderInfoLog(shader) ?? 'shader compilation failed')
+      }
+      gl.attachShader(this.program, shader)
+    }
+    gl.bindAttribLocation(this.program, 0, 'position')
+    gl.bindAttribLocation(this.program, 1, 'color_t')
+    gl.linkProgram(this.program)
+    if (!gl.getProgramParameter(this.program, gl.LINK_STATUS)) {
+      throw new Error(gl.getProgramInfoLog(this.program) ?? 'program link failed')
+    }
+    for (const name of ['view', 'scale', 'offset', 'depth_range', 'palette', 'n_colors',
+                        'nan_color', 'background', 'alpha', 'solid']) {
+      this.uniforms[name] = gl.getUniformLocation(this.program, name)
+    }
+
+    this.vao = gl.createVertexArray()!
+    this.position_buffer = gl.createBuffer()!
+    this.color_buffer = gl.createBuffer()!
+    this.index_buffer = gl.createBuffer()!
+    this.line_buffer = gl.createBuffer()!
+    gl.bindVertexArray(this.vao)
+    gl.bindBuffer(gl.ARRAY_BUFFER, this.position_buffer)
+    gl.enableVertexAttribArray(0)
+    gl.vertexAttribPointer(0, 3, gl.FLOAT, false, 0, 0)
+    gl.bindBuffer(gl.ARRAY_BUFFER, this.color_buffer)
+    gl.enableVertexAttribArray(1)
+    gl.vertexAttribPointer(1, 1, gl.FLOAT, false, 0, 0)
+    gl.bindVertexArray(null)
+
+    this.palette_texture = gl.createTexture()!
+    gl.bindTexture(gl.TEXTURE_2D, this.palette_texture)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MIN_FILTER, gl.NEAREST)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_MAG_FILTER, gl.NEAREST)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_S, gl.CLAMP_TO_EDGE)
+    gl.texParameteri(gl.TEXTURE_2D, gl.TEXTURE_WRAP_T, gl.CLAMP_TO_EDGE)
+  }
+
+  private static same(a: unknown[] | undefined, b: unknown[]): boolean {
+    return a !== undefined && a.length === b.length && a.every((v, i) => v === b[i] || (Number.isNaN(v) && Number.isNaN(b[i])))
+  }
+
+  /** Triangle (and optionally grid line) indices for an n_lat x n_lon grid. */
+  set_grid(n_lat: number, n_lon: number, lines: boolean): void {
+    const key = `${n_lat}x${n_lon}|${lines}`
+    if (this.grid_key === key) return
+    const gl = this.gl
+    const n_quads = Math.max(n_lat - 1, 0) * Math.max(n_lon - 1, 0)
+    const indices = new Uint32Array(6 * n_quads)
+    let k = 0
+    for (let i = 0; i < n_lat - 1; i++) {
+      for (let j = 0; j < n_lon - 1; j++) {
+        const idx0 = i * n_lon + j
+        const idx1 = idx0 + 1
+        const idx2 = idx0 + n_lon + 1
+        const idx3 = idx0 + n_lon
+        // idx0 last in both triangles: it carries the quad's colour
+        indices[k++] = idx1; indices[k++] = idx2; indices[k++] = idx0
+        indices[k++] = idx2; indices[k++] = idx3; indices[k++] = idx0
+      }
+    }
+    gl.bindBuffer(gl.ELEMENT_ARRAY_BUFFER, this.index_buffer)
+    gl.bufferData(gl.ELEMENT_ARRAY_BUFFER, indices, gl.STATIC_DRAW)
+    this.n_indices = indices.length
+
+    let line_indices = new Uint32Array(0)
+    if (lines) {
+      line_indices = new Uint32Array(2 * (n_lat * Math.max(n_lon - 1, 0) + n_lon * Math.max(n_lat - 1, 0)))
+      k = 0
+      for (let i = 0; i < n_lat; i++) {
+        for (let j = 0; j < n_lon; j++) {
+          const idx = i * n_lon + j
+          if (j < n_lon - 1) { line_indices[k++] = idx; line_indices[k++] = idx + 1 }
+          if (i < n_lat - 1) { line_indices[k++] = idx; line_indices[k++] = idx + n_lon }
+        }
+      }
+    }
+    gl.bindBuffer(gl.ELEMENT_ARRAY_BUFFER, this.line_buffer)
+    gl.bufferData(gl.ELEMENT_ARRAY_BUFFER, line_indices, gl.STATIC_DRAW)
+    this.n_line_indices = line_indices.length
+    this.grid_key = key
+  }
+
+  /** Upload vertex positions built by ``build`` unless ``key`` is unchanged. */
+  set_positions(key: unknown[], build: () => Float32Array): void {
+    if (GlobeGL.same(this.positions_key, key)) return
+    this.positions = build()
+    const gl = this.gl
+    gl.bindBuffer(gl.ARRAY_BUFFER, this.position_buffer)
+    gl.bufferData(gl.ARRAY_BUFFER, this.positions, gl.STATIC_DRAW)
+    this.positions_key = key
+  }
+
+  /**
+   * Upload the palette position t in [0, 1] of every quad (stored at its
+   * first corner; -1 for NaN) unless ``key`` is unchanged.
+   */
+  set_colors(key: unknown[], values: Arrayable<number>, n_lat: number, n_lon: number,
+             range: () => {vmin: number, vmax: number}): void {
+    if (GlobeGL.same(this.colors_key, key)) return
+    const {vmin, vmax} = range()
+    const color_t = new Float32Array(values.length).fill(-1)
+    for (let i = 0; i < n_lat - 1; i++) {
+      for (let j = 0; j < n_lon - 1; j++) {
+        const idx0 = i * n_lon + j
+        const avg_value = (values[idx0] + values[idx0 + 1] + values[idx0 + n_lon + 1] + values[idx0 + n_lon]) / 4
+        if (!isNaN(avg_value)) {
+          const t = (avg_value - vmin) / (vmax - vmin)
+          color_t[idx0] = t > 0 ? Math.min(t, 1) : 0
+        }
+      }
+    }
+    const gl = this.gl
+    gl.bindBuffer(gl.ARRAY_BUFFER, this.color_buffer)
+    gl.bufferData(gl.ARRAY_BUFFER, color_t, gl.STATIC_DRAW)
+    this.colors_key = key
+  }
+
+  set_palette(rgb: Uint8Array): void {
+    if (this.palette_key === rgb) return
+    const gl = this.gl
+    gl.bindTexture(gl.TEXTURE_2D, this.palette_texture)
+    gl.pixelStorei(gl.UNPACK_ALIGNMENT, 1)
+    gl.texImage2D(gl.TEXTURE_2D, 0, gl.RGB8, rgb.length / 3, 1, 0, gl.RGB, gl.UNSIGNED_BYTE, rgb)
+    this.palette_key = rgb
+  }
+
+  draw(view: GLView, colors: {n_colors: number, nan_color: number[], background: number[], alpha: number},
+       line_color: number[] | null = null): void {
+    const gl = this.gl
+    const u = this.uniforms
+    gl.viewport(0, 0, this.canvas.width, this.canvas.height)
+    gl.clearColor(colors.background[0], colors.background[1], colors.background[2], 1)
+    gl.clear(gl.COLOR_BUFFER_BIT | gl.DEPTH_BUFFER_BIT)
+    gl.enable(gl.DEPTH_TEST)
+    gl.depthFunc(gl.LEQUAL)
+
+    gl.useProgram(this.program)
+    gl.uniformMatrix3fv(u.view, false, view.view)
+    gl.uniform2fv(u.scale, view.scale)
+    gl.uniform2fv(u.offset, view.offset)
+    gl.uniform2fv(u.depth_range, view.depth_range)
+    gl.activeTexture(gl.TEXTURE0)
+    gl.bindTexture(gl.TEXTURE_2D, this.palette_texture)
+    gl.uniform1i(u.palette, 0)
+    gl.uniform1f(u.n_colors, colors.n_colors)
+    gl.uniform3fv(u.nan_color, colors.nan_color)
+    gl.uniform3fv(u.background, colors.background)
+    gl.uniform1f(u.alpha, colors.alpha)
+    gl.uniform4f(u.solid, 0, 0, 0, 0)
+
+    gl.bindVertexArray(this.vao)
+    // Push the faces back a little so the grid lines drawn at the same depth stay on top
+    gl.enable(gl.POLYGON_OFFSET_FILL)
+    gl.polygonOffset(1, 1)
+    gl.bindBuffer(gl.ELEMENT_ARRAY_BUFFER, this.index_buffer)
+    gl.drawElements(gl.TRIANGLES, this.n_indices, gl.UNSIGNED_INT, 0)
+    gl.disable(gl.POLYGON_OFFSET_FILL)
+
+    if (line_color !== null && this.n_line_indices > 0) {
+      gl.uniform4f(u.solid, line_color[0], line_color[1], line_color[2], 1)
+      gl.bindBuffer(gl.ELEMENT_ARRAY_BUFFER, this.line_buffer)
+      gl.drawElements(gl.LINES, this.n_line_indices, gl.UNSIGNED_INT, 0)
+    }
+    gl.bindVertexArray(null)
+  }
+
+  read_pixel(x: number, y: number): Uint8Array {
+    const pixel = new Uint8Array(4)
+    const gl = this.gl
+    gl.readPixels(Math.floor(x), this.canvas.height - 1 - Math.floor(y), 1, 1, gl.RGBA, gl.UNSIGNED_BYTE, pixel)
+    return pixel
+  }
+}
+
+const FPS_WINDOW = 30
+
+// Level-of-detail: coarser grids are 2x, 4x and 8x decimated; full resolution returns this long after the last interaction
+const LOD_FACTORS = [1, 2, 4, 8]
+const LOD_IDLE_MS = 200
+
+// Quantized (uint8) frames: code 255 is NaN, the others are frame_offset + frame_scale * code
+const FRAME_NAN_CODE = 255
+
+// A grid the renderers draw: the model's grid or a decimated level. The
+// geometry (and the canvas sphere's unit vectors) is built once; values,
+// and the quads grouped by colour, follow the current values or frame
+type Grid = {
+  lons: Arrayable<number>
+  lats: Arrayable<number>
+  n_lat: number
+  n_lon: number
+  unit?: Float32Array
+  values: Arrayable<number>
+  source?: Arrayable<number>
+  quad_colors?: {key: unknown[], order: Int32Array, offsets: Int32Array}
+}
+
+/**
+ * Decimate a grid's geometry by ``factor`` along both axes: coarse vertices
+ * sit on every ``factor``-th fine vertex, plus the last row and column, so
+ * the extent is unchanged.
+ */
+function decimate_geometry(grid: Grid, factor: number): Grid {
+  const {lons, lats, n_lat, n_lon} = grid
+  const rows = lod_indices(n_lat, factor)
+  const cols = lod_indices(n_lon, factor)
+  const coarse: Grid = {
+    lons: new Float32Array(rows.length * cols.length),
+    lats: new Float32Array(rows.length * cols.length),
+    n_lat: rows.length,
+    n_lon: cols.length,
+    values: new Float32Array(0),
+  }
+  for (let I = 0; I < rows.length; I++) {
+    for (let J = 0; J < cols.length; J++) {
+      coarse.lons[I * cols.length + J] = lons[rows[I] * n_lon + cols[J]]
+      coarse.lats[I * cols.length + J] = lats[rows[I] * n_lon + cols[J]]
+    }
+  }
+  return coarse
+}
+
+/**
+ * Values at the ``decimate_geometry`` vertices: the NaN-ignoring mean of the
+ * factor x factor block of fine values centred on each of them (the two
+ * end samples of a window count half), so colours and positions line up
+ * at every level.
+ */
+function decimate_values(values: Arrayable<number>, n_lat: number, n_lon: number, factor: number): Float32Array {
+  const rows = lod_indices(n_lat, factor)
+  const cols = lod_indices(n_lon, factor)
+  const half = Math.floor(factor / 2)
+  const weight = (k: number, centre: number) => k === centre - half || k === centre + half ? 0.5 : 1
+  
+  // Separable block sums: along each fine row first, then across rows
+  const row_sum = new Float64Array(n_lat * cols.length)
+  const row_count = new Float64Array(n_lat * cols.length)
+  for (let i = 0; i < n_lat; i++) {
+    for (let J = 0; J < cols.length; J++) {
+      const c = cols[J]
+      const j_start = Math.max(c - half, 0)
+      const j_end = Math.min(c + half, n_lon - 1)
+      let sum = 0
+      let count = 0
+      for (let j = j_start; j <= j_end; j++) {
+        const v = values[i * n_lon + j]
+        if (!isNaN(v)) {
+          const w = weight(j, c)
+          sum += w * v
+          count += w
+        }
+      }
+      row_sum[i * cols.length + J] = sum
+      row_count[i * cols.length + J] = count
+    }
+  }
+  
+  const coarse = new Float32Array(rows.length * cols.length)
+  for (let I = 0; I < rows.length; I++) {
+    const r = rows[I]
+    const i_start = Math.max(r - half, 0)
+    const i_end = Math.min(r + half, n_lat - 1)
+    for (let J = 0; J < cols.length; J++) {
+      let sum = 0
+      let count = 0
+      for (let i = i_start; i <= i_end; i++) {
+        const w = weight(i, r)
+        sum += w * row_sum[i * cols.length + J]
+        count += w * row_count[i * cols.length + J]
+      }
+      coarse[I * cols.length + J] = count > 0 ? sum / count : NaN
+    }
+  }
+  return coarse
+}
+
+function lod_indices(n: number, factor: number): Int32Array {
+  const indices = new Int32Array(Math.ceil((n - 1) / factor) + 1)
+  for (let k = 0; k < indices.length; k++) {
+    indices[k] = Math.min(k * factor, n - 1)
+  }
+  return indices
+}
+
 export class SurfaceGlobeView extends LayoutDOMView {
   declare model: SurfaceGlobe
 
@@ -39,6 +427,36 @@ export class SurfaceGlobeView extends LayoutDOMView {
   private drag_start_pan_x: number = 0
   private drag_start_pan_y: number = 0
 
+  // Raster mode: per-pixel lon/lat of the current map view, and the palette as RGB bytes
+  private inverse_map?: {key: string, lon: Float32Array, lat: Float32Array}
+  private palette_rgb?: {name: string, rgb: Uint8Array}
+
+  // WebGL backend: undefined until first needed, null when unavailable
+  private globe_gl?: GlobeGL | null
+  private render_requested: boolean = false
+
+  // Canvas sphere: the per-frame screen x, y, depth buffer (unit vectors and
+  // quads grouped by palette index are cached on each Grid)
+  private sphere_screen?: Float32Array
+
+  // Level of detail: the model's grid and its decimated levels (built on first
+  // use), the smoothed render time measured at each level, and the level drawn
+  private lod?: {key: unknown[], levels: (Grid | undefined)[], mode: string, frame_ms: number[]}
+  private lod_level: number = 0
+  private interacting: boolean = false
+  private idle_timer?: number
+
+  // Playback: the current frame's values, the data range over all frames, and the play loop
+  private frame_values?: {key: unknown[], values: Arrayable<number>}
+  private data_range?: {key: unknown[], lo: number, hi: number}
+  private playback_id?: number
+
+  // Frame-time readout: start times of the last FPS_WINDOW renders and a smoothed render time
+  private fps_el?: HTMLDivElement
+  private frame_starts: Float64Array = new Float64Array(FPS_WINDOW)
+  private frame_count: number = 0
+  private frame_ms: number = 0
+
   override get child_models(): LayoutDOM[] {
     return []
   }
@@ -48,10 +466,34 @@ export class SurfaceGlobeView extends LayoutDOMView {
     
     // Re-render when properties change
     this.connect(this.model.properties.projection.change, () => this.render_globe())
+    this.connect(this.model.properties.render_mode.change, () => this.render_globe())
+    this.connect(this.model.properties.output_backend.change, () => this.render_globe())
+    this.connect(this.model.properties.lons.change, () => this.render_globe())
+    this.connect(this.model.properties.lats.change, () => this.render_globe())
+    this.connect(this.model.properties.values.change, () => this.request_render())
+    this.connect(this.model.properties.frames.change, () => this.request_render())
+    this.connect(this.model.properties.frame.change, () => this.request_render())
+    this.connect(this.model.properties.playing.change, () => {
+      if (this.model.playing) {
+        this.start_playback()
+      } else {
+        this.stop_playback()
+        // Preloaded playback only moved frame in the browser; tell the server where it stopped
+        if (this.get_n_preloaded() > 0) {
+          this.model.setv({frame: this.model.frame}, {check_eq: false})
+        }
+      }
+    })
     this.connect(this.model.properties.palette.change, () => this.render_globe())
-    this.connect(this.model.properties.rotation.change, () => this.render_globe())
-    this.connect(this.model.properties.tilt.change, () => this.render_globe())
-    this.connect(this.model.properties.zoom.change, () => this.render_globe())
+    // A drag sets rotation and tilt together; draw once per animation frame
+    this.connect(this.model.properties.rotation.change, () => this.request_render())
+    this.connect(this.model.properties.tilt.change, () => this.request_render())
+    this.connect(this.model.properties.zoom.change, () => this.request_render())
+    this.connect(this.model.properties.show_fps.change, () => {
+      if (this.fps_el) {
+        this.fps_el.style.display = this.model.show_fps ? 'block' : 'none'
+      }
+    })
     this.connect(this.model.properties.enable_hover.change, () => {
       this.hover_enabled = this.model.enable_hover
       // Hide tooltip if hover is disabled
@@ -92,6 +534,8 @@ export class SurfaceGlobeView extends LayoutDOMView {
     this.canvas.width = width
     this.canvas.height = height
     this.container_el.appendChild(this.canvas)
+    // A fresh container: the WebGL canvas, if used, is recreated on demand
+    this.globe_gl = undefined
     
     // Create tooltip
     this.tooltip_el = div({style: {
@@ -110,6 +554,24 @@ export class SurfaceGlobeView extends LayoutDOMView {
     }})
     this.container_el.appendChild(this.tooltip_el)
     
+    // Frame-time / fps readout
+    this.fps_el = div({style: {
+      position: 'absolute',
+      top: '8px',
+      left: '8px',
+      background: 'rgba(0, 0, 0, 0.6)',
+      color: '#dddddd',
+      padding: '2px 6px',
+      borderRadius: '4px',
+      fontSize: '12px',
+      fontFamily: 'monospace',
+      pointerEvents: 'none',
+      display: this.model.show_fps ? 'block' : 'none',
+      zIndex: '1000'
+    }})
+    this.container_el.appendChild(this.fps_el)
+    this.frame_count = 0
+    
     // Mouse down handler - start drag
     this.canvas.onmousedown = (e) => {
       this.is_dragging = true
@@ -141,6 +603,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
       this.mouse_y = e.clientY - rect.top
       
       if (this.is_dragging) {
+        this.begin_interaction()
         const dx = e.clientX - this.drag_start_x
         const dy = e.clientY - this.drag_start_y
         
@@ -190,6 +653,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
     // Mouse wheel handler - zoom
     this.canvas.onwheel = (e) => {
       e.preventDefault()
+      this.begin_interaction()
       
       const zoom_speed = 0.1
       const delta = -Math.sign(e.deltaY)
@@ -208,12 +672,71 @@ export class SurfaceGlobeView extends LayoutDOMView {
     if (this.model.autorotate && this.model.projection === 'sphere') {
       this.start_animation()
     }
+    if (this.model.playing) {
+      this.start_playback()
+    }
+  }
+
+  private request_render(): void {
+    if (this.render_requested) return
+    this.render_requested = true
+    requestAnimationFrame(() => {
+      this.render_requested = false
+      this.render_globe()
+    })
+  }
+
+  private get_gl(): GlobeGL | null {
+    // WebGL draws the sphere and surface_3d meshes; the flat maps and coastlines stay on the 2D canvas
+    const projection = this.model.projection
+    if (this.model.output_backend !== 'webgl' || (projection !== 'sphere' && projection !== 'surface_3d')) {
+      return null
+    }
+    if (this.globe_gl === undefined && this.container_el && this.canvas) {
+      this.globe_gl = GlobeGL.create(this.canvas.width, this.canvas.height)
+      if (this.globe_gl === null) {
+        console.warn('SurfaceGlobe: WebGL2 is not available, using the canvas renderer')
+      } else {
+        // The GL canvas sits under the 2D canvas, which keeps the mouse handlers and draws the coastlines
+        for (const canvas of [this.globe_gl.canvas, this.canvas]) {
+          canvas.style.position = 'absolute'
+          canvas.style.left = '0'
+          canvas.style.top = '0'
+        }
+        this.container_el.insertBefore(this.globe_gl.canvas, this.canvas)
+      }
+    }
+    if (this.globe_gl?.lost) {
+      console.warn('SurfaceGlobe: WebGL context lost, using the canvas renderer')
+      this.globe_gl = null
+    }
+    return this.globe_gl ?? null
+  }
+
+  private gl_colors(alpha: number): {n_colors: number, nan_color: number[], background: number[], alpha: number} {
+    const rgb = this.get_palette_rgb()
+    return {
+      n_colors: rgb.length / 3,
+      nan_color: this.parse_color(this.model.nan_color).map((c) => c / 255),
+      background: [10 / 255, 10 / 255, 10 / 255],
+      alpha,
+    }
+  }
+
+  private upload_gl_colors(gl: GlobeGL, grid: Grid): void {
+    const {values, n_lat, n_lon} = grid
+    const {vmin, vmax} = this.model
+    gl.set_colors([values, n_lat, n_lon, vmin, vmax], values, n_lat, n_lon, () => this.get_value_range())
+    gl.set_palette(this.get_palette_rgb())
   }
 
   private render_globe(): void {
     if (!this.ctx) return
     
     const projection = this.model.projection
+    const start = performance.now()
+    this.lod_level = this.select_lod_level()
+    const timing = this.lod!.frame_ms
     
     if (projection === 'sphere') {
       this.render_sphere()
@@ -226,11 +749,164 @@ export class SurfaceGlobeView extends LayoutDOMView {
     } else if (projection === 'surface_3d') {
       this.render_surface_3d()
     }
+    
+    const elapsed = performance.now() - start
+    const previous = timing[this.lod_level]
+    timing[this.lod_level] = isNaN(previous) ? elapsed : 0.7 * previous + 0.3 * elapsed
+    this.record_frame(start, elapsed)
+  }
+
+  private begin_interaction(): void {
+    // Dragging, zooming and autorotating draw from a coarser level while full
+    // resolution would miss frame_time_target; LOD_IDLE_MS after the last one,
+    // redraw at full resolution
+    this.interacting = true
+    if (this.idle_timer !== undefined) {
+      clearTimeout(this.idle_timer)
+    }
+    this.idle_timer = window.setTimeout(() => {
+      this.idle_timer = undefined
+      this.interacting = false
+      if (this.lod_level !== 0) {
+        this.render_globe()
+      }
+    }, LOD_IDLE_MS)
+  }
+
+  private grid(level: number = this.lod_level): Grid {
+    const {lons, lats, n_lat, n_lon} = this.model
+    const key = [lons, lats, n_lat, n_lon]
+    if (this.lod === undefined || !this.lod.key.every((v, i) => v === key[i])) {
+      this.lod = {
+        key,
+        levels: [{lons, lats, n_lat, n_lon, values: new Float32Array(0)}],
+        mode: '',
+        frame_ms: [],
+      }
+    }
+    const levels = this.lod.levels
+    if (levels[level] === undefined) {
+      levels[level] = decimate_geometry(levels[0]!, LOD_FACTORS[level])
+    }
+    const grid = levels[level]!
+    
+    // A new values array or frame only touches the values; the geometry stays
+    const values = this.current_values()
+    if (grid.source !== values) {
+      grid.values = level === 0 ? values : decimate_values(values, n_lat, n_lon, LOD_FACTORS[level])
+      grid.source = values
+      grid.quad_colors = undefined
+    }
+    return grid
+  }
+
+  private get_n_preloaded(): number {
+    const {frames, n_lat, n_lon} = this.model
+    const n = n_lat * n_lon
+    return n > 0 ? Math.floor(frames.length / n) : 0
+  }
+
+  private get_n_frames(): number {
+    // Preloaded frames, else the count announced for frames streamed into values
+    const preloaded = this.get_n_preloaded()
+    return preloaded > 0 ? preloaded : this.model.n_frames
+  }
+
+  private current_values(): Arrayable<number> {
+    // The current frame of the preloaded block (uint8 codes are dequantized
+    // once per frame), or the values property
+    const {frames, frame, frame_scale, frame_offset, n_lat, n_lon} = this.model
+    const n = n_lat * n_lon
+    const n_frames = this.get_n_preloaded()
+    if (n_frames === 0) {
+      return this.model.values
+    }
+    
+    const k = Math.max(0, Math.min(n_frames - 1, Math.floor(frame)))
+    const key = [frames, k, frame_scale, frame_offset, n]
+    if (this.frame_values !== undefined && this.frame_values.key.every((v, i) => v === key[i])) {
+      return this.frame_values.values
+    }
+    
+    let values: Arrayable<number>
+    if (frames instanceof Uint8Array) {
+      const codes = frames.subarray(k * n, (k + 1) * n)
+      const dequantized = new Float32Array(n)
+      for (let i = 0; i < n; i++) {
+        dequantized[i] = codes[i] === FRAME_NAN_CODE ? NaN : frame_offset + frame_scale * codes[i]
+      }
+      values = dequantized
+    } else if (ArrayBuffer.isView(frames)) {
+      // A view into the block: nothing is copied
+      values = (frames as Float32Array).subarray(k * n, (k + 1) * n)
+    } else {
+      values = frames.slice(k * n, (k + 1) * n)
+    }
+    this.frame_values = {key, values}
+    return values
+  }
+
+  private select_lod_level(): number {
+    // Full resolution when idle; while interacting, the finest level whose
+    // measured (or, from the first measured level, quad-count-scaled) render
+    // time fits the target
+    const {projection, render_mode, frame_time_target: target} = this.model
+    this.grid(0)
+    const lod = this.lod!
+    // Render times are only comparable within one projection, render mode and backend
+    const mode = `${projection}|${render_mode}|${this.get_gl() !== null}`
+    if (lod.mode !== mode) {
+      lod.mode = mode
+      lod.frame_ms = LOD_FACTORS.map(() => NaN)
+    }
+    // Raster maps cost per pixel, not per grid cell
+    const raster = render_mode === 'raster' && projection !== 'sphere' && projection !== 'surface_3d'
+    if (!this.interacting || !(target > 0) || raster) return 0
+    
+    const frame_ms = lod.frame_ms
+    const {n_lat, n_lon} = this.model
+    const n_quads = (level: number) => {
+      const factor = LOD_FACTORS[level]
+      return Math.max(Math.ceil((n_lat - 1) / factor), 1) * Math.max(Math.ceil((n_lon - 1) / factor), 1)
+    }
+    for (let level = 0; level < LOD_FACTORS.length; level++) {
+      let estimate = frame_ms[level]
+      if (isNaN(estimate)) {
+        const measured = frame_ms.findIndex((ms) => !isNaN(ms))
+        estimate = measured < 0 ? 0 : frame_ms[measured] * n_quads(level) / n_quads(measured)
+      }
+      if (estimate <= target) return level
+    }
+    return LOD_FACTORS.length - 1
+  }
+
+  private record_frame(start: number, elapsed: number): void {
+    if (!this.model.show_fps || !this.fps_el) return
+    
+    // Render time is smoothed; fps counts renders over the last FPS_WINDOW frames
+    this.frame_ms = this.frame_count === 0 ? elapsed : 0.9 * this.frame_ms + 0.1 * elapsed
+    const slot = this.frame_count % FPS_WINDOW
+    const oldest = this.frame_starts[this.frame_count < FPS_WINDOW ? 0 : slot]
+    const n = Math.min(this.frame_count, FPS_WINDOW)
+    this.frame_starts[slot] = start
+    this.frame_count++
+    
+    const fps = n > 0 ? n * 1000 / (start - oldest) : NaN
+    // WebGL frames are timed on the CPU side only; the GPU finishes asynchronously
+    const backend = this.get_gl() !== null ? 'webgl' : 'canvas'
+    const lod = this.lod_level > 0 ? `  lod 1/${LOD_FACTORS[this.lod_level]}` : ''
+    this.fps_el.textContent = `${backend} ${this.frame_ms.toFixed(1)} ms/frame  ${isFinite(fps) ? fps.toFixed(0) : '-'} fps${lod}`
   }
 
   private render_sphere(): void {
     if (!this.ctx) return
     
+    const gl = this.get_gl()
+    if (gl !== null) {
+      this.render_sphere_webgl(gl)
+      return
+    }
+    
     const ctx = this.ctx
     const width = this.model.width ?? 800
     const height = this.model.height ?? 800
@@ -239,11 +915,8 @@ export class SurfaceGlobeView extends LayoutDOMView {
     ctx.fillStyle = '#0a0a0a'
     ctx.fillRect(0, 0, width, height)
     
-    const lons = this.model.lons
-    const lats = this.model.lats
-    const values = this.model.values
-    const n_lat = this.model.n_lat
-    const n_lon = this.model.n_lon
+    const grid = this.grid()
+    const n_lon = grid.n_lon
     
     const angle_rad = -this.model.rotation * Math.PI / 180
     const tilt_rad = this.model.tilt * Math.PI / 180
@@ -257,79 +930,58 @@ export class SurfaceGlobeView extends LayoutDOMView {
     const cos_tilt = Math.cos(tilt_rad)
     const sin_tilt = Math.sin(tilt_rad)
     
-    // Project points
-    const projected: any[] = []
-    
-    for (let i = 0; i < lons.length; i++) {
-      const lat_rad = lats[i] * Math.PI / 180
-      const lon_rad = lons[i] * Math.PI / 180
-      
-      const x = Math.cos(lat_rad) * Math.cos(-lon_rad)
-      const y = Math.cos(lat_rad) * Math.sin(-lon_rad)
-      const z = Math.sin(lat_rad)
+    // Rotate the cached unit vectors into the reused screen x, y, depth buffer
+    const unit = this.get_unit_vectors(grid)
+    const n_points = unit.length / 3
+    if (this.sphere_screen === undefined || this.sphere_screen.length !== unit.length) {
+      this.sphere_screen = new Float32Array(unit.length)
+    }
+    const screen = this.sphere_screen
+    for (let i = 0; i < n_points; i++) {
+      const x = unit[3 * i]
+      const y = unit[3 * i + 1]
+      const z = unit[3 * i + 2]
       
       const x_rot = x * cos_angle - y * sin_angle
       const y_rot = x * sin_angle + y * cos_angle
       const y_tilt = y_rot * cos_tilt - z * sin_tilt
       const z_tilt = y_rot * sin_tilt + z * cos_tilt
       
-      projected.push({
-        x: cx + x_rot * scale,
-        y: cy - z_tilt * scale,
-        depth: y_tilt,
-        visible: y_tilt > -0.15
-      })
+      screen[3 * i] = cx + x_rot * scale
+      screen[3 * i + 1] = cy - z_tilt * scale
+      screen[3 * i + 2] = y_tilt
     }
     
-    // Get palette
+    // The sphere is convex: once quads facing away are culled the rest never
+    // overlap, so no depth sort is needed and each colour is one path
     const palette = this.get_palette()
-    const {vmin, vmax} = this.get_value_range()
-    
-    // Draw quads
-    const quads: any[] = []
+    const {order, offsets} = this.get_quad_colors(grid, palette.length)
+    ctx.lineWidth = 0.5
     
-    for (let i = 0; i < n_lat - 1; i++) {
-      for (let j = 0; j < n_lon - 1; j++) {
-        const idx0 = i * n_lon + j
-        const idx1 = i * n_lon + (j + 1)
-        const idx2 = (i + 1) * n_lon + (j + 1)
-        const idx3 = (i + 1) * n_lon + j
+    for (let c = 0; c < offsets.length - 1; c++) {
+      if (offsets[c] === offsets[c + 1]) continue
+      
+      ctx.beginPath()
+      for (let k = offsets[c]; k < offsets[c + 1]; k++) {
+        const idx0 = order[k]
+        const idx1 = idx0 + 1
+        const idx2 = idx0 + n_lon + 1
+        const idx3 = idx0 + n_lon
         
-        const p0 = projected[idx0]
-        const p1 = projected[idx1]
-        const p2 = projected[idx2]
-        const p3 = projected[idx3]
+        // Back-face culling: on a sphere the quad faces the viewer when its centre does
+        if (screen[3 * idx0 + 2] + screen[3 * idx1 + 2] + screen[3 * idx2 + 2] + screen[3 * idx3 + 2] <= 0) continue
         
-        if (p0.visible || p1.visible || p2.visible || p3.visible) {
-          const avg_value = (values[idx0] + values[idx1] + values[idx2] + values[idx3]) / 4
-          const avg_depth = (p0.depth + p1.depth + p2.depth + p3.depth) / 4
-          
-          const color = this.value_to_color(avg_value, palette, vmin, vmax)
-          
-          quads.push({
-            depth: avg_depth,
-            points: [p0, p1, p2, p3],
-            color: color
-          })
-        }
+        ctx.moveTo(screen[3 * idx0], screen[3 * idx0 + 1])
+        ctx.lineTo(screen[3 * idx1], screen[3 * idx1 + 1])
+        ctx.lineTo(screen[3 * idx2], screen[3 * idx2 + 1])
+        ctx.lineTo(screen[3 * idx3], screen[3 * idx3 + 1])
+        ctx.closePath()
       }
-    }
-    
-    // Sort back to front
-    quads.sort((a, b) => a.depth - b.depth)
-    
-    // Draw
-    for (const quad of quads) {
-      ctx.fillStyle = quad.color
-      ctx.strokeStyle = quad.color
-      ctx.lineWidth = 0.5
       
-      ctx.beginPath()
-      ctx.moveTo(quad.points[0].x, quad.points[0].y)
-      ctx.lineTo(quad.points[1].x, quad.points[1].y)
-      ctx.lineTo(quad.points[2].x, quad.points[2].y)
-      ctx.lineTo(quad.points[3].x, quad.points[3].y)
-      ctx.closePath()
+      // The last bucket holds the quads with NaN values
+      const color = c < palette.length ? palette[c] : this.model.nan_color
+      ctx.fillStyle = color
+      ctx.strokeStyle = color
       ctx.fill()
       ctx.stroke()
     }
@@ -340,6 +992,104 @@ export class SurfaceGlobeView extends LayoutDOMView {
     }
   }
 
+  private get_unit_vectors(grid: Grid): Float32Array {
+    // Unit-sphere position of every grid point, built once per grid
+    const {lons, lats} = grid
+    if (grid.unit === undefined) {
+      const unit = new Float32Array(3 * lons.length)
+      for (let i = 0; i < lons.length; i++) {
+        const lat_rad = lats[i] * Math.PI / 180
+        const lon_rad = lons[i] * Math.PI / 180
+        unit[3 * i] = Math.cos(lat_rad) * Math.cos(-lon_rad)
+        unit[3 * i + 1] = Math.cos(lat_rad) * Math.sin(-lon_rad)
+        unit[3 * i + 2] = Math.sin(lat_rad)
+      }
+      grid.unit = unit
+    }
+    return grid.unit
+  }
+
+  private get_quad_colors(grid: Grid, n_colors: number): {order: Int32Array, offsets: Int32Array} {
+    // Palette index of every quad (its first corner's grid index, grouped by
+    // colour with a counting sort; bucket n_colors holds NaN), rebuilt only
+    // when the grid or colour range change
+    const {values, n_lat, n_lon} = grid
+    const {vmin, vmax} = this.model
+    const key = [vmin, vmax, n_colors]
+    const cached = grid.quad_colors
+    if (cached !== undefined && cached.key.every((v, i) => v === key[i] || (Number.isNaN(v) && Number.isNaN(key[i])))) {
+      return cached
+    }
+    
+    const range = this.get_value_range()
+    const n_quads = Math.max(n_lat - 1, 0) * Math.max(n_lon - 1, 0)
+    const color = new Int32Array(n_quads)
+    const offsets = new Int32Array(n_colors + 2)
+    let q = 0
+    for (let i = 0; i < n_lat - 1; i++) {
+      for (let j = 0; j < n_lon - 1; j++) {
+        const idx0 = i * n_lon + j
+        const avg_value = (values[idx0] + values[idx0 + 1] + values[idx0 + n_lon + 1] + values[idx0 + n_lon]) / 4
+        let c = n_colors
+        if (!isNaN(avg_value)) {
+          // Same bin as value_to_color
+          const idx = Math.floor((avg_value - range.vmin) / (range.vmax - range.vmin) * (n_colors - 1))
+          c = idx >= n_colors - 1 ? n_colors - 1 : idx > 0 ? idx : 0  // NaN (vmin == vmax) -> 0
+        }
+        color[q++] = c
+        offsets[c + 1]++
+      }
+    }
+    for (let c = 0; c <= n_colors; c++) {
+      offsets[c + 1] += offsets[c]
+    }
+    const order = new Int32Array(n_quads)
+    const next = offsets.slice(0, n_colors + 1)
+    q = 0
+    for (let i = 0; i < n_lat - 1; i++) {
+      for (let j = 0; j < n_lon - 1; j++) {
+        order[next[color[q++]]++] = i * n_lon + j
+      }
+    }
+    
+    grid.quad_colors = {key, order, offsets}
+    return grid.quad_colors
+  }
+
+  private render_sphere_webgl(gl: GlobeGL): void {
+    const ctx = this.ctx!
+    const width = this.model.width ?? 800
+    const height = this.model.height ?? 800
+    ctx.clearRect(0, 0, width, height)
+    
+    const grid = this.grid()
+    const {lons, lats, n_lat, n_lon} = grid
+    gl.set_grid(n_lat, n_lon, false)
+    gl.set_positions(['sphere', lons, lats], () => this.get_unit_vectors(grid))
+    this.upload_gl_colors(gl, grid)
+    
+    const angle_rad = -this.model.rotation * Math.PI / 180
+    const tilt_rad = this.model.tilt * Math.PI / 180
+    const scale = (Math.min(width, height) / 2) * 0.85 * this.model.zoom
+    const cos_angle = Math.cos(angle_rad)
+    const sin_angle = Math.sin(angle_rad)
+    const cos_tilt = Math.cos(tilt_rad)
+    const sin_tilt = Math.sin(tilt_rad)
+    
+    // Rows: x_rot, z_tilt (screen up) and y_tilt (towards the viewer); column-major
+    const view = [
+      cos_angle, sin_angle * sin_tilt, sin_angle * cos_tilt,
+      -sin_angle, cos_angle * sin_tilt, cos_angle * cos_tilt,
+      0, cos_tilt, -sin_tilt,
+    ]
+    gl.draw({view, scale: [scale / (width / 2), scale / (height / 2)], offset: [0, 0], depth_range: [0, 0.99]},
+            this.gl_colors(1))
+    
+    if (this.model.show_coastlines) {
+      this.draw_coastlines_sphere(cos_angle, sin_angle, cos_tilt, sin_tilt, scale, width / 2, height / 2)
+    }
+  }
+
   private render_mollweide(): void {
     if (!this.ctx) return
     
@@ -350,11 +1100,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
     ctx.fillStyle = '#0a0a0a'
     ctx.fillRect(0, 0, width, height)
     
-    const lons = this.model.lons
-    const lats = this.model.lats
-    const values = this.model.values
-    const n_lat = this.model.n_lat
-    const n_lon = this.model.n_lon
+    const {lons, lats, values, n_lat, n_lon} = this.grid()
     const zoom = this.model.zoom
     const rotation = this.model.rotation
     
@@ -362,6 +1108,14 @@ export class SurfaceGlobeView extends LayoutDOMView {
     const cx = width / 2 + this.pan_offset_x
     const cy = height / 2 + this.pan_offset_y
     
+    if (this.model.render_mode === 'raster') {
+      this.render_raster('mollweide', scale, cx, cy, rotation)
+      if (this.model.show_coastlines) {
+        this.draw_coastlines_map('mollweide', scale, cx, cy, rotation)
+      }
+      return
+    }
+    
     const projected: any[] = []
     
     for (let i = 0; i < lons.length; i++) {
@@ -456,11 +1210,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
     ctx.fillStyle = '#0a0a0a'
     ctx.fillRect(0, 0, width, height)
     
-    const lons = this.model.lons
-    const lats = this.model.lats
-    const values = this.model.values
-    const n_lat = this.model.n_lat
-    const n_lon = this.model.n_lon
+    const {lons, lats, values, n_lat, n_lon} = this.grid()
     const zoom = this.model.zoom
     const rotation = this.model.rotation
     
@@ -468,6 +1218,14 @@ export class SurfaceGlobeView extends LayoutDOMView {
     const cx = width / 2 + this.pan_offset_x
     const cy = height / 2 + this.pan_offset_y
     
+    if (this.model.render_mode === 'raster') {
+      this.render_raster('natural_earth', scale, cx, cy, rotation)
+      if (this.model.show_coastlines) {
+        this.draw_coastlines_map('natural_earth', scale, cx, cy, rotation)
+      }
+      return
+    }
+    
     const projected: any[] = []
     
     for (let i = 0; i < lons.length; i++) {
@@ -527,11 +1285,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
     ctx.fillStyle = '#0a0a0a'
     ctx.fillRect(0, 0, width, height)
     
-    const lons = this.model.lons
-    const lats = this.model.lats
-    const values = this.model.values
-    const n_lat = this.model.n_lat
-    const n_lon = this.model.n_lon
+    const {lons, lats, values, n_lat, n_lon} = this.grid()
     const zoom = this.model.zoom
     const rotation = this.model.rotation
     
@@ -539,6 +1293,14 @@ export class SurfaceGlobeView extends LayoutDOMView {
     const cx = width / 2 + this.pan_offset_x
     const cy = height / 2 + this.pan_offset_y
     
+    if (this.model.render_mode === 'raster') {
+      this.render_raster('plate_carree', scale, cx, cy, rotation)
+      if (this.model.show_coastlines) {
+        this.draw_coastlines_map('plate_carree', scale, cx, cy, rotation)
+      }
+      return
+    }
+    
     const projected: any[] = []
     
     for (let i = 0; i < lons.length; i++) {
@@ -581,9 +1343,180 @@ export class SurfaceGlobeView extends LayoutDOMView {
     }
   }
 
+  private unproject(proj_type: string, x: number, y: number): {lon: number, lat: number} | null {
+    if (proj_type === 'mollweide') {
+      const s = y / Math.SQRT2
+      if (Math.abs(s) > 1) return null
+      const theta = Math.asin(s)
+      const c = Math.cos(theta)
+      const lambda = c > 0 ? Math.PI * x / (2 * Math.SQRT2 * c) : 0
+      if (Math.abs(lambda) > Math.PI) return null
+      const phi = Math.asin(Math.max(-1, Math.min(1, (2 * theta + Math.sin(2 * theta)) / Math.PI)))
+      return {lon: lambda * 180 / Math.PI, lat: phi * 180 / Math.PI}
+    }
+    
+    if (proj_type === 'natural_earth') {
+      // Same coefficients as project_natural_earth; y(phi) is inverted with Newton steps
+      const A0 = 0.8707, A1 = -0.131979, A2 = -0.013791, A3 = 0.003971, A4 = -0.001529
+      const B0 = 1.007226, B1 = 0.015085, B2 = -0.044475, B3 = 0.028874, B4 = -0.005916
+      const y_of = (phi: number) => {
+        const phi2 = phi * phi
+        const phi4 = phi2 * phi2
+        return phi * (B0 + phi2 * (B1 + phi4 * (B2 + B3 * phi2 + B4 * phi4)))
+      }
+      if (Math.abs(y) > y_of(Math.PI / 2)) return null
+      let phi = y
+      for (let i = 0; i < 20; i++) {
+        const phi2 = phi * phi
+        const phi4 = phi2 * phi2
+        const slope = B0 + phi2 * (3 * B1 + phi4 * (7 * B2 + 9 * B3 * phi2 + 11 * B4 * phi4))
+        const delta = (y_of(phi) - y) / slope
+        phi -= delta
+        if (Math.abs(delta) < 1e-11) break
+      }
+      const phi2 = phi * phi
+      const phi4 = phi2 * phi2
+      const lambda = x / (A0 + phi2 * (A1 + phi2 * (A2 + phi4 * phi2 * (A3 + phi2 * A4))))
+      if (Math.abs(lambda) > Math.PI) return null
+      return {lon: lambda * 180 / Math.PI, lat: phi * 180 / Math.PI}
+    }
+    
+    if (proj_type === 'plate_carree') {
+      const lon = x * 180 / Math.PI
+      const lat = y * 180 / Math.PI
+      if (Math.abs(lon) > 180 || Math.abs(lat) > 90) return null
+      return {lon, lat}
+    }
+    
+    return null
+  }
+
+  private get_inverse_map(proj_type: string, width: number, height: number,
+                          scale: number, cx: number, cy: number): {lon: Float32Array, lat: Float32Array} {
+    // Only the projection, canvas size, zoom and pan change the per-pixel lon/lat;
+    // rotation is a longitude shift applied while sampling
+    const key = `${proj_type}|${width}x${height}|${scale}|${cx}|${cy}`
+    if (this.inverse_map?.key === key) {
+      return this.inverse_map
+    }
+    
+    const lon = new Float32Array(width * height).fill(NaN)
+    const lat = new Float32Array(width * height).fill(NaN)
+    for (let py = 0; py < height; py++) {
+      const y = (cy - (py + 0.5)) / scale
+      for (let px = 0; px < width; px++) {
+        const ll = this.unproject(proj_type, (px + 0.5 - cx) / scale, y)
+        if (ll !== null) {
+          lon[py * width + px] = ll.lon
+          lat[py * width + px] = ll.lat
+        }
+      }
+    }
+    
+    this.inverse_map = {key, lon, lat}
+    return this.inverse_map
+  }
+
+  private parse_color(color: string): [number, number, number] {
+    return [parseInt(color.slice(1, 3), 16), parseInt(color.slice(3, 5), 16), parseInt(color.slice(5, 7), 16)]
+  }
+
+  private get_palette_rgb(): Uint8Array {
+    const name = this.model.palette
+    if (this.palette_rgb?.name !== name) {
+      const palette = this.get_palette()
+      const rgb = new Uint8Array(palette.length * 3)
+      palette.forEach((color, i) => rgb.set(this.parse_color(color), i * 3))
+      this.palette_rgb = {name, rgb}
+    }
+    return this.palette_rgb.rgb
+  }
+
+  private render_raster(proj_type: string, scale: number, cx: number, cy: number, rotation: number): void {
+    // One ImageData for the whole map: each pixel is inverse-projected (cached),
+    // bilinearly sampled from the regular lat/lon grid and colored, instead of
+    // one canvas path per grid cell
+    if (!this.ctx) return
+    
+    const ctx = this.ctx
+    const width = this.model.width ?? 800
+    const height = this.model.height ?? 800
+    const {lon, lat} = this.get_inverse_map(proj_type, width, height, scale, cx, cy)
+    
+    const lons = this.model.lons
+    const lats = this.model.lats
+    const values = this.current_values()
+    const n_lat = this.model.n_lat
+    const n_lon = this.model.n_lon
+    const lon0 = lons[0]
+    const dlon = (lons[n_lon - 1] - lon0) / (n_lon - 1)
+    const lat0 = lats[0]
+    const dlat = (lats[(n_lat - 1) * n_lon] - lat0) / (n_lat - 1)
+    // A grid of n_lon columns covering exactly 360 degrees wraps around at the seam
+    const periodic = Math.abs(Math.abs(dlon) * n_lon - 360) < 1e-6
+    
+    const rgb = this.get_palette_rgb()
+    const n_colors = rgb.length / 3
+    const [nan_r, nan_g, nan_b] = this.parse_color(this.model.nan_color)
+    const {vmin, vmax} = this.get_value_range()
+    
+    const image = ctx.createImageData(width, height)
+    const out = image.data
+    
+    for (let k = 0; k < lon.length; k++) {
+      const o = 4 * k
+      out[o + 3] = 255
+      if (isNaN(lat[k])) {
+        // Off the map: background
+        out[o] = 10
+        out[o + 1] = 10
+        out[o + 2] = 10
+        continue
+      }
+      
+      // The forward path draws lons - rotation, so sample at lon + rotation
+      let fx = (lon[k] + rotation - lon0) / dlon
+      const fy = (lat[k] - lat0) / dlat
+      let value = NaN
+      if (periodic) {
+        fx = ((fx % n_lon) + n_lon) % n_lon
+      }
+      if (fy >= 0 && fy <= n_lat - 1 && fx >= 0 && (periodic || fx <= n_lon - 1)) {
+        const i = Math.min(Math.floor(fy), n_lat - 2)
+        const j = periodic ? Math.floor(fx) : Math.min(Math.floor(fx), n_lon - 2)
+        const j1 = periodic ? (j + 1) % n_lon : j + 1
+        const wy = fy - i
+        const wx = fx - j
+        const top = (1 - wx) * values[i * n_lon + j] + wx * values[i * n_lon + j1]
+        const bottom = (1 - wx) * values[(i + 1) * n_lon + j] + wx * values[(i + 1) * n_lon + j1]
+        value = (1 - wy) * top + wy * bottom
+      }
+      
+      if (isNaN(value)) {
+        out[o] = nan_r
+        out[o + 1] = nan_g
+        out[o + 2] = nan_b
+      } else {
+        const idx = Math.floor((value - vmin) / (vmax - vmin) * (n_colors - 1))
+        const c = 3 * Math.max(0, Math.min(n_colors - 1, idx))
+        out[o] = rgb[c]
+        out[o + 1] = rgb[c + 1]
+        out[o + 2] = rgb[c + 2]
+      }
+    }
+    
+    ctx.putImageData(image, 0, 0)
+  }
+
   private render_surface_3d(): void {
     if (!this.ctx) return
     
+    const gl = this.get_gl()
+    if (gl !== null) {
+      this.render_surface_3d_webgl(gl)
+      return
+    }
+    
     const ctx = this.ctx
     const width = this.model.width ?? 800
     const height = this.model.height ?? 800
@@ -591,11 +1524,8 @@ export class SurfaceGlobeView extends LayoutDOMView {
     ctx.fillStyle = '#0a0a0a'
     ctx.fillRect(0, 0, width, height)
     
-    const lons = this.model.lons  // Treat as X values
-    const lats = this.model.lats  // Treat as Y values
-    const values = this.model.values  // Treat as Z values
-    const n_lat = this.model.n_lat
-    const n_lon = this.model.n_lon
+    // lons, lats and values are the X, Y and Z values
+    const {lons, lats, values, n_lat, n_lon} = this.grid()
     
     const elev_rad = this.model.tilt * Math.PI / 180
     const azim_rad = this.model.rotation * Math.PI / 180
@@ -707,6 +1637,69 @@ export class SurfaceGlobeView extends LayoutDOMView {
     }
   }
 
+  private render_surface_3d_webgl(gl: GlobeGL): void {
+    const ctx = this.ctx!
+    const width = this.model.width ?? 800
+    const height = this.model.height ?? 800
+    ctx.clearRect(0, 0, width, height)
+    
+    const grid = this.grid()
+    const {lons, lats, values, n_lat, n_lon} = grid
+    gl.set_grid(n_lat, n_lon, true)
+    gl.set_positions(['surface_3d', lons, lats, values], () => {
+      const positions = new Float32Array(3 * lons.length)
+      for (let i = 0; i < lons.length; i++) {
+        positions[3 * i] = lons[i]
+        positions[3 * i + 1] = lats[i]
+        positions[3 * i + 2] = values[i]
+      }
+      return positions
+    })
+    this.upload_gl_colors(gl, grid)
+    
+    const elev_rad = this.model.tilt * Math.PI / 180
+    const azim_rad = this.model.rotation * Math.PI / 180
+    const cos_azim = Math.cos(azim_rad)
+    const sin_azim = Math.sin(azim_rad)
+    const cos_elev = Math.cos(elev_rad)
+    const sin_elev = Math.sin(elev_rad)
+    // Rows: x_proj, z_proj (screen up) and depth, as render_surface_3d projects them; column-major
+    const view = [
+      cos_azim, sin_azim * sin_elev, sin_azim * cos_elev,
+      -sin_azim, cos_azim * sin_elev, cos_azim * cos_elev,
+      0, cos_elev, -sin_elev,
+    ]
+    
+    // Screen bounds of the projected surface, for the same fit-to-canvas scaling
+    const positions = gl.positions
+    let x_min = Infinity, x_max = -Infinity
+    let y_min = Infinity, y_max = -Infinity
+    let d_min = Infinity, d_max = -Infinity
+    for (let k = 0; k < positions.length; k += 3) {
+      const x = positions[k], y = positions[k + 1], z = positions[k + 2]
+      const px = view[0] * x + view[3] * y
+      const py = view[1] * x + view[4] * y + view[7] * z
+      const pd = view[2] * x + view[5] * y + view[8] * z
+      if (px < x_min) x_min = px
+      if (px > x_max) x_max = px
+      if (py < y_min) y_min = py
+      if (py > y_max) y_max = py
+      if (pd < d_min) d_min = pd
+      if (pd > d_max) d_max = pd
+    }
+    
+    const scale = (Math.min(width, height) / Math.max(x_max - x_min, y_max - y_min)) * 0.7 * this.model.zoom
+    const scale_x = scale / (width / 2)
+    const scale_y = scale / (height / 2)
+    const d_half = (d_max - d_min) / 2 || 1
+    gl.draw({
+      view,
+      scale: [scale_x, scale_y],
+      offset: [-(x_min + x_max) / 2 * scale_x, -(y_min + y_max) / 2 * scale_y],
+      depth_range: [(d_min + d_max) / 2, 0.99 / d_half],
+    }, this.gl_colors(0.9), this.parse_color('#306998').map((c) => c / 255))
+  }
+
   private get_palette(): string[] {
     const name = this.model.palette
     
@@ -724,10 +1717,10 @@ export class SurfaceGlobeView extends LayoutDOMView {
     let vmax = this.model.vmax
     
     if (isNaN(vmin) || isNaN(vmax)) {
-      const values = this.model.values.filter((v: number) => !isNaN(v))
-      if (values.length > 0) {
-        if (isNaN(vmin)) vmin = Math.min(...values)
-        if (isNaN(vmax)) vmax = Math.max(...values)
+      const {lo, hi} = this.get_data_range()
+      if (lo <= hi) {
+        if (isNaN(vmin)) vmin = lo
+        if (isNaN(vmax)) vmax = hi
       } else {
         vmin = 0
         vmax = 1
@@ -737,6 +1730,37 @@ export class SurfaceGlobeView extends LayoutDOMView {
     return {vmin, vmax}
   }
 
+  private get_data_range(): {lo: number, hi: number} {
+    // Min and max of the values, or of every preloaded frame so the colour
+    // scale holds still during playback; cached per data
+    const {frames, values, frame_scale, frame_offset, n_lat, n_lon} = this.model
+    const use_frames = n_lat * n_lon > 0 && frames.length >= n_lat * n_lon
+    const key = use_frames ? [frames, frame_scale, frame_offset] : [values]
+    if (this.data_range !== undefined && this.data_range.key.every((v, i) => v === key[i])) {
+      return this.data_range
+    }
+    
+    // One pass over the typed array; spreading millions of values into Math.min overflows the stack
+    const data = use_frames ? frames : values
+    const quantized = use_frames && frames instanceof Uint8Array
+    let lo = Infinity
+    let hi = -Infinity
+    for (let i = 0; i < data.length; i++) {
+      const v = data[i]
+      if (quantized && v === FRAME_NAN_CODE) continue
+      if (v < lo) lo = v
+      if (v > hi) hi = v
+    }
+    if (quantized && lo <= hi) {
+      const a = frame_offset + frame_scale * lo
+      const b = frame_offset + frame_scale * hi
+      lo = Math.min(a, b)
+      hi = Math.max(a, b)
+    }
+    this.data_range = {key, lo, hi}
+    return this.data_range
+  }
+
   private value_to_color(value: number, palette: string[], vmin: number, vmax: number): string {
     if (isNaN(value)) {
       return this.model.nan_color
@@ -764,7 +1788,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
     let drawing = false
     
     for (let i = 0; i < coast_lons.length; i++) {
-      if (coast_lons[i] === null) {
+      if (isNaN(coast_lons[i])) {
         drawing = false
         continue
       }
@@ -813,7 +1837,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
     let drawing = false
     
     for (let i = 0; i < coast_lons.length; i++) {
-      if (coast_lons[i] === null) {
+      if (isNaN(coast_lons[i])) {
         drawing = false
         continue
       }
@@ -850,6 +1874,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
     const animate = () => {
       if (!this.model.autorotate || this.model.projection !== 'sphere') return
       
+      this.begin_interaction()
       // Update the model's rotation directly (continues from current position)
       this.model.rotation = (this.model.rotation + this.model.rotation_speed * 0.5) % 360
       
@@ -859,6 +1884,43 @@ export class SurfaceGlobeView extends LayoutDOMView {
     animate()
   }
 
+  private start_playback(): void {
+    // Advance frame at frame_rate; each step only swaps the values the quads are coloured from
+    this.stop_playback()
+    let last = performance.now()
+    const step = (now: number) => {
+      const n_frames = this.get_n_frames()
+      if (!this.model.playing || n_frames === 0) {
+        this.playback_id = undefined
+        return
+      }
+      
+      const interval = 1000 / Math.max(this.model.frame_rate, 1e-3)
+      if (now - last >= interval) {
+        last = now - (now - last) % interval
+        this.begin_interaction()
+        const next = (Math.floor(this.model.frame) + 1) % n_frames
+        if (this.get_n_preloaded() > 0) {
+          // Every frame is already here: step in the browser only, and sync
+          // frame back to the server once playback pauses
+          this.model.setv({frame: next}, {sync: false})
+        } else {
+          // Streamed values: the server answers each frame change with its values
+          this.model.frame = next
+        }
+      }
+      this.playback_id = requestAnimationFrame(step)
+    }
+    this.playback_id = requestAnimationFrame(step)
+  }
+
+  private stop_playback(): void {
+    if (this.playback_id !== undefined) {
+      cancelAnimationFrame(this.playback_id)
+      this.playback_id = undefined
+    }
+  }
+
   private stop_animation(): void {
     if (this.animation_id !== undefined) {
       cancelAnimationFrame(this.animation_id)
@@ -870,8 +1932,9 @@ export class SurfaceGlobeView extends LayoutDOMView {
     if (!this.tooltip_el || !this.canvas) return
     
     // Get pixel data at mouse position
-    const imageData = this.ctx!.getImageData(this.mouse_x, this.mouse_y, 1, 1)
-    const pixel = imageData.data
+    const gl = this.get_gl()
+    const pixel = gl !== null ? gl.read_pixel(this.mouse_x, this.mouse_y)
+                              : this.ctx!.getImageData(this.mouse_x, this.mouse_y, 1, 1).data
     
     // Check if we're on the globe (not black background)
     if (pixel[0] > 10 || pixel[1] > 10 || pixel[2] > 10) {
@@ -908,6 +1971,7 @@ export class SurfaceGlobeView extends LayoutDOMView {
 
   override remove(): void {
     this.stop_animation()
+    this.stop_playback()
     super.remove()
   }
 }
@@ -916,12 +1980,21 @@ export namespace SurfaceGlobe {
   export type Attrs = p.AttrsOf<Props>
 
   export type Props = LayoutDOM.Props & {
-    lons: p.Property<number[]>
-    lats: p.Property<number[]>
-    values: p.Property<number[]>
+    lons: p.Property<Arrayable<number>>
+    lats: p.Property<Arrayable<number>>
+    values: p.Property<Arrayable<number>>
+    frames: p.Property<Arrayable<number>>
+    frame: p.Property<number>
+    n_frames: p.Property<number>
+    frame_scale: p.Property<number>
+    frame_offset: p.Property<number>
+    playing: p.Property<boolean>
+    frame_rate: p.Property<number>
     n_lat: p.Property<number>
     n_lon: p.Property<number>
     projection: p.Property<string>
+    render_mode: p.Property<string>
+    output_backend: p.Property<string>
     palette: p.Property<string>
     vmin: p.Property<number>
     vmax: p.Property<number>
@@ -935,9 +2008,11 @@ export namespace SurfaceGlobe {
     show_coastlines: p.Property<boolean>
     coastline_color: p.Property<string>
     coastline_width: p.Property<number>
-    coast_lons: p.Property<any[]>
-    coast_lats: p.Property<any[]>
+    coast_lons: p.Property<Arrayable<number>>
+    coast_lats: p.Property<Arrayable<number>>
     enable_hover: p.Property<boolean>
+    frame_time_target: p.Property<number>
+    show_fps: p.Property<boolean>
   }
 }
 
@@ -954,13 +2029,23 @@ export class SurfaceGlobe extends LayoutDOM {
   static {
     this.prototype.default_view = SurfaceGlobeView
 
-    this.define<SurfaceGlobe.Props>(({Any, Bool, Float, Int, List, String}) => ({
-      lons: [ List(Float), [] ],
-      lats: [ List(Float), [] ],
-      values: [ List(Float), [] ],
+    this.define<SurfaceGlobe.Props>(({Arrayable, Bool, Float, Int, String}) => ({
+      // Binary ndarray buffers from Python arrive as typed arrays (Float32Array by default)
+      lons: [ Arrayable(Float), () => new Float32Array(0) ],
+      lats: [ Arrayable(Float), () => new Float32Array(0) ],
+      values: [ Arrayable(Float), () => new Float32Array(0) ],
+      frames: [ Arrayable(Float), () => new Float32Array(0) ],
+      frame: [ Int, 0 ],
+      n_frames: [ Int, 0 ],
+      frame_scale: [ Float, 1.0 ],
+      frame_offset: [ Float, 0.0 ],
+      playing: [ Bool, false ],
+      frame_rate: [ Float, 10.0 ],
       n_lat: [ Int, 30 ],
       n_lon: [ Int, 60 ],
       projection: [ String, 'sphere' ],
+      render_mode: [ String, 'patches' ],
+      output_backend: [ String, 'canvas' ],
       palette: [ String, 'Turbo256' ],
       vmin: [ Float, NaN ],
       vmax: [ Float, NaN ],
@@ -974,9 +2059,11 @@ export class SurfaceGlobe extends LayoutDOM {
       show_coastlines: [ Bool, true ],
       coastline_color: [ String, '#000000' ],
       coastline_width: [ Float, 1.2 ],
-      coast_lons: [ List(Any), [] ],
-      coast_lats: [ List(Any), [] ],
+      coast_lons: [ Arrayable(Float), () => new Float32Array(0) ],
+      coast_lats: [ Arrayable(Float), () => new Float32Array(0) ],
       enable_hover: [ Bool, true ],
+      frame_time_target: [ Float, 16.0 ],
+      show_fps: [ Bool, false ],
     }))
   }
 }
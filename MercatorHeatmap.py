@@ -1,12 +1,14 @@
 # https://discourse.bokeh.org/t/plotting-correctly-a-heatmap-on-a-web-mercator-map/12480
+import math
+from collections import OrderedDict
+
 import numpy as np
-import pandas as pd
 from bokeh.plotting import figure, show
-from bokeh.models import LinearColorMapper, ColorBar, Range1d
+from bokeh.models import LinearColorMapper, ColorBar, Range1d, ColumnDataSource
+from bokeh.events import RangesUpdate
 from bokeh.palettes import Viridis256
 from bokeh.io import curdoc
 import xyzservices.providers as xyz
-from scipy.interpolate import RegularGridInterpolator
 
 # Example: Create sample global gridded data with centered coordinates
 # Global grid with 0.5° latitude and 0.625° longitude resolution
@@ -58,32 +60,89 @@ def web_mercator_to_lat_lon(x, y):
 def create_heatmap_from_centers(lat_centers, lon_centers, data_2d, 
                                lat_pixel_size, lon_pixel_size):
     """
-    Convert centered grid coordinates to corner coordinates for Bokeh heatmap
+    Flatten a centered grid into per-cell column arrays for Bokeh's rect glyph.
+
+    Fully vectorized: the lat/lon columns come straight from np.meshgrid/ravel
+    (row-major, matching data_2d[i, j]) as float32, with no per-cell Python work.
     """
-    # Calculate corner coordinates from center coordinates
-    lat_edges = lat_centers - lat_pixel_size / 2
-    lon_edges = lon_centers - lon_pixel_size / 2
-    
-    # Create coordinate arrays for each pixel
-    lats = []
-    lons = []
-    values = []
-    
-    for i, lat_center in enumerate(lat_centers):
-        for j, lon_center in enumerate(lon_centers):
-            # Calculate the four corners of each pixel
-            lat_bottom = lat_center - lat_pixel_size / 2
-            lat_top = lat_center + lat_pixel_size / 2
-            lon_left = lon_center - lon_pixel_size / 2
-            lon_right = lon_center + lon_pixel_size / 2
-            
-            # For rect glyph, we need center coordinates and dimensions
-            lats.append(lat_center)
-            lons.append(lon_center)
-            values.append(data_2d[i, j])
+    lon_2d, lat_2d = np.meshgrid(np.asarray(lon_centers, dtype=np.float32),
+                                 np.asarray(lat_centers, dtype=np.float32))
+    lats = lat_2d.ravel()
+    lons = lon_2d.ravel()
+    values = np.asarray(data_2d, dtype=np.float32).ravel()
     
     return lats, lons, values, lat_pixel_size, lon_pixel_size
 
+# Reusable lat/lon grid -> Web Mercator resampler
+class MercatorResampler:
+    """
+    Bilinear resampling of a rectilinear lat/lon grid onto a Web Mercator grid.
+
+    Web Mercator x depends only on longitude and y only on latitude, so the
+    bilinear weights are separable: the source row indices and weights are
+    computed once per target row, and the column ones once per target column.
+    Calling the resampler on a new data slice (e.g. the next hourly time step)
+    is then just two gathers and multiplies, with no coordinate transforms and
+    no interpolator set-up. Results match scipy's RegularGridInterpolator with
+    method='linear' and fill_value=np.nan (NaN outside the source grid).
+    
+    Parameters:
+    -----------
+    lat_centers, lon_centers : 1D increasing arrays of the source grid
+    x_mercator, y_mercator : 1D target coordinates in Web Mercator meters
+    """
+    def __init__(self, lat_centers, lon_centers, x_mercator, y_mercator):
+        lon_target, _ = web_mercator_to_lat_lon(np.asarray(x_mercator, dtype=float), 0.0)
+        _, lat_target = web_mercator_to_lat_lon(0.0, np.asarray(y_mercator, dtype=float))
+        self.rows, self.row_weights, self.row_valid = self._axis_weights(lat_centers, lat_target)
+        self.cols, self.col_weights, self.col_valid = self._axis_weights(lon_centers, lon_target)
+        self.shape = (len(lat_target), len(lon_target))
+
+    @staticmethod
+    def _axis_weights(centers, target):
+        centers = np.asarray(centers, dtype=float)
+        idx = np.clip(np.searchsorted(centers, target, side='right') - 1, 0, len(centers) - 2)
+        weight = (target - centers[idx]) / (centers[idx + 1] - centers[idx])
+        valid = (target >= centers[0]) & (target <= centers[-1])
+        return idx, weight.astype(np.float32), valid
+
+    def __call__(self, data_2d):
+        """Resample one (n_lat, n_lon) slice; returns a float32 (height, width) grid."""
+        data_2d = np.asarray(data_2d, dtype=np.float32)
+        wy = self.row_weights[:, None]
+        rows = (1 - wy) * data_2d[self.rows] + wy * data_2d[self.rows + 1]
+        wx = self.col_weights
+        grid = (1 - wx) * rows[:, self.cols] + wx * rows[:, self.cols + 1]
+        grid[~self.row_valid, :] = np.nan
+        grid[:, ~self.col_valid] = np.nan
+        return grid
+
+_resampler_cache = OrderedDict()
+
+def get_mercator_resampler(lat_centers, lon_centers, extent, shape, max_cached=16):
+    """
+    Return a cached MercatorResampler for (source grid, target extent, resolution).
+
+    extent is (x_min, x_max, y_min, y_max) in Web Mercator meters and shape is
+    (height, width); the target grid spans the extent with np.linspace.
+    """
+    key = (np.asarray(lat_centers, dtype=float).tobytes(),
+           np.asarray(lon_centers, dtype=float).tobytes(),
+           tuple(float(v) for v in extent), tuple(shape))
+    resampler = _resampler_cache.get(key)
+    if resampler is None:
+        x_min, x_max, y_min, y_max = extent
+        height, width = shape
+        resampler = MercatorResampler(lat_centers, lon_centers,
+                                      np.linspace(x_min, x_max, width),
+                                      np.linspace(y_min, y_max, height))
+        _resampler_cache[key] = resampler
+        if len(_resampler_cache) > max_cached:
+            _resampler_cache.popitem(last=False)
+    else:
+        _resampler_cache.move_to_end(key)
+    return resampler
+
 # Method 1: Using rect glyph (recommended for regular grids)
 def plot_heatmap_with_rect(lat_centers, lon_centers, data_2d, 
                           lat_pixel_size, lon_pixel_size):
@@ -94,17 +153,17 @@ def plot_heatmap_with_rect(lat_centers, lon_centers, data_2d,
         lat_centers, lon_centers, data_2d, lat_pixel_size, lon_pixel_size
     )
     
-    # Create DataFrame
-    df = pd.DataFrame({
+    # Column arrays go straight into the source (no DataFrame round-trip)
+    source = {
         'lat': lats,
         'lon': lons,
         'value': values
-    })
+    }
     
     # Create color mapper
     color_mapper = LinearColorMapper(palette=Viridis256, 
-                                   low=min(values), 
-                                   high=max(values))
+                                   low=float(np.nanmin(values)), 
+                                   high=float(np.nanmax(values)))
     
     # Create figure
     p = figure(title="Heatmap from Centered Grid Points (Rect Method)",
@@ -116,7 +175,7 @@ def plot_heatmap_with_rect(lat_centers, lon_centers, data_2d,
     # Add rectangles
     p.rect(x='lon', y='lat', 
            width=lon_size, height=lat_size,
-           source=df,
+           source=source,
            fill_color={'field': 'value', 'transform': color_mapper},
            line_color='white', line_width=0.5)
     
@@ -172,15 +231,6 @@ def plot_heatmap_with_image_and_tiles(lat_centers, lon_centers, data_2d,
     x_min, y_min = lat_lon_to_web_mercator(lon_min, lat_min)
     x_max, y_max = lat_lon_to_web_mercator(lon_max, lat_max)
     
-    # Create interpolator for the subset grid data
-    interpolator = RegularGridInterpolator(
-        (lat_subset, lon_subset), 
-        data_subset, 
-        method='linear', 
-        bounds_error=False, 
-        fill_value=np.nan
-    )
-    
     # Define target resolution in Web Mercator space
     # Adjust resolution based on the area being plotted
     lat_span = lat_max - lat_min
@@ -196,20 +246,13 @@ def plot_heatmap_with_image_and_tiles(lat_centers, lon_centers, data_2d,
         target_width = 600
         target_height = 400
     
-    # Create uniform grid in Web Mercator space
-    x_mercator = np.linspace(x_min, x_max, target_width)
-    y_mercator = np.linspace(y_min, y_max, target_height)
-    X_mercator, Y_mercator = np.meshgrid(x_mercator, y_mercator)
-    
-    # Convert Web Mercator grid back to lat/lon for interpolation
-    LON_interp, LAT_interp = web_mercator_to_lat_lon(X_mercator, Y_mercator)
-    
-    # Create points for interpolation
-    points = np.column_stack([LAT_interp.ravel(), LON_interp.ravel()])
-    
-    # Interpolate data to the new grid
-    interpolated_data = interpolator(points)
-    interpolated_grid = interpolated_data.reshape(target_height, target_width)
+    # Resample onto a uniform Web Mercator grid; the resampler (indices and
+    # bilinear weights) is cached, so a new data_2d on the same grid/extent
+    # (e.g. the next time step) skips straight to gather-and-multiply
+    resampler = get_mercator_resampler(lat_subset, lon_subset,
+                                       (x_min, x_max, y_min, y_max),
+                                       (target_height, target_width))
+    interpolated_grid = resampler(data_subset)
     
     # Handle NaN values (areas outside original grid)
     interpolated_grid = np.ma.masked_invalid(interpolated_grid)
@@ -258,6 +301,158 @@ def plot_heatmap_with_image_and_tiles(lat_centers, lon_centers, data_2d,
     
     return p
 
+# Method 3: Server-side Web Mercator tile pyramid (bokeh serve only)
+WEB_MERCATOR_HALF = np.pi * 6378137.0  # Half the width of the Web Mercator world, in meters
+
+class MercatorTilePyramid:
+    """
+    Lazily rendered pyramid of Web Mercator tiles for a lat/lon grid.
+
+    Tiles follow the XYZ scheme (tile (0, 0) is the top-left of zoom level z)
+    and are rendered on first request by bilinear interpolation of the source
+    grid, then kept in an LRU cache of at most ``max_tiles`` entries. Each tile
+    is a (tile_size, tile_size) float32 array with row 0 at the bottom, ready
+    for Bokeh's image glyph.
+    
+    Parameters:
+    -----------
+    tile_size : int
+        Pixels per tile side (256 matches web map tiles).
+    max_tiles : int
+        LRU capacity; 128 tiles of 256x256 float32 is 32 MB.
+    max_zoom : int, optional
+        Deepest zoom level. Default: the level where one tile pixel is about a
+        quarter of a grid cell, beyond which interpolation adds no detail.
+    """
+    def __init__(self, lat_centers, lon_centers, data_2d,
+                 tile_size=256, max_tiles=128, max_zoom=None):
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.lat_centers = lat_centers
+        self.lon_centers = lon_centers
+        self.data_2d = data_2d
+        # Data extent (cell edges), clamped to the Web Mercator latitude limits
+        lat_half = (lat_centers[1] - lat_centers[0]) / 2
+        lon_half = (lon_centers[1] - lon_centers[0]) / 2
+        self.x_min, self.y_min = lat_lon_to_web_mercator(lon_centers[0] - lon_half,
+                                                         max(lat_centers[0] - lat_half, -85.0511))
+        self.x_max, self.y_max = lat_lon_to_web_mercator(lon_centers[-1] + lon_half,
+                                                         min(lat_centers[-1] + lat_half, 85.0511))
+        if max_zoom is None:
+            cell_m = 2 * lon_half * 2 * WEB_MERCATOR_HALF / 360
+            max_zoom = int(math.ceil(math.log2(2 * WEB_MERCATOR_HALF * 4 / (tile_size * cell_m))))
+        self.max_zoom = max_zoom
+        self.tiles = OrderedDict()
+        self.rendered = 0  # tiles interpolated so far (cache misses)
+
+    def zoom_for(self, x_span, pixel_width):
+        """Zoom level whose tile pixels are no larger than the screen pixels."""
+        world_px = 2 * WEB_MERCATOR_HALF * pixel_width / max(x_span, 1.0)
+        z = int(math.ceil(math.log2(max(world_px / self.tile_size, 1.0))))
+        return min(max(z, 0), self.max_zoom)
+
+    def tile_extent(self, z, tx, ty):
+        """(x0, y0, size) of tile (z, tx, ty) in Web Mercator meters."""
+        size = 2 * WEB_MERCATOR_HALF / 2 ** z
+        return -WEB_MERCATOR_HALF + tx * size, WEB_MERCATOR_HALF - (ty + 1) * size, size
+
+    def visible_tiles(self, z, x0, x1, y0, y1):
+        """Tile indices at zoom z that overlap both the view and the data."""
+        n = 2 ** z
+        size = 2 * WEB_MERCATOR_HALF / n
+        x0, x1 = max(x0, self.x_min), min(x1, self.x_max)
+        y0, y1 = max(y0, self.y_min), min(y1, self.y_max)
+        if x0 >= x1 or y0 >= y1:
+            return []
+        tx0 = max(int((x0 + WEB_MERCATOR_HALF) // size), 0)
+        tx1 = min(int((x1 + WEB_MERCATOR_HALF) // size), n - 1)
+        ty0 = max(int((WEB_MERCATOR_HALF - y1) // size), 0)
+        ty1 = min(int((WEB_MERCATOR_HALF - y0) // size), n - 1)
+        return [(z, tx, ty) for ty in range(ty0, ty1 + 1) for tx in range(tx0, tx1 + 1)]
+
+    def render_tile(self, z, tx, ty):
+        x0, y0, size = self.tile_extent(z, tx, ty)
+        step = size / self.tile_size
+        centers = (np.arange(self.tile_size) + 0.5) * step
+        resampler = MercatorResampler(self.lat_centers, self.lon_centers,
+                                      x0 + centers, y0 + centers)
+        return resampler(self.data_2d)
+
+    def get_tile(self, z, tx, ty):
+        key = (z, tx, ty)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.render_tile(z, tx, ty)
+            self.rendered += 1
+            self.tiles[key] = tile
+            if len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(key)
+        return tile
+
+    def tile_data(self, x0, x1, y0, y1, pixel_width):
+        """ColumnDataSource data (image, x, y, dw, dh) for the tiles covering a view."""
+        z = self.zoom_for(x1 - x0, pixel_width)
+        data = dict(image=[], x=[], y=[], dw=[], dh=[])
+        for key in self.visible_tiles(z, x0, x1, y0, y1):
+            tile_x, tile_y, size = self.tile_extent(*key)
+            data['image'].append(self.get_tile(*key))
+            data['x'].append(tile_x)
+            data['y'].append(tile_y)
+            data['dw'].append(size)
+            data['dh'].append(size)
+        return data
+
+def plot_heatmap_with_tile_pyramid(lat_centers, lon_centers, data_2d,
+                                   lat_pixel_size, lon_pixel_size,
+                                   pyramid=None, width=1000, height=600):
+    """
+    Plot heatmap as screen-resolution Web Mercator tiles that are re-rendered
+    on zoom/pan. Only the tiles overlapping the current x_range/y_range are
+    sent; tiles already seen are served from the pyramid's LRU cache.
+    
+    Requires a Bokeh server (``bokeh serve MercatorHeatmap.py``), since tiles
+    are produced in Python in response to RangesUpdate events.
+    """
+    if pyramid is None:
+        pyramid = MercatorTilePyramid(lat_centers, lon_centers, data_2d)
+    
+    p = figure(title=f"Global Heatmap Tiles ({lat_pixel_size}° lat × {lon_pixel_size}° lon)",
+               x_axis_type="mercator", y_axis_type="mercator",
+               width=width, height=height,
+               x_range=Range1d(pyramid.x_min, pyramid.x_max),
+               y_range=Range1d(pyramid.y_min, pyramid.y_max),
+               tools="pan,wheel_zoom,box_zoom,reset,save")
+    p.add_tile(xyz.CartoDB.DarkMatter)
+    
+    # Fixed color scale so neighbouring tiles match
+    color_mapper = LinearColorMapper(palette=Viridis256,
+                                     low=np.nanpercentile(data_2d, 2),
+                                     high=np.nanpercentile(data_2d, 98),
+                                     nan_color=(0, 0, 0, 0))
+    
+    tile_source = ColumnDataSource(pyramid.tile_data(pyramid.x_min, pyramid.x_max,
+                                                     pyramid.y_min, pyramid.y_max, width))
+    p.image(image='image', x='x', y='y', dw='dw', dh='dh', source=tile_source,
+            color_mapper=color_mapper, alpha=0.7)
+    
+    def on_ranges_update(event):
+        pixel_width = p.inner_width or width
+        tile_source.data = pyramid.tile_data(event.x0, event.x1, event.y0, event.y1, pixel_width)
+    
+    p.on_event(RangesUpdate, on_ranges_update)
+    
+    color_bar = ColorBar(color_mapper=color_mapper, width=8, location=(0,0))
+    p.add_layout(color_bar, 'right')
+    
+    return p
+
+# bokeh serve MercatorHeatmap.py
+if __name__.startswith("bokeh_app"):
+    curdoc().add_root(plot_heatmap_with_tile_pyramid(lat_centers, lon_centers, data_2d,
+                                                     lat_pixel_size, lon_pixel_size))
+
 # Example usage with global grid
 if __name__ == "__main__":
     # Global grid with your specified resolution
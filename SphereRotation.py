@@ -1,15 +1,17 @@
 # https://discourse.bokeh.org/t/rotating-the-sphere-automatically-or-manually/12505/2
 
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import xarray as xr 
 import numpy as np
-import cartopy.crs as ccrs
 from bokeh.plotting import figure, curdoc
 from bokeh.models import ColorBar, LinearColorMapper, InlineStyleSheet, ColumnDataSource,Div, GlobalInlineStyleSheet
-import cartopy.feature as cf
+from coastlines import load_coastlines
 from bokeh.layouts import column
-import pandas as pd
 from matplotlib import cm
 from matplotlib.colors import to_hex
+from ortho_projection import OrthographicProjector
 
 curdoc().theme = 'dark_minimal'
 gstyle = GlobalInlineStyleSheet(css=""" html, body, .bk, .bk-root {background-color: #15191c; margin: 0; padding: 0; height: 100%; color: white; font-family: 'Consolas', 'Courier New', monospace; } .bk { color: white; } .bk-input, .bk-btn, .bk-select, .bk-slider-title, .bk-headers, .bk-label, .bk-title, .bk-legend, .bk-axis-label { color: white !important; } .bk-input::placeholder { color: #aaaaaa !important; } """)
@@ -55,66 +57,89 @@ if not np.isclose(LON[0,0], LON[0,-1]):
 # My color palette
 rdblue256 = [to_hex(cm.get_cmap('RdBu_r')(i/255)) for i in range(256)]
 
-projection = ccrs.Orthographic()
-x, y = projection.transform_points(ccrs.PlateCarree(), LON, LAT)[:, :, :2].reshape(-1, 2).T
-x_flat = x.flatten()
-y_flat = y.flatten()
 values_flat = temperature.flatten()
-df = pd.DataFrame({'x': x_flat, 'y': y_flat, 'value': values_flat})
-source = ColumnDataSource(df)
-# Pre-compute all rotation positions
 center_lon = 0
 center_lat = 0
-rotation_speed = 30  # Changed to 60 for easier pre-computation
+rotation_speed = 30  # degrees per step
 current_step = 0
 # Calculate number of steps for full rotation
-steps = 360 // rotation_speed  # 6 steps
-print(f"Pre-computing {steps} rotation positions...")
-
-projection = ccrs.Orthographic(central_latitude=center_lat, central_longitude=center_lon)
-
-# initialize coastlines
-x_coords = []
-y_coords = []
-for coord_seq in cf.COASTLINE.geometries():
-    # Convert coordinates to NumPy arrays
-    lons = np.array([k[0] for k in coord_seq.coords])
-    lats = np.array([k[1] for k in coord_seq.coords])
-    
-    # Transform coordinates
-    transformed = projection.transform_points(ccrs.PlateCarree(), lons, lats)
-    
-    x_coords.extend(transformed[:, 0].tolist() + [np.nan])
-    y_coords.extend(transformed[:, 1].tolist() + [np.nan])
-coast_source = ColumnDataSource(data=dict(x=x_coords, y=y_coords))
-
-
-precomputed_coastlines = []
-precomputed_data = []
-for angle in range(0, 360+1, rotation_speed):
-    projection = ccrs.Orthographic(central_longitude=angle, central_latitude=center_lat)
-    x_coords = []
-    y_coords = []
-    for coord_seq in cf.COASTLINE.geometries():
-        # Convert coordinates to NumPy arrays
-        lons = np.array([k[0] for k in coord_seq.coords])
-        lats = np.array([k[1] for k in coord_seq.coords])
-        
-        # Transform coordinates
-        transformed = projection.transform_points(ccrs.PlateCarree(), lons, lats)
-        
-        x_coords.extend(transformed[:, 0].tolist() + [np.nan])
-        y_coords.extend(transformed[:, 1].tolist() + [np.nan])
-    precomputed_coastlines.append({'x': x_coords, 'y': y_coords})
-
-    # Convert to Robinson projection coordinates
-    x, y = projection.transform_points(ccrs.PlateCarree(), LON, LAT)[:, :, :2].reshape(-1, 2).T
-
-    # Flatten arrays for Bokeh
-    x_flat = x.flatten()
-    y_flat = y.flatten()
-    values_flat = temperature.flatten()
-    precomputed_data.append({'x': x_flat, 'y': y_flat, 'value': values_flat})  
+steps = 360 // rotation_speed
+
+# Coastline vertices, NaN-separated (memory-mapped from the assets0 cache)
+coast_lons, coast_lats = load_coastlines('110m')
+
+# Unit-sphere xyz of grid and coastlines, computed once; each frame is one rotation matmul
+projector = OrthographicProjector(LON, LAT, coast_lons, coast_lats)
+
+
+def compute_frame(step):
+    """Orthographic grid and coastline coordinates for one rotation step, as float32."""
+    x, y = projector.project_grid(step * rotation_speed, center_lat)
+    coast_x, coast_y = projector.project_coastlines(step * rotation_speed, center_lat)
+    return {'x': x, 'y': y, 'coast_x': coast_x, 'coast_y': coast_y}
+
+
+class FrameProvider:
+    """
+    Rotation frames computed on first request and kept in a bounded LRU cache.
+
+    get() never blocks: a frame that is not ready yet is scheduled on a single
+    worker thread and None is returned, so the periodic callback just keeps
+    the current frame for one more tick. prefetch() queues the next few frames
+    ahead of time so they are usually ready when asked for.
+    """
+    def __init__(self, compute, n_frames, max_cached=8, prefetch=3):
+        self.compute = compute
+        self.n_frames = n_frames
+        self.max_cached = max_cached
+        self.n_prefetch = prefetch
+        self.frames = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='globe-frames')
+
+    def _run(self, step):
+        try:
+            frame = self.compute(step)
+        except Exception:
+            with self.lock:
+                del self.pending[step]
+            raise
+        with self.lock:
+            del self.pending[step]
+            self.frames[step] = frame
+            while len(self.frames) > self.max_cached:
+                self.frames.popitem(last=False)
+
+    def _schedule(self, step):
+        # caller holds self.lock
+        if step not in self.frames and step not in self.pending:
+            self.pending[step] = self.executor.submit(self._run, step)
+
+    def get(self, step):
+        step %= self.n_frames
+        with self.lock:
+            frame = self.frames.get(step)
+            if frame is None:
+                self._schedule(step)
+            else:
+                self.frames.move_to_end(step)
+        return frame
+
+    def prefetch(self, step):
+        with self.lock:
+            for k in range(step, step + self.n_prefetch):
+                self._schedule(k % self.n_frames)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+frames = FrameProvider(compute_frame, steps)
+frame = compute_frame(current_step)
+source = ColumnDataSource(data=dict(x=frame['x'], y=frame['y'], value=values_flat))
+coast_source = ColumnDataSource(data=dict(x=frame['coast_x'], y=frame['coast_y']))
+frames.prefetch(current_step + 1)
 
 
 minval = -3; maxval = 3
@@ -141,12 +166,17 @@ p_globe.line(x='x', y='y', source=coast_source, color="black", line_width=1, lin
 
 def update_globe():
     global current_step
-    # print(current_step)
-    current_step = (current_step + 1) % steps
-    source.data = precomputed_data[current_step]
-    coast_source.data = precomputed_coastlines[current_step]
+    next_step = (current_step + 1) % steps
+    frame = frames.get(next_step)
+    if frame is None:
+        return  # still computing; keep the current frame this tick
+    current_step = next_step
+    source.data = dict(x=frame['x'], y=frame['y'], value=values_flat)
+    coast_source.data = dict(x=frame['coast_x'], y=frame['coast_y'])
+    frames.prefetch(current_step + 1)
 
 curdoc().add_periodic_callback(update_globe, 1000)  
+curdoc().on_session_destroyed(lambda session_context: frames.close())
 
 gradient_text = """ <div style=" font-size: 18px; font-weight: bold; background: linear-gradient(90deg, red, orange, yellow); -webkit-background-clip: text; -webkit-text-fill-color: transparent; background-clip: text; color: transparent; "> ERA5 Annual Mean Temperature Anomaly for 2024<br>compared to 1979-2024 (°C) </div> """
 divinfo = Div(text = gradient_text)
@@ -164,15 +194,14 @@ curdoc().add_root(layout)
 # MANUALLY ROTATION
 import xarray as xr 
 import numpy as np
-import cartopy.crs as ccrs
 from bokeh.plotting import figure, curdoc
 from bokeh.models import ColorBar, LinearColorMapper, Slider, InlineStyleSheet, ColumnDataSource,Div, GlobalInlineStyleSheet
 
 from bokeh.layouts import column
-import pandas as pd
-import cartopy.feature as cf
+from coastlines import load_coastlines
 from matplotlib import cm
 from matplotlib.colors import to_hex
+from ortho_projection import OrthographicProjector
 
 curdoc().theme = 'dark_minimal'
 gstyle = GlobalInlineStyleSheet(css=""" html, body, .bk, .bk-root {background-color: #15191c; margin: 0; padding: 0; height: 100%; color: white; font-family: 'Consolas', 'Courier New', monospace; } .bk { color: white; } .bk-input, .bk-btn, .bk-select, .bk-slider-title, .bk-headers, .bk-label, .bk-title, .bk-legend, .bk-axis-label { color: white !important; } .bk-input::placeholder { color: #aaaaaa !important; } """)
@@ -233,39 +262,19 @@ if not np.isclose(LON[0,0], LON[0,-1]):
 # My color palette
 rdblue256 = [to_hex(cm.get_cmap('RdBu_r')(i/255)) for i in range(256)]
 
-projection = ccrs.Orthographic()
-x, y = projection.transform_points(ccrs.PlateCarree(), LON, LAT)[:, :, :2].reshape(-1, 2).T
-x_flat = x.flatten()
-y_flat = y.flatten()
-values_flat = temperature.flatten()
-df = pd.DataFrame({'x': x_flat, 'y': y_flat, 'value': values_flat})
-source = ColumnDataSource(df)
-# Pre-compute all rotation positions
 center_lon = 0
 center_lat = 0
-rotation_speed = 30  # Changed to 60 for easier pre-computation
-current_step = 0
-# Calculate number of steps for full rotation
-steps = 360 // rotation_speed  # 6 steps
-print(f"Pre-computing {steps} rotation positions...")
-
-projection = ccrs.Orthographic(central_latitude=center_lat, central_longitude=center_lon)
-
-# initialize coastlines
-x_coords = []
-y_coords = []
-for coord_seq in cf.COASTLINE.geometries():
-    # Convert coordinates to NumPy arrays
-    lons = np.array([k[0] for k in coord_seq.coords])
-    lats = np.array([k[1] for k in coord_seq.coords])
-    
-    # Transform coordinates
-    transformed = projection.transform_points(ccrs.PlateCarree(), lons, lats)
-    
-    x_coords.extend(transformed[:, 0].tolist() + [np.nan])
-    y_coords.extend(transformed[:, 1].tolist() + [np.nan])
-
-coast_source = ColumnDataSource(data=dict(x=x_coords, y=y_coords))
+values_flat = temperature.flatten()
+
+# Coastline vertices, NaN-separated (memory-mapped from the assets0 cache)
+coast_lons, coast_lats = load_coastlines('110m')
+
+# Unit-sphere xyz of grid and coastlines, computed once; each slider move is one rotation matmul
+projector = OrthographicProjector(LON, LAT, coast_lons, coast_lats)
+x_flat, y_flat = projector.project_grid(center_lon, center_lat)
+coast_x, coast_y = projector.project_coastlines(center_lon, center_lat)
+source = ColumnDataSource(data=dict(x=x_flat, y=y_flat, value=values_flat))
+coast_source = ColumnDataSource(data=dict(x=coast_x, y=coast_y))
 
 minval = -3; maxval = 3
 
@@ -296,29 +305,10 @@ lat_slider = Slider(title="Latitude", start=-90, end=90, value=center_lat, step=
 
 
 def dataonsli(LATq,LONq):
-    projection = ccrs.Orthographic(central_longitude=LONq, central_latitude=LATq)
-    x_coords = []
-    y_coords = []
-    for coord_seq in cf.COASTLINE.geometries():
-        # Convert coordinates to NumPy arrays
-        lons = np.array([k[0] for k in coord_seq.coords])
-        lats = np.array([k[1] for k in coord_seq.coords])
-        
-        # Transform coordinates
-        transformed = projection.transform_points(ccrs.PlateCarree(), lons, lats)
-        
-        x_coords.extend(transformed[:, 0].tolist() + [np.nan])
-        y_coords.extend(transformed[:, 1].tolist() + [np.nan])
-    precomputed_coastlines = {'x': x_coords, 'y': y_coords}
-
-    # Convert to Robinson projection coordinates
-    x, y = projection.transform_points(ccrs.PlateCarree(), LON, LAT)[:, :, :2].reshape(-1, 2).T
-
-    # Flatten arrays for Bokeh
-    x_flat = x.flatten()
-    y_flat = y.flatten()
-    values_flat = temperature.flatten()
+    x_flat, y_flat = projector.project_grid(LONq, LATq)
+    coast_x, coast_y = projector.project_coastlines(LONq, LATq)
     precomputed_data = {'x': x_flat, 'y': y_flat, 'value': values_flat}
+    precomputed_coastlines = {'x': coast_x, 'y': coast_y}
     return precomputed_data,precomputed_coastlines
 
 
@@ -326,8 +316,7 @@ def slider_update(attr, old, new):
     lon = lon_slider.value
     lat = lat_slider.value
     # Update rectangles and coastlines
-    source.data = dataonsli(lat,lon)[0]
-    coast_source.data = dataonsli(lat,lon)[1]
+    source.data, coast_source.data = dataonsli(lat,lon)
 
 lon_slider.on_change('value_throttled', slider_update)
 lat_slider.on_change('value_throttled', slider_update)
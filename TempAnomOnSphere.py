@@ -1,29 +1,27 @@
 
 # https://discourse.bokeh.org/t/temperature-anomalies-on-sphere-projection/12503
-import xarray as xr 
 import numpy as np
-import cartopy.crs as ccrs
 from bokeh.plotting import figure, show, curdoc, output_file, save
 from bokeh.models import ColorBar, LinearColorMapper, BasicTicker, HoverTool, ColumnDataSource,Div, GlobalInlineStyleSheet
 from bokeh.palettes import Turbo256
 from bokeh.layouts import row, column
-import pandas as pd
-import cartopy.feature as cf
+from climate_data import yearly_anomalies
+from coastlines import load_coastlines
 from matplotlib import cm
 from matplotlib.colors import to_hex
+from ortho_projection import OrthographicProjector
 curdoc().theme = 'dark_minimal'
 gstyle = GlobalInlineStyleSheet(css=""" html, body, .bk, .bk-root {background-color: #15191c; margin: 0; padding: 0; height: 100%; color: white; font-family: 'Consolas', 'Courier New', monospace; } .bk { color: white; } .bk-input, .bk-btn, .bk-select, .bk-slider-title, .bk-headers, .bk-label, .bk-title, .bk-legend, .bk-axis-label { color: white !important; } .bk-input::placeholder { color: #aaaaaa !important; } """)
 
 # === Load and process data ===
-ds = xr.open_dataset('/home/michael/Downloads/ee574e584b1f8351c52f63525a06f50d.nc')['t2m']
-
-yearly = ds.groupby('time.year').mean('time')
-anomyearmean = yearly.sel(year=slice(2024,2024)).mean('year')-yearly.mean('year')
-spatial_avg = yearly.weighted(np.cos(np.deg2rad(ds.lat))).mean(( 'lat',"lon"))
-anoyear = spatial_avg - spatial_avg.mean('year')
-
-lon = yearly.lon.values
-lat = yearly.lat.values
+# Yearly anomaly map and area-weighted anomaly per year, reduced from the file in
+# dask chunks once per file version and cached in assets0/climate_cache
+anomalies_ds = yearly_anomalies('/home/michael/Downloads/ee574e584b1f8351c52f63525a06f50d.nc', 't2m', year=2024)
+anomyearmean = anomalies_ds['anomaly_map']
+anoyear = anomalies_ds['anomaly']
+
+lon = anomyearmean.lon.values
+lat = anomyearmean.lat.values
 LON, LAT = np.meshgrid(lon, lat)
 temperature = anomyearmean.values
 # temperature = 20 * np.cos(np.radians(LAT)) + 5 * np.sin(np.radians(2 * LON)) + np.random.normal(0, 1, LAT.shape)
@@ -60,45 +58,20 @@ colorbar_fig.add_layout(color_bar, 'right')
 
 # === Globe projection ===
 
-def visible_mask(lon, lat, center_lon, center_lat):
-    lon = np.radians(lon)
-    lat = np.radians(lat)
-    clon = np.radians(center_lon)
-    clat = np.radians(center_lat)
-    x = np.cos(lat) * np.cos(lon)
-    y = np.cos(lat) * np.sin(lon)
-    z = np.sin(lat)
-    cx = np.cos(clat) * np.cos(clon)
-    cy = np.cos(clat) * np.sin(clon)
-    cz = np.sin(clat)
-    dot = x * cx + y * cy + z * cz
-    return dot > 0
+# Coastline vertices, NaN-separated (memory-mapped from the assets0 cache)
+coast_lons, coast_lats = load_coastlines('110m')
+
+# Unit-sphere xyz of grid and coastlines, computed once; each globe is one rotation matmul
+projector = OrthographicProjector(LON, LAT, coast_lons, coast_lats)
+values_flat = temperature.flatten()
 
 
 def make_sphere(LONq, LATq, title):
-    projection = ccrs.Orthographic(central_latitude=LATq, central_longitude=LONq)
-    x, y = projection.transform_points(ccrs.PlateCarree(), LON, LAT)[:, :, :2].reshape(-1, 2).T
-    x_flat = x.flatten()
-    y_flat = y.flatten()
-    values_flat = temperature.flatten()
-    df = pd.DataFrame({'x': x_flat, 'y': y_flat, 'value': values_flat})
-    source = ColumnDataSource(df)
-
-    # initialize coastlines
-    x_coords = []
-    y_coords = []
-    for coord_seq in cf.COASTLINE.geometries():
-        # Convert coordinates to NumPy arrays
-        lons = np.array([k[0] for k in coord_seq.coords])
-        lats = np.array([k[1] for k in coord_seq.coords])
-        
-        # Transform coordinates
-        transformed = projection.transform_points(ccrs.PlateCarree(), lons, lats)
-        
-        x_coords.extend(transformed[:, 0].tolist() + [np.nan])
-        y_coords.extend(transformed[:, 1].tolist() + [np.nan])
-
-    coast_source = ColumnDataSource(data=dict(x=x_coords, y=y_coords))
+    x_flat, y_flat = projector.project_grid(LONq, LATq)
+    source = ColumnDataSource(data=dict(x=x_flat, y=y_flat, value=values_flat))
+
+    coast_x, coast_y = projector.project_coastlines(LONq, LATq)
+    coast_source = ColumnDataSource(data=dict(x=coast_x, y=coast_y))
 
 
     minval = -3; maxval = 3
@@ -1,7 +1,7 @@
 # WM_app.py
+import json
 import os
 import numpy as np
-import requests
 from datetime import datetime
 
 from bokeh.io import curdoc
@@ -16,6 +16,7 @@ from bokeh.models import (
 )
 from bokeh.plotting import figure
 from bokeh.models import WMTSTileSource
+from weather_fetch import READING_FIELDS, shared_cache
 
 def cusj():
     num=1
@@ -146,39 +147,52 @@ p.add_layout(color_bar, "right")
 
 
 # ─── Data fetch + update ───────────────────────────────────────────────────────
+# All sessions read through one process-wide TTL cache, so upstream load is one
+# request per city per minute however many viewers are connected. Misses are
+# fetched on a bounded thread pool; readings land in `source` in one next-tick callback.
+doc = curdoc()
+weather_cache = shared_cache(API_KEY, ttl=UPDATE_INTERVAL_MS / 1000, max_workers=16, timeout=5.0)
+
+
+def diff_columns(data, new_columns):
+    """Build a ColumnDataSource.patch() payload holding only the changed indices."""
+    patches = {}
+    for name, new_values in new_columns.items():
+        changed = [(i, new) for i, (old, new) in enumerate(zip(data[name], new_values)) if old != new]
+        if changed:
+            patches[name] = changed
+    return patches
+
+
+def payload_bytes(obj):
+    """Approximate websocket size of a column update as compact JSON."""
+    return len(json.dumps(obj, separators=(",", ":")))
+
+
+def apply_readings(readings):
+    new_columns = {
+        field: [r[field] for r in readings] for field in READING_FIELDS
+    }
+    patches = diff_columns(source.data, new_columns)
+    full_bytes = payload_bytes(new_columns)
+    patch_bytes = payload_bytes(patches)
+    if patches:
+        # Send only the changed cells instead of rewriting all four columns
+        source.patch(patches)
+    n_changed = sum(len(changes) for changes in patches.values())
+    stats = weather_cache.stats()
+    print(f"[{datetime.now():%H:%M:%S}] weather refresh: {n_changed} values changed, "
+          f"sent {patch_bytes} B instead of {full_bytes} B (saved {full_bytes - patch_bytes} B) "
+          f"| cache hits {stats['hits']} misses {stats['misses']}")
+
+
 def fetch_and_update():
-    new_cloud, new_temp, new_hum, new_pressure = [], [], [], []
-    for city in cities:
-        params = {
-            "lat": city["lat"],
-            "lon": city["lon"],
-            "appid": API_KEY,
-            "units": "metric",
-        }
-        try:
-            data = requests.get(
-                "https://api.openweathermap.org/data/2.5/weather", params=params
-            ).json()
-            clouds = data.get("clouds", {}).get("all", 0)
-            temp = data.get("main", {}).get("temp", 0)
-            hum = data.get("main", {}).get("humidity", 0)
-            pressure = data.get("main", {}).get("pressure", 0)
-        except Exception:
-            clouds, temp, hum, pressure = 0, 0, 0, 0
-
-        new_cloud.append(clouds)
-        new_temp.append(temp)
-        new_hum.append(hum)
-        new_pressure.append(pressure)
-    # Update all three columns at once
-    source.data.update(
-        cloud=new_cloud, temp=new_temp, humidity=new_hum, pressure=new_pressure
-    )
+    weather_cache.refresh(doc, cities, apply_readings)
 
 
 # Initial load + periodic refresh
 fetch_and_update()
-curdoc().add_periodic_callback(fetch_and_update, UPDATE_INTERVAL_MS)
+doc.add_periodic_callback(fetch_and_update, UPDATE_INTERVAL_MS)
 
 # Add to document
-curdoc().add_root(p)
+doc.add_root(p)
@@ -1,16 +1,15 @@
 # https://discourse.bokeh.org/t/animated-flights/12629
 
 from bokeh.plotting import figure, curdoc
-from bokeh.models import ColumnDataSource, WMTSTileSource
+from bokeh.models import ColumnDataSource, CustomJS, WMTSTileSource
+from bokeh.transform import linear_cmap
+from collections import deque
 import numpy as np
 import random
+import sys
+import time
 
-# Helper: WGS84 → Web Mercator (vectorized)
-def wgs84_to_web_mercator(lon, lat):
-    k = 6378137
-    x = lon * (k * np.pi / 180.0)
-    y = np.log(np.tan((90 + lat) * np.pi / 360.0)) * k
-    return x, y
+from flight_arcs import route_arcs
 
 # Major global cities (optimized selection)
 CITIES = {
@@ -46,21 +45,6 @@ CITIES = {
     "Melbourne": (144.9631, -37.8136)
 }
 
-# Optimized flight arc generation (reduced steps for performance)
-def generate_flight_arc(lon1, lat1, lon2, lat2, steps=200):
-    t = np.linspace(0, 1, steps)
-    
-    # Vectorized great circle interpolation
-    lon_arc = lon1 + (lon2 - lon1) * t
-    lat_arc = lat1 + (lat2 - lat1) * t
-    
-    # Altitude curve
-    distance = np.sqrt((lon2 - lon1)**2 + (lat2 - lat1)**2)
-    altitude_factor = min(distance * 0.7, 18)
-    lat_arc += altitude_factor * np.sin(np.pi * t) * (1 - 0.3 * t)
-    
-    return wgs84_to_web_mercator(lon_arc, lat_arc)
-
 # Create Bokeh figure
 p = figure(
     x_range=(-2e7, 2e7), 
@@ -86,7 +70,19 @@ p.ygrid.grid_line_color = None
 
 # Optimized parameters
 N_FLIGHTS = 50
-trail_length = 45
+ARC_STEPS = 200
+TICK_MS = 33  # 30fps
+trail_length = 15  # ticks; ~45 arc points at the mean speed of 3 points/tick
+
+# "client": each route is shipped once and the browser animates it with
+#           requestAnimationFrame; the server only sends a new route when a flight lands.
+# "server": every tick is computed in Python and streamed to the browser.
+#           bokeh serve animated_flights.py --args server
+ANIMATION_MODE = sys.argv[1] if len(sys.argv) > 1 else "client"
+# How often the server checks for landed flights in client mode, and how long
+# it waits past the computed landing time before sending the next route
+RELAUNCH_CHECK_MS = 250
+LANDING_GRACE_S = 0.5
 
 # Optimized color palette
 FLIGHT_COLORS = [
@@ -98,124 +94,266 @@ FLIGHT_COLORS = [
     ("#00ffff", "#00aaff"),
 ]
 
+# Flights carry an index into FLIGHT_COLORS; the mappers turn it back into colors in the browser
+trail_cmap = linear_cmap('scheme', [trail for trail, _ in FLIGHT_COLORS], -0.5, len(FLIGHT_COLORS) - 0.5)
+glow_cmap = linear_cmap('scheme', [glow for _, glow in FLIGHT_COLORS], -0.5, len(FLIGHT_COLORS) - 0.5)
+
 # Pre-generate city list
 city_list = list(CITIES.values())
 
-# Storage for flights
-flights = []
-
-for _ in range(N_FLIGHTS):
-    # Random route
+def random_route():
     departure = random.choice(city_list)
     arrival = random.choice(city_list)
     while arrival == departure:
         arrival = random.choice(city_list)
-    
-    lon1, lat1 = departure
-    lon2, lat2 = arrival
-    
-    x_arc, y_arc = generate_flight_arc(lon1, lat1, lon2, lat2)
-    
-    # Color scheme
-    trail_color, glow_color = random.choice(FLIGHT_COLORS)
-    
-    # Data sources
-    trail_src = ColumnDataSource(data=dict(x=[], y=[]))
-    fade_src = ColumnDataSource(data=dict(x=[], y=[]))
-    head_src = ColumnDataSource(data=dict(x=[], y=[]))
-    
-    # Optimized rendering - fewer layers
-    # Outer glow
-    p.line('x', 'y', source=trail_src, line_width=5,
-           line_color=glow_color, line_alpha=0.18)
-    
-    # Core trail
-    p.line('x', 'y', source=trail_src, line_width=2,
-           line_color=trail_color, line_alpha=0.85)
-    
-    # Fade tail
-    p.line('x', 'y', source=fade_src, line_width=1.5,
-           line_color=trail_color, line_alpha=0.25)
-    
-    # Airplane head - optimized layers
-    p.scatter('x', 'y', source=head_src, size=18, 
-             color=glow_color, alpha=0.2)
-    
-    p.scatter('x', 'y', source=head_src, size=8, 
-             color=trail_color, alpha=1.0)
-    
-    p.scatter('x', 'y', source=head_src, size=3, 
-             color="white", alpha=1.0)
-    
-    # Store flight data
-    flights.append({
-        "x_arc": x_arc,
-        "y_arc": y_arc,
-        "trail_src": trail_src,
-        "fade_src": fade_src,
-        "head_src": head_src,
-        "i": random.randint(0, len(x_arc) // 4),
-        "speed": random.uniform(2.0, 4.0),  # speed
-        "trail_color": trail_color,
-        "glow_color": glow_color
-    })
-
-# Optimized update function
+    return departure, arrival
+
+# Smooth speed curve: ramps from 0.6 to 1.0 over the first and last 15% (takeoff,
+# landing), cruise at 1.0 in between
+def speed_factor(i):
+    progress = i / ARC_STEPS
+    return np.minimum(0.6 + (np.minimum(progress, 1 - progress) / 0.15) * 0.4, 1.0)
+
+def ticks_to_land(position, speed):
+    """Number of ticks until each flight reaches the end of its arc."""
+    position = np.array(position, dtype=float)
+    ticks = np.zeros(len(position), dtype=int)
+    flying = position < ARC_STEPS
+    while flying.any():
+        position[flying] += speed[flying] * speed_factor(position[flying].astype(int))
+        ticks[flying] += 1
+        flying = position < ARC_STEPS
+    return ticks
+
+# Flight state, one row per flight. Arcs come from the per-process route cache
+# in flight_arcs.py, so sessions and relaunches reuse each city pair's arc
+x_arcs, y_arcs = route_arcs([random_route() for _ in range(N_FLIGHTS)], ARC_STEPS)
+
+position = np.array([random.randint(0, ARC_STEPS // 4) for _ in range(N_FLIGHTS)], dtype=float)
+speed = np.array([random.uniform(2.0, 4.0) for _ in range(N_FLIGHTS)])
+scheme = np.array([random.randrange(len(FLIGHT_COLORS)) for _ in range(N_FLIGHTS)], dtype=np.int32)
+head_x = np.full(N_FLIGHTS, np.nan, dtype=np.float32)
+head_y = np.full(N_FLIGHTS, np.nan, dtype=np.float32)
+
+# One source per layer, shared by all flights. Every tick streams exactly one
+# row per flight (in flight order), so rollover keeps the last trail_length
+# segments of each flight and the browser only receives the new rows.
+def empty_segments():
+    return dict(x0=np.empty(0, dtype=np.float32), y0=np.empty(0, dtype=np.float32),
+                x1=np.empty(0, dtype=np.float32), y1=np.empty(0, dtype=np.float32),
+                scheme=np.empty(0, dtype=np.int32))
+
+trail_src = ColumnDataSource(data=empty_segments())
+fade_src = ColumnDataSource(data=empty_segments())
+head_src = ColumnDataSource(data=dict(x=np.empty(0, dtype=np.float32), y=np.empty(0, dtype=np.float32), scheme=np.empty(0, dtype=np.int32)))
+# Segments still in the trail, oldest first; they move to the fade tail when they age out
+trail_history = deque()
+
+# Optimized rendering - fewer layers
+# Outer glow
+p.segment('x0', 'y0', 'x1', 'y1', source=trail_src, line_width=5,
+          line_color=glow_cmap, line_alpha=0.18)
+
+# Core trail
+p.segment('x0', 'y0', 'x1', 'y1', source=trail_src, line_width=2,
+          line_color=trail_cmap, line_alpha=0.85)
+
+# Fade tail
+p.segment('x0', 'y0', 'x1', 'y1', source=fade_src, line_width=1.5,
+          line_color=trail_cmap, line_alpha=0.25)
+
+# Airplane head - optimized layers
+p.scatter('x', 'y', source=head_src, size=18,
+         color=glow_cmap, alpha=0.2)
+
+p.scatter('x', 'y', source=head_src, size=8,
+         color=trail_cmap, alpha=1.0)
+
+p.scatter('x', 'y', source=head_src, size=3,
+         color="white", alpha=1.0)
+
+def relaunch(flights):
+    """Put the given flights (an index array) on new random routes."""
+    x_arcs[flights], y_arcs[flights] = route_arcs([random_route() for _ in flights], ARC_STEPS)
+    position[flights] = 0
+
+    # 30% chance to change color
+    for k in flights:
+        if random.random() < 0.3:
+            scheme[k] = random.randrange(len(FLIGHT_COLORS))
+
+# Optimized update function (server mode)
 def update():
-    for flight in flights:
-        i = int(flight["i"])
-        x_arc, y_arc = flight["x_arc"], flight["y_arc"]
-        
-        if i < len(x_arc):
-            # Main trail
-            start = max(0, i - trail_length)
-            flight["trail_src"].data = dict(
-                x=x_arc[start:i], 
-                y=y_arc[start:i]
-            )
-            
-            # Fading tail
-            fade_start = max(0, i - trail_length * 2)
-            flight["fade_src"].data = dict(
-                x=x_arc[fade_start:start],
-                y=y_arc[fade_start:start]
-            )
-            
-            # Airplane position
-            flight["head_src"].data = dict(
-                x=[x_arc[i]], 
-                y=[y_arc[i]]
-            )
-            
-            # Smooth speed curve
-            progress = i / len(x_arc)
-            if progress < 0.15:  # Takeoff
-                speed_factor = 0.6 + (progress / 0.15) * 0.4
-            elif progress > 0.85:  # Landing
-                speed_factor = 0.6 + ((1 - progress) / 0.15) * 0.4
-            else:  # Cruise
-                speed_factor = 1.0
-            
-            flight["i"] += flight["speed"] * speed_factor
-        else:
-            # Generate new route
-            departure = random.choice(city_list)
-            arrival = random.choice(city_list)
-            while arrival == departure:
-                arrival = random.choice(city_list)
-            
-            lon1, lat1 = departure
-            lon2, lat2 = arrival
-            
-            flight["x_arc"], flight["y_arc"] = generate_flight_arc(lon1, lat1, lon2, lat2)
-            flight["i"] = 0
-            
-            # 30% chance to change color
-            if random.random() < 0.3:
-                trail_color, glow_color = random.choice(FLIGHT_COLORS)
-                flight["trail_color"] = trail_color
-                flight["glow_color"] = glow_color
-
-# Run at 30fps
-curdoc().add_periodic_callback(update, 33)
+    i = position.astype(int)
+    landed = i >= ARC_STEPS
+    idx = np.minimum(i, ARC_STEPS - 1)
+    rows = np.arange(N_FLIGHTS)
+
+    # Airplane position; NaN (not drawn) on the tick a flight lands.
+    # float32 is still metre-accurate in Web Mercator and halves the stream size
+    x = np.where(landed, np.nan, x_arcs[rows, idx]).astype(np.float32)
+    y = np.where(landed, np.nan, y_arcs[rows, idx]).astype(np.float32)
+
+    # Main trail: the segment flown since the last tick
+    segments = dict(x0=head_x.copy(), y0=head_y.copy(), x1=x, y1=y, scheme=scheme.copy())
+    trail_src.stream(segments, rollover=N_FLIGHTS * trail_length)
+    trail_history.append(segments)
+
+    # Fading tail: the segment that just left the main trail
+    if len(trail_history) > trail_length:
+        fade_src.stream(trail_history.popleft(), rollover=N_FLIGHTS * trail_length)
+
+    head_src.stream(dict(x=x, y=y, scheme=scheme.copy()), rollover=N_FLIGHTS)
+    head_x[:] = x
+    head_y[:] = y
+
+    position[:] += speed * speed_factor(i)
+
+    # Generate new routes for the flights that landed
+    if landed.any():
+        relaunch(np.flatnonzero(landed))
+
+# Browser-side engine (client mode): the same tick as update(), run from
+# requestAnimationFrame on fixed TICK_MS steps. The trail/fade/head sources are
+# preallocated and written in place, so nothing is sent back to the server.
+# Trail row (slot * n_flights + k) holds flight k's segment from tick slot; the
+# segment it overwrites moves to the same row of the fade tail.
+# The tick count follows elapsed wall-clock time, like the server's landing
+# prediction: when a throttled or background tab catches up, each new route
+# starts from the tick its patch arrived, so flights land when the server
+# expects them to instead of being relaunched mid-arc.
+ANIMATE_JS = """
+const N = n_flights
+const seen = new Array(N).fill(-1)
+const position = new Float64Array(N)
+const head_x = new Float64Array(N).fill(NaN)
+const head_y = new Float64Array(N).fill(NaN)
+const launch_tick = new Float64Array(N)
+const origin = performance.now()
+let tick = 0
+
+function ticks_at(now) {
+    return Math.floor((now - origin) / tick_ms)
+}
+
+// Route patches arrive even while rAF is paused; note when, so catch-up
+// steps only switch a flight to its new route from that tick on
+routes.patching.connect((indices) => {
+    const at = ticks_at(performance.now())
+    for (const k of indices) {
+        launch_tick[k] = at
+    }
+})
+
+function step() {
+    const r = routes.data
+    const t = trail.data
+    const f = fade.data
+    const h = head.data
+    const slot = tick % trail_length
+    for (let k = 0; k < N; k++) {
+        // A new route_id means the server relaunched this flight
+        if (r.route_id[k] !== seen[k] && tick >= launch_tick[k]) {
+            seen[k] = r.route_id[k]
+            position[k] = r.start[k]
+            head_x[k] = NaN
+            head_y[k] = NaN
+        }
+        const i = Math.floor(position[k])
+        const flying = i < arc_steps
+        const x = flying ? r.x_arc[k][i] : NaN
+        const y = flying ? r.y_arc[k][i] : NaN
+
+        const row = slot * N + k
+        f.x0[row] = t.x0[row]; f.y0[row] = t.y0[row]
+        f.x1[row] = t.x1[row]; f.y1[row] = t.y1[row]
+        f.scheme[row] = t.scheme[row]
+        t.x0[row] = head_x[k]; t.y0[row] = head_y[k]
+        t.x1[row] = x; t.y1[row] = y
+        t.scheme[row] = r.scheme[k]
+
+        h.x[k] = x; h.y[k] = y; h.scheme[k] = r.scheme[k]
+        head_x[k] = x
+        head_y[k] = y
+
+        // Landed flights wait here until the server sends their next route
+        if (flying) {
+            const progress = i / arc_steps
+            const factor = Math.min(0.6 + (Math.min(progress, 1 - progress) / 0.15) * 0.4, 1.0)
+            position[k] += r.speed[k] * factor
+        }
+    }
+    tick++
+}
+
+function frame(now) {
+    // Run every tick due by now, however long the tab was in the background
+    const target = ticks_at(now)
+    if (tick < target) {
+        while (tick < target) {
+            step()
+        }
+        trail.change.emit()
+        fade.change.emit()
+        head.change.emit()
+    }
+    requestAnimationFrame(frame)
+}
+requestAnimationFrame(frame)
+"""
+
+if ANIMATION_MODE == "server":
+    # Run at 30fps
+    curdoc().add_periodic_callback(update, TICK_MS)
+else:
+    def preallocated(**columns):
+        return {name: np.full(size, fill, dtype=dtype) for name, (size, fill, dtype) in columns.items()}
+
+    n_segments = N_FLIGHTS * trail_length
+    segment_columns = dict(x0=(n_segments, np.nan, np.float32), y0=(n_segments, np.nan, np.float32),
+                           x1=(n_segments, np.nan, np.float32), y1=(n_segments, np.nan, np.float32),
+                           scheme=(n_segments, 0, np.int32))
+    trail_src.data = preallocated(**segment_columns)
+    fade_src.data = preallocated(**segment_columns)
+    head_src.data = preallocated(x=(N_FLIGHTS, np.nan, np.float32), y=(N_FLIGHTS, np.nan, np.float32),
+                                 scheme=(N_FLIGHTS, 0, np.int32))
+
+    route_id = np.zeros(N_FLIGHTS, dtype=np.int32)
+    routes_src = ColumnDataSource(data=dict(
+        x_arc=list(x_arcs.astype(np.float32)),
+        y_arc=list(y_arcs.astype(np.float32)),
+        start=position.copy(),
+        speed=speed,
+        scheme=scheme.copy(),
+        route_id=route_id.copy(),
+    ))
+    land_at = time.monotonic() + ticks_to_land(position, speed) * TICK_MS / 1000 + LANDING_GRACE_S
+
+    def relaunch_landed():
+        now = time.monotonic()
+        landed = np.flatnonzero(land_at <= now)
+        if len(landed) == 0:
+            return
+        relaunch(landed)
+        route_id[landed] += 1
+        land_at[landed] = now + ticks_to_land(position[landed], speed[landed]) * TICK_MS / 1000 + LANDING_GRACE_S
+
+        # One patch for every flight that landed since the last check
+        rows = [int(k) for k in landed]
+        routes_src.patch(dict(
+            x_arc=[(k, x_arcs[k].astype(np.float32)) for k in rows],
+            y_arc=[(k, y_arcs[k].astype(np.float32)) for k in rows],
+            start=[(k, 0.0) for k in rows],
+            scheme=[(k, int(scheme[k])) for k in rows],
+            route_id=[(k, int(route_id[k])) for k in rows],
+        ))
+
+    curdoc().js_on_event('document_ready', CustomJS(
+        args=dict(routes=routes_src, trail=trail_src, fade=fade_src, head=head_src,
+                  n_flights=N_FLIGHTS, arc_steps=ARC_STEPS, trail_length=trail_length, tick_ms=TICK_MS),
+        code=ANIMATE_JS))
+    curdoc().add_periodic_callback(relaunch_landed, RELAUNCH_CHECK_MS)
+    # Only the CustomJS refers to routes_src; make it a root so route patches reach the browser
+    curdoc().add_root(routes_src)
+
 curdoc().add_root(p)
@@ -0,0 +1,65 @@
+"""
+Benchmark: projected coastline overlay for contourf_map, one p.line per
+split segment (the original process_line_string path) vs a single
+NaN-separated float32 line from project_coastlines. Reports renderer count,
+serialized document size and build time.
+
+    python benchmarks/bench_contourf_coastlines.py
+"""
+import json
+import os
+import sys
+import time
+
+import cartopy.crs as ccrs
+import numpy as np
+from bokeh.embed import json_item
+from bokeh.models import ColumnDataSource
+from bokeh.plotting import figure
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from coastlines import coastline_segments, load_coastlines
+from contourf_map import project_coastlines
+
+PROJECTIONS = [ccrs.Robinson(), ccrs.Mollweide(), ccrs.Orthographic(central_longitude=20)]
+RESOLUTION = "110m"
+
+
+def per_segment(p, projection):
+    """The original path: transform each coastline and add one renderer per split segment."""
+    for coords in coastline_segments(RESOLUTION):
+        tt = projection.transform_points(ccrs.PlateCarree(), coords[:, 0], coords[:, 1])
+        x = tt[:, 0]
+        y = tt[:, 1]
+        valid = ~(np.isnan(x) | np.isnan(y) | np.isinf(x) | np.isinf(y))
+        if np.sum(valid) > 1:
+            x_valid = x[valid]
+            y_valid = y[valid]
+            dist = np.sqrt(np.diff(x_valid) ** 2 + np.diff(y_valid) ** 2)
+            threshold = np.nanpercentile(dist, 95) * 3
+            splits = np.where(dist > threshold)[0] + 1
+            for seg in np.split(range(len(x_valid)), splits):
+                if len(seg) > 1:
+                    p.line(x_valid[seg], y_valid[seg], line_color='black', line_width=1.5)
+
+
+def single_line(p, projection):
+    x, y = project_coastlines(projection, *load_coastlines(RESOLUTION))
+    p.line('x', 'y', source=ColumnDataSource(data=dict(x=x, y=y)), line_color='black', line_width=1.5)
+
+
+def measure(build, projection):
+    t0 = time.perf_counter()
+    p = figure(width=1500, height=780)
+    build(p, projection)
+    size = len(json.dumps(json_item(p), separators=(",", ":")))
+    return len(p.renderers), size, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    load_coastlines(RESOLUTION)  # build the .npy cache outside the timings
+    for projection in PROJECTIONS:
+        print(f"{type(projection).__name__} ({RESOLUTION} coastlines)")
+        for name, build in (("p.line per segment", per_segment), ("single NaN-separated line", single_line)):
+            renderers, size, elapsed = measure(build, projection)
+            print(f"  {name:26s}: {renderers:5d} renderers, {size / 1024:8.1f} KiB, {elapsed * 1000:8.1f} ms")
@@ -0,0 +1,78 @@
+"""
+Benchmark: 100k flight arcs between random city pairs, generated one route
+at a time (the original generate_flight_arc loop), in one batched
+generate_flight_arcs call, and through the route_arcs pair cache.
+
+    python benchmarks/bench_flight_arcs.py
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flight_arcs
+from flight_arcs import generate_flight_arcs, route_arcs, wgs84_to_web_mercator
+
+N_ARCS = 100_000
+N_CITIES = 30
+STEPS = 200
+
+
+def generate_flight_arc(lon1, lat1, lon2, lat2, steps=STEPS):
+    """The original per-route generator from animated_flights.py."""
+    t = np.linspace(0, 1, steps)
+    lon_arc = lon1 + (lon2 - lon1) * t
+    lat_arc = lat1 + (lat2 - lat1) * t
+    distance = np.sqrt((lon2 - lon1)**2 + (lat2 - lat1)**2)
+    altitude_factor = min(distance * 0.7, 18)
+    lat_arc += altitude_factor * np.sin(np.pi * t) * (1 - 0.3 * t)
+    return wgs84_to_web_mercator(lon_arc, lat_arc)
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+def loop(routes):
+    x = np.empty((len(routes), STEPS))
+    y = np.empty((len(routes), STEPS))
+    for k, ((lon1, lat1), (lon2, lat2)) in enumerate(routes):
+        x[k], y[k] = generate_flight_arc(lon1, lat1, lon2, lat2)
+    return x, y
+
+
+def batched(routes):
+    (lon1, lat1), (lon2, lat2) = np.array(routes).transpose(1, 2, 0)
+    return generate_flight_arcs(lon1, lat1, lon2, lat2, STEPS)
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    cities = [(rng.uniform(-180, 180), rng.uniform(-60, 70)) for _ in range(N_CITIES)]
+    routes = [tuple(rng.sample(cities, 2)) for _ in range(N_ARCS)]
+
+    reference, t_loop = timed(loop, routes)
+    fast, t_batched = timed(batched, routes)
+    flight_arcs._arc_cache.clear()
+    cold, t_cold = timed(route_arcs, routes, STEPS)
+    warm, t_warm = timed(route_arcs, routes, STEPS)
+    # animated_flights relaunches a handful of flights per callback
+    t0 = time.perf_counter()
+    for start in range(0, N_ARCS, 5):
+        route_arcs(routes[start:start + 5], STEPS)
+    t_small = time.perf_counter() - t0
+
+    for result in (fast, cold, warm):
+        np.testing.assert_allclose(result[0], reference[0], rtol=1e-12)
+        np.testing.assert_allclose(result[1], reference[1], rtol=1e-12)
+    print(f"{N_ARCS:,} arcs x {STEPS} steps, {len(set(routes))} distinct city pairs")
+    print(f"  generate_flight_arc loop   : {t_loop * 1000:8.1f} ms")
+    print(f"  generate_flight_arcs batch : {t_batched * 1000:8.1f} ms")
+    print(f"  route_arcs, cold cache     : {t_cold * 1000:8.1f} ms")
+    print(f"  route_arcs, warm cache     : {t_warm * 1000:8.1f} ms")
+    print(f"  route_arcs, 5 per call     : {t_small * 1000:8.1f} ms")
@@ -0,0 +1,70 @@
+"""
+Benchmark: server CPU and websocket traffic per session of animated_flights.py
+in "server" mode (30 fps Python tick streaming trails) vs "client" mode (the
+browser animates, the server only patches in new routes when flights land).
+
+Each mode is loaded into a detached Document the way ``bokeh serve`` would,
+its periodic callbacks are run on their real schedule for DURATION_S seconds,
+and every resulting change is serialized into a PATCH-DOC message, as the
+server does for each connected session.
+
+    python benchmarks/bench_flight_modes.py
+"""
+import os
+import runpy
+import sys
+import time
+
+from bokeh.document import Document
+from bokeh.io.doc import set_curdoc
+from bokeh.protocol import Protocol
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(REPO, "animated_flights.py")
+DURATION_S = 10.0
+
+# bokeh serve puts the script's directory on sys.path for its sibling modules
+sys.path.insert(0, REPO)
+
+
+def run_session(mode):
+    sys.argv = [SCRIPT, mode]
+    doc = Document()
+    set_curdoc(doc)
+    runpy.run_path(SCRIPT, run_name="bokeh_app")
+
+    protocol = Protocol()
+    sent = []
+
+    def on_change(event):
+        msg = protocol.create("PATCH-DOC", [event])
+        sent.append(len(msg.content_json) + sum(len(memoryview(b.data).cast("B")) for b in msg.buffers))
+
+    doc.callbacks.on_change(on_change)
+
+    callbacks = [(cb.callback, cb.period / 1000) for cb in doc.session_callbacks]
+    start = time.monotonic()
+    due = [start + period for _, period in callbacks]
+    cpu = 0.0
+    calls = 0
+    while True:
+        k = min(range(len(callbacks)), key=due.__getitem__)
+        if due[k] - start > DURATION_S:
+            break
+        time.sleep(max(0.0, due[k] - time.monotonic()))
+        t0 = time.process_time()
+        callbacks[k][0]()
+        cpu += time.process_time() - t0
+        calls += 1
+        due[k] += callbacks[k][1]
+    return cpu, calls, sum(sent), len(sent)
+
+
+if __name__ == "__main__":
+    argv = sys.argv
+    print(f"animated_flights.py, one session, {DURATION_S:.0f} s")
+    for mode in ("server", "client"):
+        cpu, calls, sent_bytes, messages = run_session(mode)
+        print(f"  {mode:6s}: {cpu / DURATION_S * 1000:7.2f} ms CPU per second ({calls / DURATION_S:5.1f} callbacks/s), "
+              f"{sent_bytes / DURATION_S / 1024:7.1f} KiB/s in {messages / DURATION_S:5.1f} messages/s")
+    sys.argv = argv
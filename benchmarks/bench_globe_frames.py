@@ -0,0 +1,112 @@
+"""
+Benchmark: websocket traffic to step a 0.25 degree SurfaceGlobe through a day
+of hourly frames, the old way (every step rebuilds the widget, resending
+lons/lats/values as List(Float) properties) vs values-only float32 updates streamed from Python vs one preloaded uint8
+block that the browser plays back without any further messages.
+
+Every change is serialized into the PATCH-DOC message the server would send
+to each connected session.
+
+    python benchmarks/bench_globe_frames.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from bokeh.core.properties import Float, Int, List
+from bokeh.document import Document
+from bokeh.models import LayoutDOM
+from bokeh.protocol import Protocol
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3d_surfaces"))
+from surface_globe import create_globe
+
+RESOLUTION = 0.25
+N_FRAMES = 24
+# Each rebuild encodes ~3M floats as JSON; a few steps are enough to average
+REBUILD_STEPS = 3
+
+
+class ListGlobe(LayoutDOM):
+    """The data properties as SurfaceGlobe declared them before the binary transport."""
+    lons = List(Float)
+    lats = List(Float)
+    values = List(Float)
+    n_lat = Int()
+    n_lon = Int()
+
+
+def message_bytes(msg):
+    header, metadata, content = msg.header_json, msg.metadata_json, msg.content_json
+    return len(header) + len(metadata) + len(content) + sum(len(buffer.to_bytes()) for buffer in msg.buffers)
+
+
+def run(globe, steps):
+    """
+    Add ``globe`` to a Document, then apply each step; returns the size of the
+    initial document, the PATCH-DOC bytes and message count, and the seconds taken.
+    """
+    doc = Document()
+    doc.add_root(globe)
+    protocol = Protocol()
+    initial = message_bytes(protocol.create("PULL-DOC-REPLY", "bench", doc))
+    sent = []
+
+    def on_change(event):
+        sent.append(message_bytes(protocol.create("PATCH-DOC", [event])))
+
+    doc.callbacks.on_change(on_change)
+    t0 = time.perf_counter()
+    for step in steps:
+        step()
+    return initial, sum(sent), len(sent), time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    lats = np.arange(-90 + RESOLUTION / 2, 90, RESOLUTION)
+    lons = np.arange(-180 + RESOLUTION / 2, 180, RESOLUTION)
+    lon_grid, lat_grid = np.meshgrid(lons, lats)
+    n_lat, n_lon = lat_grid.shape
+    frames = np.stack([
+        20 * np.cos(np.radians(lat_grid)) + 8 * np.cos(np.radians(lon_grid - 180 + 15 * hour)).clip(0)
+        for hour in range(N_FRAMES)
+    ]).astype(np.float32)
+
+    def globe(**kwargs):
+        return create_globe(lon_grid.ravel(), lat_grid.ravel(), kwargs.pop('values', frames[0].ravel()),
+                            n_lat, n_lon, show_coastlines=False, **kwargs)
+
+    # Before: a new widget per frame, lons/lats/values all sent again as lists
+    def list_globe(t):
+        return ListGlobe(lons=lon_grid.ravel().tolist(), lats=lat_grid.ravel().tolist(),
+                         values=frames[t].ravel().tolist(), n_lat=n_lat, n_lon=n_lon)
+
+    current = [list_globe(0)]
+
+    def rebuild(t):
+        doc = current[0].document
+        doc.remove_root(current[0])
+        current[0] = list_globe(t)
+        doc.add_root(current[0])
+
+    rebuild_steps = [lambda t=t: rebuild(t) for t in range(1, REBUILD_STEPS + 1)]
+
+    # Streamed: the frame slider's value comes back and only values change
+    streamed = globe()
+    streamed.n_frames = N_FRAMES
+    stream_steps = [lambda t=t: streamed.update(frame=t, values=frames[t].ravel()) for t in range(1, N_FRAMES)]
+
+    # Preloaded: the whole day up front, as uint8 codes or float32, stepped in the browser
+    preloaded = globe(values=None, frames=frames, quantize=True)
+    preloaded_float = globe(values=None, frames=frames)
+
+    print(f"{n_lat * n_lon:,} grid points, {N_FRAMES} hourly frames")
+    for name, widget, steps in [("rebuild with lists", current[0], rebuild_steps),
+                                ("values-only float32", streamed, stream_steps),
+                                ("preloaded float32", preloaded_float, []),
+                                ("preloaded uint8", preloaded, [])]:
+        initial, total, messages, seconds = run(widget, steps)
+        per_step = (f"{total / messages / 2**20:7.2f} MiB/step  {seconds / messages * 1000:7.1f} ms/step"
+                    if messages else "   0.00 MiB/step  (frames advance in the browser)")
+        print(f"  {name:22}: initial {initial / 2**20:7.2f} MiB  {per_step}")
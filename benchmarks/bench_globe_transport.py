@@ -0,0 +1,93 @@
+"""
+Benchmark: a 0.25 degree global field on a SurfaceGlobe, sent the old way
+(List(Float) properties fed .tolist() output, coastlines with None
+separators) vs as binary float32 ndarray buffers, comparing the encoded size
+and the time to encode (server) and decode (client-side parse stand-in).
+Standalone HTML/notebook output embeds the buffers gzip-compressed and
+base64-encoded instead.
+
+    python benchmarks/bench_globe_transport.py
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from bokeh.core.properties import Any, Float, List
+from bokeh.core.json_encoder import serialize_json
+from bokeh.core.serialization import Serializer
+from bokeh.models import LayoutDOM
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3d_surfaces"))
+from surface_globe import create_globe
+
+RESOLUTION = 0.25
+
+
+class ListGlobe(LayoutDOM):
+    """The data properties as SurfaceGlobe declared them before the binary transport."""
+    lons = List(Float)
+    lats = List(Float)
+    values = List(Float)
+    coast_lons = List(Any)
+    coast_lats = List(Any)
+
+
+def list_globe(lon_grid, lat_grid, values, coast_lons, coast_lats):
+    separator = np.isnan(coast_lons)
+    return ListGlobe(
+        lons=lon_grid.flatten().tolist(),
+        lats=lat_grid.flatten().tolist(),
+        values=values.flatten().tolist(),
+        coast_lons=np.where(separator, None, coast_lons.astype(object)).tolist(),
+        coast_lats=np.where(separator, None, coast_lats.astype(object)).tolist(),
+    )
+
+
+def binary_globe(lon_grid, lat_grid, values, coast_lons, coast_lats):
+    globe = create_globe(lon_grid, lat_grid, values, *values.shape, show_coastlines=False)
+    globe.update(show_coastlines=True, coast_lons=coast_lons.astype(np.float32),
+                 coast_lats=coast_lats.astype(np.float32))
+    return globe
+
+
+def encode(build, deferred, *args):
+    """Build the widget and encode it; returns (content JSON, buffers, seconds)."""
+    t0 = time.perf_counter()
+    encoded = Serializer(deferred=deferred).serialize(build(*args))
+    content = serialize_json(encoded.content)
+    return content, encoded.buffers, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    from coastlines import load_coastlines
+
+    lats = np.arange(-90 + RESOLUTION / 2, 90, RESOLUTION)
+    lons = np.arange(-180 + RESOLUTION / 2, 180, RESOLUTION)
+    lon_grid, lat_grid = np.meshgrid(lons, lats)
+    temperature = 20 * np.cos(np.radians(lat_grid)) + 5 * np.sin(np.radians(2 * lon_grid))
+    coast_lons, coast_lats = load_coastlines('110m')
+    args = (lon_grid, lat_grid, temperature, coast_lons, coast_lats)
+
+    list_json, _, t_list = encode(list_globe, True, *args)
+    content, buffers, t_binary = encode(binary_globe, True, *args)
+    standalone_json, _, t_standalone = encode(binary_globe, False, *args)
+    buffer_bytes = sum(len(buffer.to_bytes()) for buffer in buffers)
+
+    t0 = time.perf_counter()
+    decoded = json.loads(list_json)
+    t_list_decode = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    json.loads(content)
+    arrays = [np.frombuffer(buffer.to_bytes(), dtype=np.float32) for buffer in buffers]
+    t_binary_decode = time.perf_counter() - t0
+
+    print(f"{lat_grid.size:,} grid points + {coast_lons.size:,} coastline vertices")
+    print(f"  List(Float) JSON      : {len(list_json) / 2**20:8.2f} MiB  "
+          f"encode {t_list * 1000:7.1f} ms  decode {t_list_decode * 1000:7.1f} ms")
+    print(f"  float32 binary buffers: {(len(content) + buffer_bytes) / 2**20:8.2f} MiB  "
+          f"encode {t_binary * 1000:7.1f} ms  decode {t_binary_decode * 1000:7.1f} ms  "
+          f"({len(buffers)} buffers, {len(content):,} bytes of JSON)")
+    print(f"  float32 gzip+base64   : {len(standalone_json) / 2**20:8.2f} MiB  "
+          f"encode {t_standalone * 1000:7.1f} ms")
@@ -0,0 +1,72 @@
+"""
+Benchmark: Mollweide grid-cell patches for a 180x360 grid, built with the
+original nested loop (four-corner mollweide_transform per cell) vs
+grid_quads on a once-transformed vertex grid.
+
+    python benchmarks/bench_grid_quads.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grid_patches import grid_quads
+
+N_LAT, N_LON = 180, 360
+
+
+def mollweide_transform(lon, lat):
+    """Same Newton solver as the Mollweide half of custom_map_projection.py."""
+    lon = np.radians(lon)
+    lat = np.radians(lat)
+    theta = lat
+    for i in range(100):
+        theta_new = theta - (2 * theta + np.sin(2 * theta) - np.pi * np.sin(lat)) / (2 + 2 * np.cos(2 * theta))
+        if np.all(np.abs(theta - theta_new) < 1e-10):
+            break
+        theta = theta_new
+    return 2 * np.sqrt(2) / np.pi * lon * np.cos(theta), np.sqrt(2) * np.sin(theta)
+
+
+def build_loop(lon_grid, lat_grid, temperature):
+    xs, ys, temps = [], [], []
+    for i in range(N_LAT - 1):
+        for j in range(N_LON - 1):
+            lons_cell = [lon_grid[i, j], lon_grid[i, j + 1], lon_grid[i + 1, j + 1], lon_grid[i + 1, j]]
+            lats_cell = [lat_grid[i, j], lat_grid[i, j + 1], lat_grid[i + 1, j + 1], lat_grid[i + 1, j]]
+            x, y = mollweide_transform(lons_cell, lats_cell)
+            if np.any(np.abs(np.diff(lons_cell)) > 180):
+                continue
+            if not np.any(np.isnan(x)) and not np.any(np.isnan(y)):
+                xs.append(x.tolist())
+                ys.append(y.tolist())
+                temps.append(temperature[i, j])
+    return xs, ys, temps
+
+
+def build_vectorized(lon_grid, lat_grid, temperature):
+    x, y = mollweide_transform(lon_grid, lat_grid)
+    xs, ys, temps = grid_quads(x, y, temperature, lon=lon_grid)
+    return xs.tolist(), ys.tolist(), temps
+
+
+if __name__ == "__main__":
+    lon_grid, lat_grid = np.meshgrid(np.linspace(-179.5, 179.5, N_LON), np.linspace(-89.5, 89.5, N_LAT))
+    temperature = 20 * np.cos(np.radians(lat_grid)) + 5 * np.sin(np.radians(2 * lon_grid))
+
+    t0 = time.perf_counter()
+    reference = build_loop(lon_grid, lat_grid, temperature)
+    t_loop = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = build_vectorized(lon_grid, lat_grid, temperature)
+    t_fast = time.perf_counter() - t0
+
+    np.testing.assert_allclose(fast[0], reference[0], atol=1e-9)
+    np.testing.assert_allclose(fast[1], reference[1], atol=1e-9)
+    np.testing.assert_array_equal(fast[2], reference[2])
+    print(f"{N_LAT}x{N_LON} Mollweide grid, {len(fast[2])} cells")
+    print(f"  nested loop : {t_loop * 1000:8.1f} ms")
+    print(f"  grid_quads  : {t_fast * 1000:8.1f} ms")
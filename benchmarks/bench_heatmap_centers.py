@@ -0,0 +1,57 @@
+"""
+Benchmark: MercatorHeatmap.create_heatmap_from_centers (vectorized) vs the
+original per-cell Python loop, on global grids at 1°, 0.5° and 0.25°.
+
+    python benchmarks/bench_heatmap_centers.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from MercatorHeatmap import create_heatmap_from_centers
+
+
+def create_heatmap_from_centers_loop(lat_centers, lon_centers, data_2d,
+                                     lat_pixel_size, lon_pixel_size):
+    """The original double loop, kept here as the baseline."""
+    lats = []
+    lons = []
+    values = []
+    for i, lat_center in enumerate(lat_centers):
+        for j, lon_center in enumerate(lon_centers):
+            lat_bottom = lat_center - lat_pixel_size / 2
+            lat_top = lat_center + lat_pixel_size / 2
+            lon_left = lon_center - lon_pixel_size / 2
+            lon_right = lon_center + lon_pixel_size / 2
+            lats.append(lat_center)
+            lons.append(lon_center)
+            values.append(data_2d[i, j])
+    return lats, lons, values, lat_pixel_size, lon_pixel_size
+
+
+def best_of(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+if __name__ == "__main__":
+    for res in (1.0, 0.5, 0.25):
+        lat_centers = np.arange(-90 + res / 2, 90, res)
+        lon_centers = np.arange(-180 + res / 2, 180, res)
+        data_2d = np.random.randn(len(lat_centers), len(lon_centers))
+        args = (lat_centers, lon_centers, data_2d, res, res)
+
+        t_loop, loop = best_of(create_heatmap_from_centers_loop, *args, repeat=1)
+        t_vec, vec = best_of(create_heatmap_from_centers, *args)
+
+        for a, b in zip(loop[:3], vec[:3]):
+            np.testing.assert_allclose(np.asarray(a, dtype=np.float32), b)
+        print(f"{res:5.2f}° ({data_2d.size:>9,} cells): loop {t_loop * 1000:9.1f} ms | "
+              f"vectorized {t_vec * 1000:7.2f} ms | x{t_loop / t_vec:,.0f}")
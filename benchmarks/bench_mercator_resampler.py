@@ -0,0 +1,60 @@
+"""
+Benchmark: per-frame Web Mercator resampling of a 0.1° field, rebuilding the
+inverse projection and RegularGridInterpolator every frame (the original
+plot_heatmap_with_image_and_tiles path) vs a cached MercatorResampler.
+
+    python benchmarks/bench_mercator_resampler.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from MercatorHeatmap import get_mercator_resampler, lat_lon_to_web_mercator, web_mercator_to_lat_lon
+
+RES = 0.1
+N_FRAMES = 24  # one day of hourly fields
+TARGET = (512, 1024)  # (height, width)
+
+
+def resample_full(lat_centers, lon_centers, data_2d, extent, shape):
+    """The original path: inverse-project the target meshgrid and build an interpolator."""
+    x_min, x_max, y_min, y_max = extent
+    interpolator = RegularGridInterpolator((lat_centers, lon_centers), data_2d,
+                                           method='linear', bounds_error=False, fill_value=np.nan)
+    X, Y = np.meshgrid(np.linspace(x_min, x_max, shape[1]), np.linspace(y_min, y_max, shape[0]))
+    LON, LAT = web_mercator_to_lat_lon(X, Y)
+    return interpolator(np.column_stack([LAT.ravel(), LON.ravel()])).reshape(shape)
+
+
+if __name__ == "__main__":
+    lat_centers = np.arange(-90 + RES / 2, 90, RES)
+    lon_centers = np.arange(-180 + RES / 2, 180, RES)
+    LON, LAT = np.meshgrid(lon_centers, lat_centers)
+    base = 20 * np.cos(np.radians(LAT * 2)) + 10 * np.sin(np.radians(LON / 2))
+    frames = [(base + np.sin(h / 4) * 5).astype(np.float32) for h in range(N_FRAMES)]
+
+    x_min, y_min = lat_lon_to_web_mercator(lon_centers[0] - RES / 2, -85.0511)
+    x_max, y_max = lat_lon_to_web_mercator(lon_centers[-1] + RES / 2, 85.0511)
+    extent = (x_min, x_max, y_min, y_max)
+
+    t0 = time.perf_counter()
+    reference = [resample_full(lat_centers, lon_centers, f, extent, TARGET) for f in frames]
+    t_full = (time.perf_counter() - t0) / N_FRAMES
+
+    t0 = time.perf_counter()
+    resampler = get_mercator_resampler(lat_centers, lon_centers, extent, TARGET)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = [get_mercator_resampler(lat_centers, lon_centers, extent, TARGET)(f) for f in frames]
+    t_fast = (time.perf_counter() - t0) / N_FRAMES
+
+    for a, b in zip(reference, fast):
+        np.testing.assert_allclose(b, a, rtol=1e-5, atol=1e-4, equal_nan=True)
+    print(f"{len(lat_centers)}x{len(lon_centers)} grid -> {TARGET[0]}x{TARGET[1]} Web Mercator, {N_FRAMES} frames")
+    print(f"  interpolator per frame : {t_full * 1000:8.1f} ms/frame")
+    print(f"  cached resampler       : {t_fast * 1000:8.1f} ms/frame (one-off build {t_build * 1000:.1f} ms)")
@@ -0,0 +1,72 @@
+"""
+Benchmark: Mollweide forward/inverse projection of 1e6 random points with
+cartopy's ccrs.Mollweide, the original converge-everything Newton loop from
+custom_map_projection.py, and the table-seeded solver in mollweide.py.
+
+    python benchmarks/bench_mollweide.py
+"""
+import os
+import sys
+import time
+
+import cartopy.crs as ccrs
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mollweide import mollweide_inverse, mollweide_transform
+
+N_POINTS = 1_000_000
+RADIUS = 6378137.0  # cartopy's default Mollweide sphere
+POLAR_CAP = 0.01    # degrees; PROJ stops iterating early this close to the poles
+
+
+def newton_loop(lon, lat):
+    """The original solver: Newton from theta = lat until every element converges."""
+    lon = np.radians(lon)
+    lat = np.radians(lat)
+    theta = lat
+    for i in range(100):
+        theta_new = theta - (2 * theta + np.sin(2 * theta) - np.pi * np.sin(lat)) / (2 + 2 * np.cos(2 * theta))
+        if np.all(np.abs(theta - theta_new) < 1e-10):
+            break
+        theta = theta_new
+    return RADIUS * 2 * np.sqrt(2) / np.pi * lon * np.cos(theta), RADIUS * np.sqrt(2) * np.sin(theta)
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-180, 180, N_POINTS)
+    lat = rng.uniform(-90, 90, N_POINTS)
+    mollweide = ccrs.Mollweide()
+    plate = ccrs.PlateCarree()
+
+    reference, t_cartopy = timed(mollweide.transform_points, plate, lon, lat)
+    with np.errstate(all="ignore"):
+        (x_loop, y_loop), t_loop = timed(newton_loop, lon, lat)
+    (x, y), t_fast = timed(mollweide_transform, lon, lat, RADIUS)
+
+    away_from_poles = np.abs(lat) < 90 - POLAR_CAP
+    error = np.hypot(x - reference[:, 0], y - reference[:, 1])
+    loop_error = np.hypot(x_loop - reference[:, 0], y_loop - reference[:, 1])
+
+    print(f"forward, {N_POINTS:,} points")
+    print(f"  cartopy ccrs.Mollweide : {t_cartopy * 1000:8.1f} ms")
+    print(f"  Newton until converged : {t_loop * 1000:8.1f} ms  "
+          f"(max |d| vs cartopy {np.nanmax(loop_error[away_from_poles]):.2e} m)")
+    print(f"  mollweide_transform    : {t_fast * 1000:8.1f} ms  "
+          f"(max |d| vs cartopy {error[away_from_poles].max():.2e} m, "
+          f"{error.max():.2e} m including the {POLAR_CAP} deg polar caps)")
+
+    inverse_reference, t_cartopy_inv = timed(plate.transform_points, mollweide, x, y)
+    (lon_back, lat_back), t_inv = timed(mollweide_inverse, x, y, RADIUS)
+    print(f"inverse, {N_POINTS:,} points")
+    print(f"  cartopy                : {t_cartopy_inv * 1000:8.1f} ms")
+    print(f"  mollweide_inverse      : {t_inv * 1000:8.1f} ms  "
+          f"(max round-trip error {np.abs(lon_back - lon)[away_from_poles].max():.1e} deg lon, "
+          f"{np.abs(lat_back - lat).max():.1e} deg lat)")
@@ -0,0 +1,76 @@
+"""
+Benchmark: a 0.25 degree Mollweide temperature field drawn as grid_quads
+patches vs one projected_image raster, comparing build time and the size
+of the serialized document sent to the browser.
+
+    python benchmarks/bench_projected_raster.py
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from bokeh.embed import json_item
+from bokeh.models import ColumnDataSource, LinearColorMapper
+from bokeh.plotting import figure
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grid_patches import grid_quads
+from mollweide import mollweide_transform
+from projected_raster import get_projected_raster, projected_image
+
+RESOLUTION = 0.25
+IMAGE_SHAPE = (400, 800)
+
+
+def patches_figure(lon_grid, lat_grid, temperature):
+    color_mapper = LinearColorMapper(palette="Viridis256", low=-5, high=25)
+    x, y = mollweide_transform(lon_grid, lat_grid)
+    xs, ys, temps = grid_quads(x, y, temperature, lon=lon_grid)
+    p = figure(width=800, height=400)
+    source = ColumnDataSource(data=dict(xs=xs.tolist(), ys=ys.tolist(), temp=temps))
+    p.patches('xs', 'ys', fill_color={'field': 'temp', 'transform': color_mapper},
+              line_color=None, source=source)
+    return p
+
+
+def image_figure(lats, lons, temperature):
+    color_mapper = LinearColorMapper(palette="Viridis256", low=-5, high=25)
+    p = figure(width=800, height=400)
+    projected_image(p, 'mollweide', lats, lons, temperature, color_mapper, shape=IMAGE_SHAPE)
+    return p
+
+
+def timed_payload(build, *args):
+    t0 = time.perf_counter()
+    payload = json.dumps(json_item(build(*args)))
+    return len(payload), time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    lats = np.arange(-90 + RESOLUTION / 2, 90, RESOLUTION)
+    lons = np.arange(-180 + RESOLUTION / 2, 180, RESOLUTION)
+    lon_grid, lat_grid = np.meshgrid(lons, lats)
+    temperature = 20 * np.cos(np.radians(lat_grid)) + 5 * np.sin(np.radians(2 * lon_grid))
+
+    size_patches, t_patches = timed_payload(patches_figure, lon_grid, lat_grid, temperature)
+    size_image, t_image = timed_payload(image_figure, lats, lons, temperature)
+
+    raster = get_projected_raster('mollweide', lats, lons, IMAGE_SHAPE)
+    t0 = time.perf_counter()
+    raster(temperature)
+    t_frame = time.perf_counter() - t0
+
+    # Only 'mollweide' is a named projection; anything else must not fall back to it
+    try:
+        get_projected_raster('robinson', lats, lons, IMAGE_SHAPE)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("get_projected_raster accepted an unsupported projection name")
+
+    print(f"{len(lats)}x{len(lons)} grid, {IMAGE_SHAPE[0]}x{IMAGE_SHAPE[1]} image")
+    print(f"  patches        : {t_patches * 1000:8.1f} ms, {size_patches / 2**20:7.1f} MiB JSON")
+    print(f"  projected_image: {t_image * 1000:8.1f} ms, {size_image / 2**20:7.1f} MiB JSON")
+    print(f"  next frame (cached inverse map): {t_frame * 1000:.1f} ms")
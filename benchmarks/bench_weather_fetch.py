@@ -0,0 +1,106 @@
+"""
+Benchmark: serial requests.get loop vs WeatherFetcher, and upstream load of
+the shared WeatherCache under many concurrent sessions, against a local stub
+server that stands in for OpenWeatherMap.
+
+    python benchmarks/bench_weather_fetch.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from weather_fetch import RequestsTransport, WeatherCache, WeatherFetcher, parse_reading
+
+N_CITIES = 150
+LATENCY_S = 0.05  # simulated upstream latency per request
+N_SESSIONS = 20
+
+upstream_requests = 0
+upstream_lock = threading.Lock()
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Answers /data/2.5/weather with a fake reading derived from lat/lon."""
+
+    def do_GET(self):
+        global upstream_requests
+        with upstream_lock:
+            upstream_requests += 1
+        query = parse_qs(urlparse(self.path).query)
+        lat = float(query["lat"][0])
+        lon = float(query["lon"][0])
+        time.sleep(LATENCY_S)
+        body = json.dumps({
+            "clouds": {"all": abs(lon) % 100},
+            "main": {"temp": 30 - abs(lat) / 2, "humidity": 50, "pressure": 1013},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubWeatherHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/data/2.5/weather"
+
+
+def serial_fetch(url, cities):
+    """The original WM_app loop: one un-pooled requests.get per city."""
+    readings = []
+    for city in cities:
+        params = {"lat": city["lat"], "lon": city["lon"], "appid": "stub", "units": "metric"}
+        readings.append(parse_reading(requests.get(url, params=params).json()))
+    return readings
+
+
+if __name__ == "__main__":
+    server, url = start_stub_server()
+    cities = [{"lat": -80 + 160 * i / N_CITIES, "lon": -180 + 360 * i / N_CITIES}
+              for i in range(N_CITIES)]
+
+    t0 = time.perf_counter()
+    serial = serial_fetch(url, cities)
+    t_serial = time.perf_counter() - t0
+
+    for workers in (8, 16, 32):
+        fetcher = WeatherFetcher("stub", transport=RequestsTransport(url, pool_size=workers),
+                                 max_workers=workers, timeout=5.0)
+        t0 = time.perf_counter()
+        pooled = fetcher.fetch_all(cities)
+        t_pooled = time.perf_counter() - t0
+        fetcher.close()
+        assert pooled == serial
+        print(f"{N_CITIES} cities @ {LATENCY_S * 1000:.0f} ms: serial {t_serial:6.2f} s | "
+              f"pooled ({workers:2d} workers) {t_pooled:6.2f} s | x{t_serial / t_pooled:.1f}")
+
+    # N sessions refreshing at the same moment, twice within one TTL
+    fetcher = WeatherFetcher("stub", transport=RequestsTransport(url), max_workers=16)
+    cache = WeatherCache(fetcher, ttl=60.0)
+    upstream_requests = 0
+    t0 = time.perf_counter()
+    for _ in range(2):
+        sessions = [threading.Thread(target=cache.get_many, args=(cities,))
+                    for _ in range(N_SESSIONS)]
+        for t in sessions:
+            t.start()
+        for t in sessions:
+            t.join()
+    t_cache = time.perf_counter() - t0
+    fetcher.close()
+    print(f"{N_SESSIONS} sessions x 2 refreshes: {upstream_requests} upstream requests "
+          f"(uncached: {2 * N_SESSIONS * N_CITIES}) in {t_cache:.2f} s | {cache.stats()}")
+
+    server.shutdown()
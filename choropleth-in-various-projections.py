@@ -3,7 +3,8 @@
 import json
 import numpy as np
 from bokeh.plotting import figure, show
-from bokeh.models import GeoJSONDataSource, LinearColorMapper, ColorBar, HoverTool, FixedTicker, HoverTool
+from bokeh.models import ColumnDataSource, CustomJS, LinearColorMapper, ColorBar, HoverTool, FixedTicker, HoverTool, Select
+from bokeh.layouts import column
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 from shapely.geometry import shape, Point, Polygon, MultiPolygon
@@ -12,6 +13,8 @@ import pyproj
 import json
 import requests
 
+from geojson_projection import FlatRings
+
 # Supported Projections!
 
 projection = ccrs.Robinson(); projName = 'Robinson'           # Robinson projection
@@ -24,83 +27,12 @@ projection = ccrs.Robinson(); projName = 'Robinson'           # Robinson project
 # projection = ccrs.Mollweide() ; projName = 'Mollweide'         # Mollweide projection  
 # projection = ccrs.EqualEarth(); projName = 'EqualEarth'           # EqualEarth projection
 
-def filter_valid_coordinates(coords):
-    """
-    Filter out NaN coordinates and ensure valid coordinate pairs
-    """
-    valid_coords = []
-    for coord in coords:
-        if len(coord) >= 2 and not (np.isnan(coord[0]) or np.isnan(coord[1]) or np.isinf(coord[0]) or np.isinf(coord[1])):
-            valid_coords.append([float(coord[0]), float(coord[1])])
-    return valid_coords
-def transform_coordinates_cartopy(lon_lat_coords, target_crs=ccrs.EqualEarth()):
-    """
-    Transform individual coordinate pairs using Cartopy
-    """
-    source_crs = ccrs.PlateCarree()
-    
-    # Convert to numpy arrays for vectorized operations
-    lons = np.array([coord[0] for coord in lon_lat_coords])
-    lats = np.array([coord[1] for coord in lon_lat_coords])
-    
-    # Transform coordinates
-    transformed_coords = target_crs.transform_points(source_crs, lons, lats)
-    
-    # Filter out NaN and infinite values
-    valid_coords = []
-    for x, y in zip(transformed_coords[:, 0], transformed_coords[:, 1]):
-        if not (np.isnan(x) or np.isnan(y) or np.isinf(x) or np.isinf(y)):
-            valid_coords.append([float(x), float(y)])
-    
-    return valid_coords
-
-def transform_geojson_simple(geojson_data, target_crs=ccrs.EqualEarth()):
-    """
-    Simplified GeoJSON transformation using Cartopy
-    """
-    transformed_data = json.loads(json.dumps(geojson_data))
-    features_to_remove = []
-    
-    for i, feature in enumerate(transformed_data['features']):
-        geometry = feature['geometry']
-        feature_has_valid_coords = False
-        
-        if geometry['type'] == 'Polygon':
-            new_coords = []
-            for ring_idx, ring in enumerate(geometry['coordinates']):
-                transformed_ring = transform_coordinates_cartopy(ring, target_crs)
-                if len(transformed_ring) >= 3:  # Need at least 3 points for a valid polygon
-                    new_coords.append(transformed_ring)
-                    feature_has_valid_coords = True
-            
-            if feature_has_valid_coords:
-                geometry['coordinates'] = new_coords
-            else:
-                features_to_remove.append(i)
-                
-        elif geometry['type'] == 'MultiPolygon':
-            new_coords = []
-            for poly_idx, polygon in enumerate(geometry['coordinates']):
-                new_polygon = []
-                for ring_idx, ring in enumerate(polygon):
-                    transformed_ring = transform_coordinates_cartopy(ring, target_crs)
-                    if len(transformed_ring) >= 3:
-                        new_polygon.append(transformed_ring)
-                        feature_has_valid_coords = True
-                
-                if new_polygon:
-                    new_coords.append(new_polygon)
-            
-            if feature_has_valid_coords:
-                geometry['coordinates'] = new_coords
-            else:
-                features_to_remove.append(i)
-    
-    # Remove features with no valid coordinates
-    for i in reversed(features_to_remove):
-        del transformed_data['features'][i]
-    
-    return transformed_data
+# Projections offered by the switcher above the map (the one chosen above is shown first)
+SWITCHABLE_PROJECTIONS = {
+    'EqualEarth': ccrs.EqualEarth(),
+    'Robinson': ccrs.Robinson(),
+    'Mollweide': ccrs.Mollweide(),
+}
 
 
 
@@ -134,8 +66,10 @@ for feature in world_geo['features']:
 world_geo['features'] = [f for f in world_geo['features'] if f['properties']['population'] is not None]
 
 
-
-world_geo_projected = transform_geojson_simple(world_geo, projection)
+# Flatten every ring of every country once; each projection is then a single
+# transform_points call over all vertices
+rings = FlatRings(world_geo)
+projections = {projName: projection, **SWITCHABLE_PROJECTIONS}
 
 # --- 5. BINNING: Discrete Population Bins & Labels (logarithmic) ---
 bin_edges = [0, 5e5, 2e6, 1e7, 3e7, 5e7, 1e8, 3e8, 1e9, 2e9]
@@ -159,7 +93,7 @@ palette = [
 ]
 
 
-for feature in world_geo_projected['features']:
+for feature in world_geo['features']:
     pop = feature['properties']['population']
     # Assign a bin index
     idx = next((i for i in range(len(bin_edges)-1) 
@@ -167,7 +101,17 @@ for feature in world_geo_projected['features']:
     feature['properties']['pop_bin_index'] = idx
 
 # --- 6. Bokeh data source ---
-geosource = GeoJSONDataSource(geojson=json.dumps(world_geo_projected))
+# One row per country, with xs_<projection>/ys_<projection> columns for every
+# projection; switching projection only points the glyph at other columns
+properties = [feature['properties'] for feature in world_geo['features']]
+geo_data = dict(
+    name=[props['name'] for props in properties],
+    population=[props['population'] for props in properties],
+    pop_bin_index=[props['pop_bin_index'] for props in properties],
+)
+for name, crs in projections.items():
+    geo_data[f'xs_{name}'], geo_data[f'ys_{name}'] = rings.to_patches(*rings.project(crs))
+geosource = ColumnDataSource(data=geo_data)
 
 # --- 7. Discrete Palette & ColorMapper ---
 color_mapper = LinearColorMapper(palette=palette, low=0, high=len(bin_labels)-1)
@@ -175,75 +119,46 @@ color_mapper = LinearColorMapper(palette=palette, low=0, high=len(bin_labels)-1)
 # --- 8. Create Earth boundary for visual reference ---
 def create_earth_boundary(projection, n_points=360):
     """
-    Create a boundary outline of the Earth in the given projection
+    Create a boundary outline of the Earth in the given projection,
+    as (xs, ys) arrays of a closed line
     """
     source_crs = ccrs.PlateCarree()
-    boundary_points = []
-    boundary_points = []
     
     # For orthographic and similar projections, create a circle
     if isinstance(projection, (ccrs.Orthographic, ccrs.NearsidePerspective)):
-        # Create a circle boundary
         angles = np.linspace(0, 2*np.pi, n_points)
         radius = 6371000  # Earth radius in meters (approximate)
-        for angle in angles:
-            x = radius * np.cos(angle)
-            y = radius * np.sin(angle)
-            boundary_points.append([x, y])
-        # Close the circle
-        if boundary_points:
-            boundary_points.append(boundary_points[0])
-        return boundary_points
-    # Create a complete boundary by going around the globe edge
-    # Start from -180° longitude and go around
+        xs = radius * np.cos(angles)
+        ys = radius * np.sin(angles)
+        return np.append(xs, xs[0]), np.append(ys, ys[0])
+    # Go around the globe edge, starting from -180° longitude:
+    # top edge (near the north pole, but not exactly 90° to avoid singularities),
+    # right edge (along 180°), bottom edge (near the south pole), left edge (along -180°)
     lons = np.linspace(-180, 180, n_points)
-    
-    # Top edge (near north pole, but not exactly 90° to avoid singularities)
-    for lon in lons:
-        try:
-            transformed = projection.transform_point(lon, 89.9, source_crs)
-            if not (np.isnan(transformed[0]) or np.isnan(transformed[1])):
-                boundary_points.append([transformed[0], transformed[1]])
-        except:
-            continue
-    
-    # Right edge (along 180° longitude)
     lats = np.linspace(89.9, -89.9, n_points//4)
-    for lat in lats:
-        try:
-            transformed = projection.transform_point(179.9, lat, source_crs)
-            if not (np.isnan(transformed[0]) or np.isnan(transformed[1])):
-                boundary_points.append([transformed[0], transformed[1]])
-        except:
-            continue
+    edge_lon = np.concatenate([lons, np.full(len(lats), 179.9), lons[::-1], np.full(len(lats), -179.9)])
+    edge_lat = np.concatenate([np.full(len(lons), 89.9), lats, np.full(len(lons), -89.9), lats[::-1]])
     
-    # Bottom edge (near south pole)
-    for lon in reversed(lons):
-        try:
-            transformed = projection.transform_point(lon, -89.9, source_crs)
-            if not (np.isnan(transformed[0]) or np.isnan(transformed[1])):
-                boundary_points.append([transformed[0], transformed[1]])
-        except:
-            continue
-    
-    # Left edge (along -180° longitude)
-    lats = np.linspace(-89.9, 89.9, n_points//4)
-    for lat in lats:
-        try:
-            transformed = projection.transform_point(-179.9, lat, source_crs)
-            if not (np.isnan(transformed[0]) or np.isnan(transformed[1])):
-                boundary_points.append([transformed[0], transformed[1]])
-        except:
-            continue
+    # One transform for the whole outline, dropping points that do not project
+    points = projection.transform_points(source_crs, edge_lon, edge_lat)
+    valid = np.isfinite(points[:, 0]) & np.isfinite(points[:, 1])
+    xs, ys = points[valid, 0], points[valid, 1]
     
     # Close the polygon
-    if boundary_points:
-        boundary_points.append(boundary_points[0])
-    
-    return boundary_points
-
-# Create Earth boundary
-earth_boundary = create_earth_boundary(projection)
+    if len(xs):
+        xs, ys = np.append(xs, xs[0]), np.append(ys, ys[0])
+    return xs, ys
+
+# Create Earth boundary for every projection
+boundary_data = {}
+for name, crs in projections.items():
+    boundary_data[f'x_{name}'], boundary_data[f'y_{name}'] = create_earth_boundary(crs)
+# Columns of one source must be the same length; pad shorter outlines with NaN
+boundary_length = max(len(values) for values in boundary_data.values())
+boundary_source = ColumnDataSource(data={
+    key: np.append(values, np.full(boundary_length - len(values), np.nan))
+    for key, values in boundary_data.items()
+})
 
 # --- 9. Build Bokeh plot ---
 p = figure(
@@ -265,24 +180,19 @@ p.grid.grid_line_color = None
 p.axis.visible = False
 
 # Add Earth boundary outline first (so it appears behind countries)
-if earth_boundary:
-    xs = [point[0] for point in earth_boundary]
-    ys = [point[1] for point in earth_boundary]
-    p.line(xs, ys, 
-           line_color='black', 
-           line_width=3, 
-           alpha=0.8,
-           legend_label='Earth Boundary')
+boundary_line = p.line(f'x_{projName}', f'y_{projName}', source=boundary_source,
+                       line_color='black', 
+                       line_width=3, 
+                       alpha=0.8,
+                       legend_label='Earth Boundary')
 
 
-if earth_boundary:
-    xs = [point[0] for point in earth_boundary]
-    ys = [point[1] for point in earth_boundary]
-    p.patch(xs, ys, fill_color='#90D5FF', line_color='black', line_width=3, alpha=1.0, level='underlay')
+boundary_patch = p.patch(f'x_{projName}', f'y_{projName}', source=boundary_source,
+                         fill_color='#90D5FF', line_color='black', line_width=3, alpha=1.0, level='underlay')
 
 
 countries = p.patches(
-    'xs', 'ys',
+    f'xs_{projName}', f'ys_{projName}',
     source=geosource,
     fill_color={'field': 'pop_bin_index', 'transform': color_mapper},
     line_color='black',
@@ -342,4 +252,19 @@ p.border_fill_color = '#f5f5f5'
 
 p.legend.visible = False
 
-show(p)
+# --- 13. Projection switcher (client side: swaps the columns the glyphs read) ---
+projection_select = Select(title="Projection", value=projName, options=list(projections), width=200)
+projection_select.js_on_change('value', CustomJS(
+    args=dict(countries=countries.glyph, boundary_glyphs=[boundary_line.glyph, boundary_patch.glyph], title=p.title),
+    code="""
+    const name = cb_obj.value
+    countries.xs = {field: `xs_${name}`}
+    countries.ys = {field: `ys_${name}`}
+    for (const glyph of boundary_glyphs) {
+        glyph.x = {field: `x_${name}`}
+        glyph.y = {field: `y_${name}`}
+    }
+    title.text = title.text.replace(/~ .*$/, `~ ${name}`)
+"""))
+
+show(column(projection_select, p))
@@ -0,0 +1,149 @@
+"""
+climate_data - Chunked NetCDF access with on-disk caches of the reduced fields
+"""
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+
+import numpy as np
+import xarray as xr
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets0", "climate_cache")
+# One year of monthly fields per chunk; reductions stream through the file chunk by chunk
+DEFAULT_CHUNKS = {"time": 12}
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def open_variable(path, variable, chunks=DEFAULT_CHUNKS):
+    """
+    Open ``variable`` from the NetCDF file at ``path`` lazily, backed by dask
+    chunks, so nothing is read until a reduction is computed. Without dask
+    installed the variable is opened the plain (lazily indexed) way.
+    """
+    try:
+        import dask  # noqa: F401
+    except ImportError:
+        chunks = None
+    return xr.open_dataset(path, chunks=chunks)[variable]
+
+
+def _cache_prefix(path, name):
+    # The directory hash keeps same-named inputs elsewhere from sharing (and deleting) caches
+    path = os.path.abspath(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    location = hashlib.sha1(path.encode()).hexdigest()[:8]
+    return os.path.join(CACHE_DIR, f"{stem}.{location}.{name}.")
+
+
+def cache_path(path, name):
+    """
+    Cache file for reduction ``name`` of ``path``, keyed by the file's absolute
+    path, size and mtime, so editing or replacing the input invalidates it.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    digest = hashlib.sha1(f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{name}".encode()).hexdigest()[:16]
+    return _cache_prefix(path, name) + f"{digest}.nc"
+
+
+def _drop_stale(path, name, keep):
+    # Caches of older versions of the same input and reduction
+    pattern = glob.escape(_cache_prefix(path, name)) + "?" * 16 + ".nc"
+    for stale in glob.glob(pattern):
+        if stale != keep:
+            os.unlink(stale)
+
+
+def _save_atomic(path, dataset):
+    # Same temp-file-then-rename pattern as coastlines.py
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".nc.tmp")
+    os.close(fd)
+    try:
+        dataset.to_netcdf(tmp_path)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def cached_reduction(path, name, compute):
+    """
+    Return the small Dataset that ``compute()`` reduces from the file at
+    ``path``, computing it at most once per input version.
+
+    The first call writes the result to ``assets0/climate_cache``; later calls,
+    in any process, read that file instead, and within a process the loaded
+    Dataset is shared, so every ``bokeh serve`` session after the first starts
+    without touching the input. ``name`` must identify the reduction and its
+    parameters.
+    """
+    cache = cache_path(path, name)
+    with _lock:
+        result = _loaded.get(cache)
+        if result is None:
+            if not os.path.exists(cache):
+                _save_atomic(cache, compute().compute())
+                _drop_stale(path, name, cache)
+            result = xr.load_dataset(cache)
+            _loaded[cache] = result
+    return result
+
+
+def _area_mean(field):
+    return field.weighted(np.cos(np.deg2rad(field.lat))).mean(("lat", "lon"))
+
+
+def _region_name(region):
+    if not region:
+        return ""
+    return "-" + "-".join(f"{dim}{sl.start}_{sl.stop}" for dim, sl in sorted(region.items()))
+
+
+def monthly_anomaly_series(path, variable, region=None):
+    """
+    Area-weighted (cos lat) mean of a monthly field and its anomaly against
+    the mean annual cycle.
+
+    ``region`` optionally subsets the grid first, e.g.
+    ``dict(lat=slice(35, 72), lon=slice(-30, 50))``.
+
+    Returns a Dataset with ``anomaly`` (time) and ``climatology`` (month).
+    """
+    def compute():
+        field = open_variable(path, variable)
+        if region:
+            field = field.sel(**region)
+        series = _area_mean(field)
+        climatology = series.groupby("time.month").mean("time")
+        anomaly = series.groupby("time.month") - climatology
+        return xr.Dataset({"anomaly": anomaly.drop_vars("month", errors="ignore"), "climatology": climatology})
+
+    return cached_reduction(path, f"monthly-anomaly-{variable}{_region_name(region)}", compute)
+
+
+def yearly_anomalies(path, variable, year):
+    """
+    Yearly means of a field, reduced to what the anomaly globe shows.
+
+    Returns a Dataset with ``anomaly_map`` (lat, lon): ``year`` minus the
+    all-years mean; ``climatology`` (lat, lon): that all-years mean; and
+    ``anomaly`` (year): the area-weighted mean of each year minus its average
+    over all years. All three come out of a single pass over the file.
+    """
+    def compute():
+        yearly = open_variable(path, variable).groupby("time.year").mean("time")
+        climatology = yearly.mean("year")
+        spatial_avg = _area_mean(yearly)
+        return xr.Dataset({
+            "anomaly_map": yearly.sel(year=slice(year, year)).mean("year") - climatology,
+            "climatology": climatology,
+            "anomaly": spatial_avg - spatial_avg.mean("year"),
+        })
+
+    return cached_reduction(path, f"yearly-anomalies-{variable}-{year}", compute)
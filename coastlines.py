@@ -0,0 +1,109 @@
+"""
+coastlines - Natural Earth coastlines as one memory-mapped, NaN-separated array
+"""
+import os
+import pickle
+import tempfile
+import threading
+
+import numpy as np
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets0")
+RESOLUTIONS = ("110m", "50m", "10m")
+
+# Legacy (lons, lats) list pair of the 110m coastlines, already NaN-separated
+LEGACY_PICKLE = os.path.join(ASSETS_DIR, "coastlines_processed.pkl")
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def cache_path(resolution="110m"):
+    """Path of the ``.npy`` cache for ``resolution`` inside ``assets0``."""
+    return os.path.join(ASSETS_DIR, f"coastlines_{resolution}.npy")
+
+
+def _check_resolution(resolution):
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of {RESOLUTIONS}, got {resolution!r}")
+
+
+def build_coastlines(resolution="110m"):
+    """
+    Read the Natural Earth coastline shapefile through cartopy and return a
+    (2, N) float32 array of lon/lat rows, with a NaN column after every line.
+    """
+    _check_resolution(resolution)
+    import cartopy.feature as cfeature
+    from shapely.geometry import MultiLineString
+
+    feature = cfeature.NaturalEarthFeature('physical', 'coastline', resolution)
+    parts = []
+    separator = np.full((1, 2), np.nan)
+    for geom in feature.geometries():
+        lines = geom.geoms if isinstance(geom, MultiLineString) else [geom]
+        for line in lines:
+            parts.append(np.asarray(line.coords)[:, :2])
+            parts.append(separator)
+    return np.concatenate(parts).T.astype(np.float32)
+
+
+def _load_legacy_pickle():
+    with open(LEGACY_PICKLE, "rb") as f:
+        lons, lats = pickle.load(f)
+    coords = np.array([lons, lats], dtype=np.float32)
+    if not np.isnan(coords[0, -1]):
+        coords = np.concatenate([coords, np.full((2, 1), np.nan, dtype=np.float32)], axis=1)
+    return coords
+
+
+def _save_atomic(path, coords):
+    # Write to a temp file in the same directory, then rename, so a concurrent
+    # reader never maps a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, np.ascontiguousarray(coords))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_coastlines(resolution="110m"):
+    """
+    Return ``(lons, lats)``: read-only float32 views of the coastline vertices,
+    with NaN between lines, ready for ``p.line`` or a vectorized transform.
+
+    The first call per resolution builds ``assets0/coastlines_{resolution}.npy``
+    (110m is seeded from ``coastlines_processed.pkl`` when present, the others
+    come from cartopy); every later call, in any process, memory-maps that file.
+    Within a process the mapped array is shared, so repeated calls are free.
+
+    Example:
+        coast_lons, coast_lats = load_coastlines('50m')
+        p.line(coast_lons, coast_lats, line_color='black')
+    """
+    _check_resolution(resolution)
+    with _lock:
+        coords = _loaded.get(resolution)
+        if coords is None:
+            path = cache_path(resolution)
+            if not os.path.exists(path):
+                if resolution == "110m" and os.path.exists(LEGACY_PICKLE):
+                    built = _load_legacy_pickle()
+                else:
+                    built = build_coastlines(resolution)
+                _save_atomic(path, built)
+            coords = np.load(path, mmap_mode="r")
+            _loaded[resolution] = coords
+    return coords[0], coords[1]
+
+
+def coastline_segments(resolution="110m"):
+    """List of (n, 2) lon/lat arrays, one per coastline, split at the NaN separators."""
+    lons, lats = load_coastlines(resolution)
+    breaks = np.flatnonzero(np.isnan(lons))
+    starts = np.concatenate([[0], breaks[:-1] + 1])
+    return [np.column_stack([lons[s:e], lats[s:e]]) for s, e in zip(starts, breaks) if e > s]
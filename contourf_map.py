@@ -3,6 +3,41 @@
 
 from cartopy import crs as ccrs
 from bokeh.plotting import figure, curdoc, show
+import numpy as np
+
+
+def project_coastlines(projection, lons, lats, max_jump=0.1):
+    """
+    Project NaN-separated coastline lon/lat into ``projection`` in one call.
+
+    Returns x, y as a single NaN-separated line: a break is inserted at every
+    point the projection cannot show (NaN/inf, e.g. the far side of an
+    Orthographic globe) and at every step longer than ``max_jump`` times the
+    projection's x extent, which is where a line wraps across the map edge.
+    Runs of consecutive breaks collapse to one; every coastline point is
+    kept, as float32 (sub-metre to metre precision in projected metres),
+    which Bokeh sends as a binary array.
+    """
+    # transform_points writes into its inputs, so pass float64 copies of the read-only cache
+    tt = projection.transform_points(ccrs.PlateCarree(), np.array(lons, dtype=np.float64),
+                                     np.array(lats, dtype=np.float64))
+    x = tt[:, 0]
+    y = tt[:, 1]
+    invalid = ~(np.isfinite(x) & np.isfinite(y))
+    x[invalid] = np.nan
+    y[invalid] = np.nan
+    
+    x_min, x_max = projection.x_limits
+    step = np.hypot(np.diff(x), np.diff(y))
+    jumps = np.flatnonzero(step > max_jump * (x_max - x_min)) + 1
+    x = np.insert(x, jumps, np.nan)
+    y = np.insert(y, jumps, np.nan)
+
+    # e.g. the whole far side of an Orthographic globe: one break is enough
+    gap = np.isnan(x)
+    keep = np.ones(len(x), dtype=bool)
+    keep[1:] = ~(gap[1:] & gap[:-1])
+    return x[keep].astype(np.float32), y[keep].astype(np.float32)
 
 def contourf_map(da, title=None,
                           levels=10,
@@ -12,6 +47,7 @@ def contourf_map(da, title=None,
                           show_coastlines=True,
                           coastline_color='black',
                           coastline_width=1.5,
+                          coastline_resolution='110m',
                           projection=None,
                           cbar_title=None,
                           sh=1):
@@ -43,6 +79,8 @@ def contourf_map(da, title=None,
         Color of coastline borders.
     coastline_width : float, default=1.5
         Width of coastline borders in pixels.
+    coastline_resolution : {'110m', '50m', '10m'}, default='110m'
+        Natural Earth coastline resolution (cached in assets0, see coastlines.py).
     projection : cartopy.crs projection, optional
         Cartopy projection (e.g., ccrs.Orthographic(), ccrs.Robinson()). 
         If None, uses PlateCarree (equirectangular).
@@ -51,8 +89,8 @@ def contourf_map(da, title=None,
     sh : int, default=1
         Show (sh=1) or not.
     """
-    from shapely.geometry import LineString, MultiLineString
-    import cartopy.feature as cfeature
+    from coastlines import load_coastlines
+    from bokeh.models import ColumnDataSource
     
     from bokeh.models import GlobalInlineStyleSheet
     gstyle = GlobalInlineStyleSheet(css=""" html, body, .bk, .bk-root {background-color: #343838; margin: 0; padding: 0; height: 100%; color: white; font-family: 'Consolas', 'Courier New', monospace; } .bk { color: white; } .bk-input, .bk-btn, .bk-select, .bk-slider-title, .bk-headers, .bk-label, .bk-title, .bk-legend, .bk-axis-label { color: white !important; } .bk-input::placeholder { color: #aaaaaa !important; } """)
@@ -197,71 +235,24 @@ def contourf_map(da, title=None,
     )
     
     
-    # Add coastlines using cartopy
+    # Add coastlines (cached Natural Earth data)
     if show_coastlines:
         try:
-            coastlines = cfeature.NaturalEarthFeature('physical', 'coastline', '110m')
-            
             # Different handling for PlateCarree vs other projections
             if not use_projection or isinstance(projection, ccrs.PlateCarree):
-                # For PlateCarree: Simple approach with NaN separation
-                x_coords = []
-                y_coords = []
-                for geom in coastlines.geometries():
-                    if isinstance(geom, LineString):
-                        coords = np.array(geom.coords)
-                        x_coords.extend(coords[:, 0].tolist() + [np.nan])
-                        y_coords.extend(coords[:, 1].tolist() + [np.nan])
-                    elif isinstance(geom, MultiLineString):
-                        for line in geom.geoms:
-                            coords = np.array(line.coords)
-                            x_coords.extend(coords[:, 0].tolist() + [np.nan])
-                            y_coords.extend(coords[:, 1].tolist() + [np.nan])
+                # For PlateCarree: the cached coordinates are already NaN-separated
+                x_coords, y_coords = load_coastlines(coastline_resolution)
                 
                 p.line(x_coords, y_coords, line_color=coastline_color, 
                       line_width=coastline_width)
             else:
-                # For other projections: Transform and handle carefully
-                def process_line_string(line_string):
-                    if isinstance(line_string, (LineString, MultiLineString)):
-                        if isinstance(line_string, LineString):
-                            lines = [line_string]
-                        else:
-                            lines = list(line_string.geoms)
-                        
-                        for line in lines:
-                            coords = np.array(line.coords)
-                            if len(coords) > 1:
-                                # Transform coastline coordinates
-                                tt = projection.transform_points(ccrs.PlateCarree(), 
-                                                                coords[:, 0], 
-                                                                coords[:, 1])
-                                x = tt[:, 0]
-                                y = tt[:, 1]
-                                
-                                # Filter invalid points and large jumps
-                                valid = ~(np.isnan(x) | np.isnan(y) | np.isinf(x) | np.isinf(y))
-                                if np.sum(valid) > 1:
-                                    x_valid = x[valid]
-                                    y_valid = y[valid]
-                                    
-                                    # Split on large jumps (discontinuities)
-                                    dx = np.diff(x_valid)
-                                    dy = np.diff(y_valid)
-                                    dist = np.sqrt(dx**2 + dy**2)
-                                    threshold = np.nanpercentile(dist, 95) * 3  # Adaptive threshold
-                                    
-                                    splits = np.where(dist > threshold)[0] + 1
-                                    segments = np.split(range(len(x_valid)), splits)
-                                    
-                                    for seg in segments:
-                                        if len(seg) > 1:
-                                            p.line(x_valid[seg], y_valid[seg], 
-                                                 line_color=coastline_color, 
-                                                 line_width=coastline_width)
-                
-                for geom in coastlines.geometries():
-                    process_line_string(geom)
+                # For other projections: one vectorized transform, broken at
+                # invalid points and wrap-around jumps, drawn as a single
+                # renderer from float32 binary arrays
+                x_coords, y_coords = project_coastlines(projection, *load_coastlines(coastline_resolution))
+                coast_source = ColumnDataSource(data=dict(x=x_coords, y=y_coords))
+                p.line('x', 'y', source=coast_source, line_color=coastline_color,
+                       line_width=coastline_width)
                 
         except Exception as e:
             print(f"Warning: Could not load coastlines: {e}")
@@ -26,13 +26,9 @@ lons = np.tile(longitudes, len(latitudes))
 s1 = ColumnDataSource(data={'image': [temperatures], 'latitudes': [lats], 'longitudes': [lons]})
 
 def crd():
-  import cartopy.feature as cf,numpy as np
-  # create the list of coordinates separated by nan to avoid connecting the lines
-  x_coords = []
-  y_coords = []
-  for coord_seq in cf.COASTLINE.geometries():
-      x_coords.extend([k[0] for k in coord_seq.coords] + [np.nan])
-      y_coords.extend([k[1] for k in coord_seq.coords] + [np.nan])
+  from coastlines import load_coastlines
+  # coordinates separated by nan to avoid connecting the lines (memory-mapped cache in assets0)
+  x_coords, y_coords = load_coastlines('110m')
   return x_coords,y_coords,#x_coords2,y_coords2
 x_coords,y_coords=[i for i in crd()]
 
@@ -57,11 +53,12 @@ show(plot)
 # Robinson
 import numpy as np
 import cartopy.crs as ccrs
-import cartopy.feature as cfeature
 from bokeh.plotting import figure, show
 from bokeh.models import ColorBar, LinearColorMapper, BasicTicker, HoverTool, ColumnDataSource
 from bokeh.palettes import Inferno256
-from shapely.geometry import LineString, MultiLineString
+from coastlines import coastline_segments
+from grid_patches import grid_quads
+from projected_raster import projected_image
 
 # Generate example data
 lon = np.linspace(-180, 180, 576)
@@ -92,77 +89,65 @@ color_mapper = LinearColorMapper(palette=Inferno256,
                                  low=temperature.min(), 
                                  high=temperature.max())
 
-# Create patches for grid cells
-xs = []
-ys = []
-temps = []
-for i in range(x.shape[0] - 1):
-    for j in range(x.shape[1] - 1):
-        # Get cell corners
-        cell_x = [x[i,j], x[i,j+1], x[i+1,j+1], x[i+1,j]]
-        cell_y = [y[i,j], y[i,j+1], y[i+1,j+1], y[i+1,j]]
+# 'image': one projected raster (each pixel inverse-projected to lat/lon and
+# sampled from the grid, see projected_raster.py); 'patches': one polygon per grid cell
+render_mode = 'image'
+
+if render_mode == 'image':
+    field_renderer, source = projected_image(p, projection, lat, lon, temperature,
+                                             color_mapper, shape=(400, 800))
+    value_tooltip = '@image{0.1f}°C'
+else:
+    # Create patches for grid cells (corners gathered with array indexing, NaN cells dropped)
+    xs, ys, temps = grid_quads(x, y, temperature)
+
+    # Create ColumnDataSource
+    source = ColumnDataSource(data=dict(
+        xs=xs.tolist(),
+        ys=ys.tolist(),
+        temp=temps
+    ))
+
+    # Add patches
+    field_renderer = p.patches('xs', 'ys',
+                               fill_color={'field': 'temp', 'transform': color_mapper},
+                               line_color=None,
+                               source=source)
+    value_tooltip = '@temp{0.1f}°C'
+
+# Add coastlines (cached Natural Earth data, split at the NaN separators)
+
+def process_line_string(coords):
+    if len(coords) > 1:
+        # Normalize longitudes to -180 to 180 range
+        normalized_coords = coords.copy()
+        normalized_coords[:, 0] = np.mod(normalized_coords[:, 0] + 180, 360) - 180
         
-        # Add valid cells
-        if not np.any(np.isnan(cell_x)) and not np.any(np.isnan(cell_y)):
-            xs.append(cell_x)
-            ys.append(cell_y)
-            temps.append(temperature[i,j])
-
-# Create ColumnDataSource
-source = ColumnDataSource(data=dict(
-    xs=xs,
-    ys=ys,
-    temp=temps
-))
-
-# Add patches
-patches = p.patches('xs', 'ys',
-                    fill_color={'field': 'temp', 'transform': color_mapper},
-                    line_color=None,
-                    source=source)
-
-# Add coastlines
-coastlines = cfeature.NaturalEarthFeature('physical', 'coastline', '110m')
-
-def process_line_string(line_string):
-    if isinstance(line_string, (LineString, MultiLineString)):
-        if isinstance(line_string, LineString):
-            lines = [line_string]
-        else:
-            lines = list(line_string.geoms)
+        # Filter out points that are too close together or would create artifacts
+        valid_indices = np.where(np.abs(np.diff(normalized_coords[:, 0])) < 180)[0]
+        valid_indices = np.concatenate([valid_indices, [valid_indices[-1] + 1]])
         
-        for line in lines:
-            coords = np.array(line.coords)
-            if len(coords) > 1:
-                # Normalize longitudes to -180 to 180 range
-                normalized_coords = coords.copy()
-                normalized_coords[:, 0] = np.mod(normalized_coords[:, 0] + 180, 360) - 180
-                
-                # Filter out points that are too close together or would create artifacts
-                valid_indices = np.where(np.abs(np.diff(normalized_coords[:, 0])) < 180)[0]
-                valid_indices = np.concatenate([valid_indices, [valid_indices[-1] + 1]])
-                
-                if len(valid_indices) > 1:
-                    segment = normalized_coords[valid_indices]
-                    
-                    # Transform coordinates
-                    tt = projection.transform_points(ccrs.PlateCarree(), 
-                                                    segment[:, 0], 
-                                                    segment[:, 1])
-                    x = tt[:, 0]
-                    y = tt[:, 1]
-                    
-                    # Only draw if we have enough points and they're not all NaN
-                    if len(x) > 1 and not np.all(np.isnan(x)):
-                        p.line(x, y, line_color='black', line_width=1, line_alpha=0.5)
-
-for geom in coastlines.geometries():
-    process_line_string(geom)
+        if len(valid_indices) > 1:
+            segment = normalized_coords[valid_indices]
+            
+            # Transform coordinates
+            tt = projection.transform_points(ccrs.PlateCarree(), 
+                                            segment[:, 0], 
+                                            segment[:, 1])
+            x = tt[:, 0]
+            y = tt[:, 1]
+            
+            # Only draw if we have enough points and they're not all NaN
+            if len(x) > 1 and not np.all(np.isnan(x)):
+                p.line(x, y, line_color='black', line_width=1, line_alpha=0.5)
+
+for coords in coastline_segments('110m'):
+    process_line_string(coords)
 
 # Add hover tool
 hover = HoverTool(tooltips=[
-    ('Temperature', '@temp{0.1f}°C'),
-], renderers=[patches])
+    ('Temperature', value_tooltip),
+], renderers=[field_renderer])
 p.add_tools(hover)
 
 # Add color bar
@@ -192,28 +177,10 @@ from bokeh.plotting import figure, show
 from bokeh.io import output_file
 from bokeh.models import ColorBar, LinearColorMapper, BasicTicker, HoverTool, ColumnDataSource
 from bokeh.palettes import Viridis256
-import cartopy.feature as cfeature
-from shapely.geometry import LineString, MultiLineString
-
-def mollweide_transform(lon, lat):
-    """Transform longitude and latitude to Mollweide projection coordinates."""
-    # Convert to radians
-    lon = np.radians(lon)
-    lat = np.radians(lat)
-    
-    # Auxiliary angle theta
-    theta = lat
-    for i in range(100):  # Max iterations
-        theta_new = theta - (2 * theta + np.sin(2 * theta) - np.pi * np.sin(lat)) / (2 + 2 * np.cos(2 * theta))
-        if np.all(np.abs(theta - theta_new) < 1e-10):
-            break
-        theta = theta_new
-    
-    # Calculate x and y coordinates
-    x = 2 * np.sqrt(2) / np.pi * lon * np.cos(theta)
-    y = np.sqrt(2) * np.sin(theta)
-    
-    return x, y
+from coastlines import coastline_segments
+from grid_patches import grid_quads
+from mollweide import mollweide_transform, mollweide_hover_formatters
+from projected_raster import projected_image
 
 # Create sample data with higher resolution
 n_lat, n_lon = 180, 360  # Higher resolution for WebGL
@@ -237,72 +204,56 @@ color_mapper = LinearColorMapper(palette=Viridis256,
                                low=np.min(temperature), 
                                high=np.max(temperature))
 
-# Create patches for each grid cell
-xs = []
-ys = []
-temps = []
-
-for i in range(n_lat - 1):
-    for j in range(n_lon - 1):
-        # Get the four corners of the cell
-        lons_cell = [lon_grid[i,j], lon_grid[i,j+1], lon_grid[i+1,j+1], lon_grid[i+1,j]]
-        lats_cell = [lat_grid[i,j], lat_grid[i,j+1], lat_grid[i+1,j+1], lat_grid[i+1,j]]
-        
-        # Transform to Mollweide projection
-        x, y = mollweide_transform(lons_cell, lats_cell)
-        
-        # Check if the cell crosses the date line
-        if np.any(np.abs(np.diff(lons_cell)) > 180):
-            continue
+# 'image': one projected raster (each pixel inverse-projected to lat/lon and
+# sampled from the grid, see projected_raster.py); 'patches': one polygon per grid cell
+render_mode = 'image'
+
+if render_mode == 'image':
+    field_renderer, source = projected_image(p, 'mollweide', lats, lons, temperature,
+                                             color_mapper, shape=(400, 800))
+    value_tooltip = '@image{0.1f}°C'
+else:
+    # Transform every grid vertex once, then build one patch per grid cell,
+    # dropping cells that cross the date line or have invalid corners
+    x, y = mollweide_transform(lon_grid, lat_grid)
+    xs, ys, temps = grid_quads(x, y, temperature, lon=lon_grid)
+
+    # Create ColumnDataSource
+    source = ColumnDataSource(data=dict(
+        xs=xs.tolist(),
+        ys=ys.tolist(),
+        temp=temps
+    ))
+
+    # Add the patches with WebGL
+    field_renderer = p.patches('xs', 'ys',
+                               fill_color={'field': 'temp', 'transform': color_mapper},
+                               line_color=None,
+                               source=source)
+    value_tooltip = '@temp{0.1f}°C'
+
+# Add coastlines (cached Natural Earth data, split at the NaN separators)
+
+def process_line_string(coords):
+    if len(coords) > 1:
+        # Split at the dateline
+        splits = np.where(np.abs(np.diff(coords[:, 0])) > 180)[0] + 1
+        segments = np.split(coords, splits)
         
-        # Add the cell if it's valid
-        if not np.any(np.isnan(x)) and not np.any(np.isnan(y)):
-            xs.append(x.tolist())
-            ys.append(y.tolist())
-            temps.append(temperature[i,j])
-
-# Create ColumnDataSource
-source = ColumnDataSource(data=dict(
-    xs=xs,
-    ys=ys,
-    temp=temps
-))
-
-# Add the patches with WebGL
-patches = p.patches('xs', 'ys',
-                   fill_color={'field': 'temp', 'transform': color_mapper},
-                   line_color=None,
-                   source=source)
-
-# Add coastlines
-coastlines = cfeature.NaturalEarthFeature('physical', 'coastline', '110m')
-
-def process_line_string(line_string):
-    if isinstance(line_string, (LineString, MultiLineString)):
-        if isinstance(line_string, LineString):
-            lines = [line_string]
-        else:
-            lines = list(line_string.geoms)
-        
-        for line in lines:
-            coords = np.array(line.coords)
-            if len(coords) > 1:
-                # Split at the dateline
-                splits = np.where(np.abs(np.diff(coords[:, 0])) > 180)[0] + 1
-                segments = np.split(coords, splits)
-                
-                for segment in segments:
-                    if len(segment) > 1:
-                        x, y = mollweide_transform(segment[:, 0], segment[:, 1])
-                        p.line(x, y, line_color='black', line_width=1, line_alpha=0.5)
-
-for geom in coastlines.geometries():
-    process_line_string(geom)
+        for segment in segments:
+            if len(segment) > 1:
+                x, y = mollweide_transform(segment[:, 0], segment[:, 1])
+                p.line(x, y, line_color='black', line_width=1, line_alpha=0.5)
 
-# Add hover tool
+for coords in coastline_segments('110m'):
+    process_line_string(coords)
+
+# Add hover tool (lon/lat recovered from the cursor with the inverse projection)
 hover = HoverTool(tooltips=[
-    ('Temperature', '@temp{0.1f}°C'),
-], renderers=[patches])
+    ('Temperature', value_tooltip),
+    ('Lon', '$x{custom}'),
+    ('Lat', '$y{custom}'),
+], formatters=mollweide_hover_formatters(), renderers=[field_renderer])
 p.add_tools(hover)
 
 # Add color bar
@@ -0,0 +1,140 @@
+"""
+geojson_projection - Reproject all rings of a GeoJSON FeatureCollection in one transform
+"""
+import numpy as np
+
+
+class FlatRings:
+    """
+    Every ring of every Polygon/MultiPolygon feature, flattened once into a
+    single (n_vertices, 2) lon/lat array with offset indices, so a projection
+    is one ``transform_points`` call and switching projections never walks
+    the GeoJSON again.
+
+    Attributes:
+        lonlat: (n_vertices, 2) float64 lon/lat, ring after ring
+        ring_offsets: (n_rings + 1,) start of each ring in ``lonlat``
+        ring_polygon: (n_rings,) global polygon index of each ring
+        polygon_feature: (n_polygons,) feature index of each polygon
+        features: the source features (other geometry types pass through untouched)
+        collection: the other top-level members of the FeatureCollection
+
+    Example:
+        rings = FlatRings(world_geo)
+        xy, valid = rings.project(ccrs.Robinson())
+        xs, ys = rings.to_patches(xy, valid)
+    """
+    def __init__(self, geojson):
+        self.collection = {key: value for key, value in geojson.items() if key != 'features'}
+        self.features = geojson['features']
+        rings, ring_polygon, polygon_feature = [], [], []
+        for i, feature in enumerate(self.features):
+            geometry = feature.get('geometry') or {}
+            if geometry.get('type') == 'Polygon':
+                polygons = [geometry['coordinates']]
+            elif geometry.get('type') == 'MultiPolygon':
+                polygons = geometry['coordinates']
+            else:
+                continue
+            for polygon in polygons:
+                for ring in polygon:
+                    # Drop any altitude; GeoJSON positions may carry a third value
+                    rings.append(np.array(ring, dtype=float).reshape(len(ring), -1)[:, :2] if ring else np.empty((0, 2)))
+                    ring_polygon.append(len(polygon_feature))
+                polygon_feature.append(i)
+
+        self.lonlat = np.concatenate(rings) if rings else np.empty((0, 2))
+        self.ring_offsets = np.concatenate([[0], np.cumsum([len(ring) for ring in rings], dtype=int)])
+        self.ring_polygon = np.array(ring_polygon, dtype=int)
+        self.polygon_feature = np.array(polygon_feature, dtype=int)
+
+    def project(self, target_crs, source_crs=None):
+        """
+        Project every vertex with one ``target_crs.transform_points`` call.
+        Returns (xy, valid): (n_vertices, 2) coordinates and the mask of
+        vertices whose x and y are both finite.
+        """
+        if source_crs is None:
+            import cartopy.crs as ccrs
+            source_crs = ccrs.PlateCarree()
+        # transform_points writes into its inputs, so hand it copies
+        lon = self.lonlat[:, 0].copy()
+        lat = self.lonlat[:, 1].copy()
+        xy = target_crs.transform_points(source_crs, lon, lat)[:, :2]
+        valid = np.isfinite(xy).all(axis=1)
+        return xy, valid
+
+    def _kept_rings(self, valid, min_points):
+        """Ring offsets into the packed valid vertices, and the rings with >= min_points of them."""
+        counted = np.concatenate([[0], np.cumsum(valid)])
+        counts = counted[self.ring_offsets[1:]] - counted[self.ring_offsets[:-1]]
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        return offsets, np.flatnonzero(counts >= min_points)
+
+    def to_geojson(self, xy, valid, min_points=3):
+        """
+        Rebuild a FeatureCollection from projected vertices: invalid vertices
+        are dropped, rings left with fewer than ``min_points`` vertices are
+        dropped, then empty polygons, then features with no ring left.
+        Properties are copied, so the result can be edited freely.
+        """
+        points = xy[valid]
+        offsets, kept = self._kept_rings(valid, min_points)
+        polygons = {}
+        for r in kept:
+            polygons.setdefault(self.ring_polygon[r], []).append(points[offsets[r]:offsets[r + 1]].tolist())
+        feature_polygons = {}
+        for polygon, rings in polygons.items():
+            feature_polygons.setdefault(self.polygon_feature[polygon], []).append(rings)
+
+        features = []
+        polygonal = set(self.polygon_feature.tolist())
+        for i, feature in enumerate(self.features):
+            if i not in polygonal:
+                features.append(dict(feature, properties=dict(feature.get('properties') or {})))
+                continue
+            kept_polygons = feature_polygons.get(i)
+            if kept_polygons is None:
+                continue
+            geometry_type = feature['geometry']['type']
+            coordinates = kept_polygons[0] if geometry_type == 'Polygon' else kept_polygons
+            features.append(dict(feature, properties=dict(feature.get('properties') or {}),
+                                 geometry={'type': geometry_type, 'coordinates': coordinates}))
+        return dict(self.collection, features=features)
+
+    def to_patches(self, xy, valid, min_points=3):
+        """
+        ``patches`` columns, one row per source feature: the outer ring of
+        each polygon, polygons separated by NaN, the way GeoJSONDataSource
+        draws (Multi)Polygons. Rows stay aligned with ``features`` whatever
+        the projection, so several projections can share one source; a
+        feature with nothing left gets empty arrays.
+        """
+        points = xy[valid]
+        offsets, kept = self._kept_rings(valid, min_points)
+        # The first kept ring of a polygon is its outer ring
+        kept_polygon = self.ring_polygon[kept]
+        first = np.ones(len(kept), dtype=bool)
+        first[1:] = kept_polygon[1:] != kept_polygon[:-1]
+        outer = kept[first]
+
+        parts = [[] for _ in self.features]
+        separator = np.full((1, 2), np.nan)
+        for r in outer:
+            feature_parts = parts[self.polygon_feature[self.ring_polygon[r]]]
+            if feature_parts:
+                feature_parts.append(separator)
+            feature_parts.append(points[offsets[r]:offsets[r + 1]])
+
+        xs, ys = [], []
+        for feature_parts in parts:
+            ring_xy = np.concatenate(feature_parts) if feature_parts else np.empty((0, 2))
+            xs.append(ring_xy[:, 0])
+            ys.append(ring_xy[:, 1])
+        return xs, ys
+
+
+def reproject_geojson(geojson, target_crs, min_points=3):
+    """One-shot GeoJSON reprojection: ``FlatRings`` + ``project`` + ``to_geojson``."""
+    rings = FlatRings(geojson)
+    return rings.to_geojson(*rings.project(target_crs), min_points=min_points)
@@ -0,0 +1,48 @@
+"""
+grid_patches - Vectorized grid-cell polygons for Bokeh ``patches``
+"""
+import numpy as np
+
+
+def grid_quads(x, y, values, lon=None, max_lon_step=180):
+    """
+    Build one quad per grid cell from projected grid-corner coordinates.
+
+    Every vertex is projected once by the caller (``x``, ``y`` are the
+    (n_lat, n_lon) projected meshgrid); the four corners of each cell are
+    then gathered with array slicing, in the same order the old nested loop
+    used: (i, j), (i, j+1), (i+1, j+1), (i+1, j). Cell (i, j) takes the
+    value ``values[i, j]``.
+
+    Cells with any NaN/inf corner are dropped, and, when ``lon`` (the
+    unprojected longitude grid) is given, so are cells whose corners jump by
+    more than ``max_lon_step`` degrees, i.e. cells crossing the dateline.
+
+    Args:
+        x, y: (n_lat, n_lon) projected corner coordinates
+        values: (n_lat, n_lon) data array
+        lon: Optional (n_lat, n_lon) longitudes in degrees, for the dateline check
+        max_lon_step: Largest longitude step allowed between neighbouring corners
+
+    Returns:
+        xs, ys: (n_cells, 4) arrays of quad corners (``xs.tolist()`` feeds ``patches``)
+        cell_values: (n_cells,) values of the kept cells
+
+    Example:
+        x, y = mollweide_transform(lon_grid, lat_grid)
+        xs, ys, temps = grid_quads(x, y, temperature, lon=lon_grid)
+        source = ColumnDataSource(data=dict(xs=xs.tolist(), ys=ys.tolist(), temp=temps))
+    """
+    def corners(grid):
+        grid = np.asarray(grid)
+        return np.stack([grid[:-1, :-1], grid[:-1, 1:], grid[1:, 1:], grid[1:, :-1]],
+                        axis=-1).reshape(-1, 4)
+
+    xs = corners(x)
+    ys = corners(y)
+    cell_values = np.asarray(values)[:-1, :-1].ravel()
+
+    keep = np.isfinite(xs).all(axis=1) & np.isfinite(ys).all(axis=1)
+    if lon is not None:
+        keep &= (np.abs(np.diff(corners(lon), axis=1)) <= max_lon_step).all(axis=1)
+    return xs[keep], ys[keep], cell_values[keep]
@@ -0,0 +1,130 @@
+"""
+mollweide - Fixed-cost Mollweide forward/inverse projection and lon/lat hover readout
+"""
+import numpy as np
+from bokeh.models import CustomJSHover
+
+# Seed table: e = pi - 2*|theta| sampled on a uniform grid in cbrt(c), where
+# c = pi * (1 - sin|lat|). e is nearly linear in cbrt(c) (e ~ cbrt(6 c) at the
+# poles), so linear interpolation alone is good to ~6e-7 rad.
+TABLE_SIZE = 1024
+# Newton steps after the table seed; 1 brings |theta error| below 1e-11 rad
+ITERATIONS = 1
+
+
+def _e_minus_sin(e):
+    """e - sin(e), with a series below 0.5 to avoid the cancellation near e = 0."""
+    result = e - np.sin(e)
+    small = e < 0.5
+    es = e[small]
+    e2 = es * es
+    result[small] = es * e2 / 6 * (1 - e2 / 20 * (1 - e2 / 42 * (1 - e2 / 72 * (1 - e2 / 110))))
+    return result
+
+
+def _newton(e, c, iterations):
+    """Newton steps for e - sin(e) = c (convex and increasing on [0, pi])."""
+    for _ in range(iterations):
+        slope = 1 - np.cos(e)
+        slope[slope == 0] = 1   # e == 0 is already the exact pole solution
+        e = e - (_e_minus_sin(e) - c) / slope
+    return e
+
+
+def _build_table(size):
+    t = np.linspace(0, np.cbrt(np.pi), size)
+    # The cube-root seed is exact to leading order at the poles; 6 steps reach machine precision
+    return t, _newton(np.cbrt(6 * t ** 3), t ** 3, 6)
+
+
+_TABLE_T, _TABLE_E = _build_table(TABLE_SIZE)
+
+
+def auxiliary_angle(lat, iterations=ITERATIONS):
+    """
+    Solve 2*theta + sin(2*theta) = pi*sin(lat) for theta (radians).
+
+    The equation is rewritten for e = pi - 2*|theta| as
+    e - sin(e) = pi * (1 - sin|lat|), seeded from a precomputed table and
+    refined with a fixed number of Newton steps, so every element costs the
+    same no matter how close to a pole it is. Error bound: ~6e-7 rad with
+    ``iterations=0``, below 1e-11 rad with the default 1 (the residual comes
+    from rounding of lat itself within ~1e-7 deg of a pole), i.e. well under
+    a millimetre on the Earth. NaN stays NaN.
+    """
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    # pi * (1 - sin|lat|), written without the cancellation near the poles
+    c = 2 * np.pi * np.sin((np.pi / 2 - np.abs(lat)) / 2) ** 2
+    e = np.interp(np.cbrt(c), _TABLE_T, _TABLE_E)
+    e = _newton(np.atleast_1d(e), np.atleast_1d(c), iterations).reshape(np.shape(c))
+    return np.copysign((np.pi - e) / 2, lat)
+
+
+def _wrap_longitude(dlon):
+    # Wrap only what is outside [-180, 180], so the +180 grid edge stays at +180
+    return np.where(np.abs(dlon) > 180, (dlon + 180) % 360 - 180, dlon)
+
+
+def mollweide_transform(lon, lat, radius=1.0, central_longitude=0.0, iterations=ITERATIONS):
+    """
+    Transform longitude and latitude (degrees) to Mollweide x, y.
+
+    ``radius=1`` gives the unit map (|x| <= 2*sqrt(2), |y| <= sqrt(2));
+    ``radius=6378137`` matches cartopy's ``ccrs.Mollweide()``.
+    See ``auxiliary_angle`` for the accuracy bound.
+    """
+    theta = auxiliary_angle(lat, iterations)
+    lam = np.radians(_wrap_longitude(np.asarray(lon, dtype=np.float64) - central_longitude))
+    x = radius * 2 * np.sqrt(2) / np.pi * lam * np.cos(theta)
+    y = radius * np.sqrt(2) * np.sin(theta)
+    return x, y
+
+
+def mollweide_inverse(x, y, radius=1.0, central_longitude=0.0):
+    """
+    Closed-form inverse: Mollweide x, y back to longitude, latitude (degrees).
+    Points outside the map ellipse come back as NaN.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    s = np.asarray(y, dtype=np.float64) / (radius * np.sqrt(2))
+    inside = np.abs(s) <= 1
+    theta = np.arcsin(np.where(inside, s, np.nan))
+    lat = np.degrees(np.arcsin(np.clip((2 * theta + np.sin(2 * theta)) / np.pi, -1, 1)))
+    cos_theta = np.cos(theta)
+    lam = np.where(cos_theta > 0, np.pi * x / (2 * np.sqrt(2) * radius * np.where(cos_theta > 0, cos_theta, 1)), 0.0)
+    outside = ~inside | (np.abs(lam) > np.pi)
+    lon = _wrap_longitude(np.degrees(lam) + central_longitude)
+    return np.where(outside, np.nan, lon), np.where(outside, np.nan, lat)
+
+
+_INVERSE_JS = """
+const s = special_vars.y / (radius * Math.SQRT2)
+if (Math.abs(s) > 1) return "-"
+const theta = Math.asin(s)
+const c = Math.cos(theta)
+const lam = c > 0 ? Math.PI * special_vars.x / (2 * Math.SQRT2 * radius * c) : 0
+if (Math.abs(lam) > Math.PI) return "-"
+if (component == "lat") {
+    const lat = Math.asin(Math.max(-1, Math.min(1, (2 * theta + Math.sin(2 * theta)) / Math.PI)))
+    return (lat * 180 / Math.PI).toFixed(precision) + "°"
+}
+let lon = lam * 180 / Math.PI + central_longitude
+if (Math.abs(lon) > 180) lon = ((lon + 180) % 360 + 360) % 360 - 180
+return lon.toFixed(precision) + "°"
+"""
+
+
+def mollweide_hover_formatters(radius=1.0, central_longitude=0.0, precision=2):
+    """
+    CustomJSHover formatters that turn the cursor position back into lon/lat
+    in the browser, using the same inverse as ``mollweide_inverse``.
+
+    Example:
+        hover = HoverTool(tooltips=[('lon', '$x{custom}'), ('lat', '$y{custom}')],
+                          formatters=mollweide_hover_formatters())
+    """
+    args = dict(radius=radius, central_longitude=central_longitude, precision=precision)
+    return {
+        '$x': CustomJSHover(args=dict(args, component='lon'), code=_INVERSE_JS),
+        '$y': CustomJSHover(args=dict(args, component='lat'), code=_INVERSE_JS),
+    }
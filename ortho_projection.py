@@ -0,0 +1,79 @@
+"""
+ortho_projection - Vectorized orthographic (globe) projection with back-face culling
+"""
+import numpy as np
+
+# Same sphere as cartopy's default ccrs.Orthographic(), so x/y are drop-in compatible
+EARTH_RADIUS = 6378137.0
+
+
+def lonlat_to_xyz(lon, lat):
+    """Unit-sphere (3, N) float32 vectors for flattened lon/lat in degrees (NaN stays NaN)."""
+    lon = np.radians(np.ravel(lon).astype(np.float64))
+    lat = np.radians(np.ravel(lat).astype(np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)]).astype(np.float32)
+
+
+def rotation_matrix(center_lon, center_lat):
+    """
+    3x3 matrix whose rows are the east, north and view (outward) unit vectors
+    at (center_lon, center_lat). Applied to unit-sphere xyz it gives the
+    orthographic x, y and a depth that is positive on the visible hemisphere.
+    """
+    lon0 = np.radians(center_lon)
+    lat0 = np.radians(center_lat)
+    return np.array([
+        [-np.sin(lon0), np.cos(lon0), 0.0],
+        [-np.sin(lat0) * np.cos(lon0), -np.sin(lat0) * np.sin(lon0), np.cos(lat0)],
+        [np.cos(lat0) * np.cos(lon0), np.cos(lat0) * np.sin(lon0), np.sin(lat0)],
+    ], dtype=np.float32)
+
+
+def visible_mask(lon, lat, center_lon, center_lat):
+    """True where (lon, lat) lies on the hemisphere facing (center_lon, center_lat)."""
+    depth = rotation_matrix(center_lon, center_lat)[2] @ lonlat_to_xyz(lon, lat)
+    return (depth > 0).reshape(np.shape(lon))
+
+
+class OrthographicProjector:
+    """
+    Orthographic projection of a fixed set of points for any view center.
+
+    The unit-sphere xyz of the grid (and, optionally, of NaN-separated
+    coastlines) is computed once; each view is then a single 3x3 rotation
+    matmul plus back-face culling, instead of a cartopy transform_points call
+    per frame. Points on the far hemisphere come back as NaN, so Bokeh skips
+    them (scatter) or breaks the line there (coastlines).
+
+    Example:
+        projector = OrthographicProjector(LON, LAT, coast_lons, coast_lats)
+        x, y = projector.project_grid(center_lon=20, center_lat=0)
+        coast_x, coast_y = projector.project_coastlines(20, 0)
+    """
+
+    def __init__(self, lon, lat, coast_lons=None, coast_lats=None, radius=EARTH_RADIUS):
+        self.radius = radius
+        self.grid_xyz = lonlat_to_xyz(lon, lat)
+        self.coast_xyz = None
+        if coast_lons is not None:
+            self.coast_xyz = lonlat_to_xyz(coast_lons, coast_lats)
+
+    def _project(self, xyz, center_lon, center_lat):
+        projected = rotation_matrix(center_lon, center_lat) @ xyz
+        x = projected[0] * self.radius
+        y = projected[1] * self.radius
+        hidden = projected[2] < 0
+        x[hidden] = np.nan
+        y[hidden] = np.nan
+        return x, y
+
+    def project_grid(self, center_lon, center_lat):
+        """Flattened float32 x, y of the grid; NaN on the far side."""
+        return self._project(self.grid_xyz, center_lon, center_lat)
+
+    def project_coastlines(self, center_lon, center_lat):
+        """Float32 coastline x, y with NaN separators and NaN on the far side."""
+        if self.coast_xyz is None:
+            raise ValueError("OrthographicProjector was created without coastlines")
+        return self._project(self.coast_xyz, center_lon, center_lat)
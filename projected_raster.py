@@ -0,0 +1,173 @@
+"""
+projected_raster - Gridded lat/lon fields as one projected image instead of per-cell patches
+"""
+from collections import OrderedDict
+
+import numpy as np
+from bokeh.models import ColumnDataSource
+
+from mollweide import mollweide_inverse
+
+_inverse_cache = OrderedDict()
+_raster_cache = OrderedDict()
+
+
+def _is_mollweide(projection):
+    """True for ``'mollweide'``, False for a cartopy CRS; any other string is an error."""
+    if not isinstance(projection, str):
+        return False
+    if projection != 'mollweide':
+        raise ValueError(f"unsupported projection {projection!r}; pass 'mollweide' or a cartopy CRS")
+    return True
+
+
+def _projection_key(projection):
+    if _is_mollweide(projection):
+        return projection
+    # cartopy CRS: the PROJ definition identifies it
+    return getattr(projection, "proj4_init", None) or repr(projection)
+
+
+def _lru_get(cache, key, build, max_cached):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache[key] = value
+        if len(cache) > max_cached:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+
+def projection_extent(projection):
+    """(x_min, x_max, y_min, y_max) of the whole map for ``projection``."""
+    if _is_mollweide(projection):
+        return (-2 * np.sqrt(2), 2 * np.sqrt(2), -np.sqrt(2), np.sqrt(2))
+    x_min, x_max = projection.x_limits
+    y_min, y_max = projection.y_limits
+    return (x_min, x_max, y_min, y_max)
+
+
+def inverse_map(projection, extent, shape, max_cached=16):
+    """
+    Longitude/latitude (degrees) of every pixel centre of a (height, width)
+    raster covering ``extent`` in ``projection`` coordinates; NaN where the
+    pixel is off the map. Cached per (projection, extent, shape).
+
+    ``projection`` is ``'mollweide'`` (unit sphere, see mollweide.py) or any
+    cartopy CRS, which is inverted with ``PlateCarree().transform_points``.
+    """
+    key = (_projection_key(projection), tuple(float(v) for v in extent), tuple(shape))
+
+    def build():
+        x_min, x_max, y_min, y_max = extent
+        height, width = shape
+        # Pixel centres, so the image lines up with x/y/dw/dh = extent
+        x = x_min + (np.arange(width) + 0.5) * (x_max - x_min) / width
+        y = y_min + (np.arange(height) + 0.5) * (y_max - y_min) / height
+        X, Y = np.meshgrid(x, y)
+        if _is_mollweide(projection):
+            lon, lat = mollweide_inverse(X, Y)
+        else:
+            import cartopy.crs as ccrs
+            lonlat = ccrs.PlateCarree().transform_points(projection, X, Y)
+            lon, lat = lonlat[..., 0], lonlat[..., 1]
+            off_map = ~(np.isfinite(lon) & np.isfinite(lat))
+            lon[off_map] = np.nan
+            lat[off_map] = np.nan
+        return lon, lat
+
+    return _lru_get(_inverse_cache, key, build, max_cached)
+
+
+class ProjectedRaster:
+    """
+    Bilinear sampling of a rectilinear lat/lon grid at per-pixel lon/lat.
+
+    Indices and weights are computed once from the inverse map; sampling a
+    new data slice (the next time step, say) is four gathers and multiplies.
+    A grid that spans the globe in longitude is treated as periodic, so the
+    seam between the last and first column is filled too. Pixels off the map
+    or outside the grid's latitude range are NaN, which ``image`` draws
+    with the color mapper's ``nan_color``.
+
+    Parameters:
+    -----------
+    lat_centers, lon_centers : 1D increasing arrays of the source grid
+    lon, lat : (height, width) pixel longitudes/latitudes from ``inverse_map``
+    """
+    def __init__(self, lat_centers, lon_centers, lon, lat):
+        lat_centers = np.asarray(lat_centers, dtype=float)
+        lon_centers = np.asarray(lon_centers, dtype=float)
+        self.shape = np.shape(lon)
+
+        self.rows, self.row_weights, row_valid = self._axis(lat_centers, lat)
+
+        step = lon_centers[1] - lon_centers[0]
+        periodic = lon_centers[-1] - lon_centers[0] + step >= 360 - 1e-6
+        if periodic:
+            # Shift pixel longitudes into [lon0, lon0 + 360) and append the wrapped first column
+            lon = lon_centers[0] + np.mod(lon - lon_centers[0], 360)
+            lon_centers = np.append(lon_centers, lon_centers[0] + 360)
+        self.cols, self.col_weights, col_valid = self._axis(lon_centers, lon)
+        self.next_cols = self.cols + 1
+        if periodic:
+            self.next_cols %= len(lon_centers) - 1
+        self.valid = row_valid & col_valid
+
+    @staticmethod
+    def _axis(centers, target):
+        idx = np.clip(np.searchsorted(centers, target, side='right') - 1, 0, len(centers) - 2)
+        with np.errstate(invalid='ignore'):
+            weight = (target - centers[idx]) / (centers[idx + 1] - centers[idx])
+            valid = (target >= centers[0]) & (target <= centers[-1])
+        return idx, np.nan_to_num(weight).astype(np.float32), valid
+
+    def __call__(self, data_2d):
+        """Sample one (n_lat, n_lon) slice; returns a float32 (height, width) image."""
+        data_2d = np.asarray(data_2d, dtype=np.float32)
+        wy = self.row_weights
+        wx = self.col_weights
+        top = (1 - wx) * data_2d[self.rows, self.cols] + wx * data_2d[self.rows, self.next_cols]
+        bottom = (1 - wx) * data_2d[self.rows + 1, self.cols] + wx * data_2d[self.rows + 1, self.next_cols]
+        image = (1 - wy) * top + wy * bottom
+        image[~self.valid] = np.nan
+        return image
+
+
+def get_projected_raster(projection, lat_centers, lon_centers, shape, extent=None, max_cached=16):
+    """
+    Return a cached ProjectedRaster for (projection, source grid, extent, shape).
+
+    ``shape`` is the (height, width) of the output image; ``extent`` defaults
+    to the whole map (``projection_extent``).
+    """
+    extent = projection_extent(projection) if extent is None else extent
+    key = (_projection_key(projection),
+           np.asarray(lat_centers, dtype=float).tobytes(),
+           np.asarray(lon_centers, dtype=float).tobytes(),
+           tuple(float(v) for v in extent), tuple(shape))
+
+    def build():
+        lon, lat = inverse_map(projection, extent, shape)
+        return ProjectedRaster(lat_centers, lon_centers, lon, lat)
+
+    return _lru_get(_raster_cache, key, build, max_cached)
+
+
+def projected_image(p, projection, lat_centers, lon_centers, data_2d, color_mapper,
+                    shape=(400, 800), extent=None, **kwargs):
+    """
+    Draw ``data_2d`` on figure ``p`` as a single ``image`` glyph in ``projection``
+    coordinates. Returns (renderer, source); update later frames with
+    ``source.data['image'] = [get_projected_raster(...)(next_slice)]``.
+    """
+    extent = projection_extent(projection) if extent is None else extent
+    raster = get_projected_raster(projection, lat_centers, lon_centers, shape, extent)
+    x_min, x_max, y_min, y_max = extent
+    source = ColumnDataSource(data=dict(image=[raster(data_2d)], x=[x_min], y=[y_min],
+                                        dw=[x_max - x_min], dh=[y_max - y_min]))
+    renderer = p.image(image='image', x='x', y='y', dw='dw', dh='dh',
+                       color_mapper=color_mapper, source=source, **kwargs)
+    return renderer, source
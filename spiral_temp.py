@@ -7,8 +7,9 @@ from bokeh.models import ColumnDataSource, Div, GlobalInlineStyleSheet
 from bokeh.layouts import column
 from matplotlib import cm
 from matplotlib.colors import to_hex
-import math, time
-import xarray as xr
+import math
+
+from climate_data import monthly_anomaly_series
 
 rdblue = [to_hex(cm.get_cmap('RdYlBu_r')(i/255)) for i in range(256)]
 gstyle = GlobalInlineStyleSheet(css=""" html, body, .bk, .bk-root {background-color: #343838; margin: 0; padding: 0; height: 100%; color: white; font-family: 'Consolas', 'Courier New', monospace; } .bk { color: white; } .bk-input, .bk-btn, .bk-select, .bk-slider-title, .bk-headers, .bk-label, .bk-title, .bk-legend, .bk-axis-label { color: white !important; } .bk-input::placeholder { color: #aaaaaa !important; } """)
@@ -20,83 +21,82 @@ months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
           'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
 # Create seasonal temperature pattern with random variation
-base_temps = [12,15, 12, 18, 24, 18, 30, 29, 15, 18, 10, 4]  # Seasonal pattern
-temp_data = []
-
-for year in years:
-    year_temps = []
-    for i, month in enumerate(months):
-        # Add random variation and slight warming trend over years
-        temp_variation = np.random.normal(0, 3)
-        warming_trend = (year - 1979) * 0.2  # Slight warming over time
-        temp = base_temps[i] + temp_variation + warming_trend
-        year_temps.append(temp)
-    temp_data.append(year_temps)
+base_temps = np.array([12,15, 12, 18, 24, 18, 30, 29, 15, 18, 10, 4])  # Seasonal pattern
+# Add random variation and slight warming trend over years, as a (years, 12) table
+temp_variation = np.random.normal(0, 3, size=(len(years), len(months)))
+warming_trend = (np.array(years) - 1979)[:, None] * 0.2  # Slight warming over time
+temp_data = base_temps + temp_variation + warming_trend
 #<<<<<<<<<<#
 
+
+def year_table(series, years):
+    """
+    Arrange a monthly DataArray into a (len(years), 12) array, one row per
+    year; months missing from the series stay NaN.
+    """
+    table = np.full((len(years), 12), np.nan)
+    row = series['time.year'].values - years[0]
+    month = series['time.month'].values - 1
+    keep = (row >= 0) & (row < len(years))
+    table[row[keep], month[keep]] = series.values[keep]
+    return table
+
+
+def build_spiral(year_values, years, points_per_year, min_temp, max_temp, inner_radius, outer_radius):
+    """
+    Spiral points for a (n_years, n_per_year) table of values (12 for monthly
+    data, or daily rows), as a DataFrame with year, temperature, angle,
+    year_progress, radius, x and y columns, points_per_year rows per year.
+
+    Every year is resampled at once: each point interpolates linearly between
+    the two samples around it, the last sample wrapping to the same year's
+    first, exactly as the original per-point loop did.
+    """
+    year_values = np.asarray(year_values, dtype=float)
+    n_years, n_per_year = year_values.shape
+    progress = np.arange(points_per_year) / points_per_year  # 0 to 1 progress through the year
+    sample = progress * n_per_year
+    index = sample.astype(int) % n_per_year
+    fraction = sample - sample.astype(int)
+
+    # Smooth temperature interpolation, all years in one gather
+    current = year_values[:, index]
+    temperature = current + (year_values[:, (index + 1) % n_per_year] - current) * fraction
+    angle = np.broadcast_to(progress * 2 * np.pi, temperature.shape)  # Full circle
+
+    # Normalize temperature for radius, then polar to cartesian
+    radius = inner_radius + (temperature - min_temp) / (max_temp - min_temp) * (outer_radius - inner_radius)
+    return pd.DataFrame({
+        'year': np.repeat(years, points_per_year),
+        'temperature': temperature.ravel(),
+        'angle': angle.ravel(),
+        'year_progress': (np.arange(n_years)[:, None] + progress).ravel(),
+        'radius': radius.ravel(),
+        'x': (radius * np.cos(angle)).ravel(),
+        'y': (radius * np.sin(angle)).ravel(),
+    })
+
 # === Load and process data ===
 
 # find the link to download the nc file in bokeh_showcases/assets0/tempera5.txt
-ds = xr.open_dataset('/home/michael/REtemperature_monthly-mean_era5_1979-2024_v1.0.nc')['temperature_monthly-mean']
-# ds = ds.sel(lat=slice(35, 72), lon=slice(-30, 50))
-spatial_avg0 = ds.weighted(np.cos(np.deg2rad(ds.lat))).mean(( 'lat',"lon"))
-spatial_avg = spatial_avg0.groupby('time.month') - spatial_avg0.groupby('time.month').mean('time')
-
-# Group by year, then for each year extract the 12 monthly values
+# The file is opened in dask chunks and only its area-weighted monthly anomaly is
+# computed, once per file version; later sessions read it from assets0/climate_cache
+spatial_avg = monthly_anomaly_series('/home/michael/REtemperature_monthly-mean_era5_1979-2024_v1.0.nc',
+                                     'temperature_monthly-mean',
+                                     # region=dict(lat=slice(35, 72), lon=slice(-30, 50)),
+                                     )['anomaly']
+
+# One row of 12 monthly values per year
 years = np.arange(1979, 2025)
-output = []
+temp_data = year_table(spatial_avg, years)
 
-for year in years:
-    # Select data for this year
-    mask = spatial_avg['time.year'] == year
-    year_data = spatial_avg.sel(time=mask)
-    # Extract data as a list, ensure it's length 12
-    monthsq = year_data.values.tolist()
-    # Handle missing months: pad with np.nan if less than 12
-    if len(monthsq) < 12:
-        monthsq += [np.nan] * (12 - len(monthsq))
-    output.append(monthsq)
-
-
-temp_data = output
 # Create smooth spiral data with more points per year
 points_per_year = 48  # smoothinhg factor, more points for smoother spiral
-df_data = []
-
-for i, year in enumerate(years):
-    year_temps = temp_data[i]
-    # Create smooth interpolation within the year
-    for j in range(points_per_year):
-        progress = j / points_per_year  # 0 to 1 progress through the year
-        angle = progress * 2 * math.pi  # Full circle
-        
-        # Smooth temperature interpolation
-        month_float = progress * 12
-        month_index = int(month_float) % 12
-        month_fraction = month_float - int(month_float)
-        
-        # Interpolate between current and next month's temperature
-        current_temp = year_temps[month_index]
-        next_temp = year_temps[(month_index + 1) % 12]
-        temperature = current_temp + (next_temp - current_temp) * month_fraction
-        
-        df_data.append({
-            'year': year,
-            'temperature': temperature,
-            'angle': angle,
-            'year_progress': i + progress
-        })
-
-df = pd.DataFrame(df_data)
 
 # Normalize temperature for radius and create color mapping based on radius
-min_temp, max_temp = -1,1#df['temperature'].min(), df['temperature'].max()
+min_temp, max_temp = -1,1#np.nanmin(temp_data), np.nanmax(temp_data)
 inner_radius, outer_radius = 20, 100
-df['radius'] = inner_radius + (df['temperature'] - min_temp) / (max_temp - min_temp) * (outer_radius - inner_radius)
-
-# Convert polar to cartesian coordinates
-df['x'] = df['radius'] * np.cos(df['angle'])
-df['y'] = df['radius'] * np.sin(df['angle'])
+df = build_spiral(temp_data, years, points_per_year, min_temp, max_temp, inner_radius, outer_radius)
 
 # Create figure centered at origin
 p = figure(width=800, height=800,
@@ -172,50 +172,57 @@ year_label = Label(x=0, y=0, text="1979",
                     background_fill_color=None)
 
 p.add_layout(year_label)
+
+# Plain arrays for the animation: each tick reads one point and streams one segment
+spiral_x = df['x'].to_numpy()
+spiral_y = df['y'].to_numpy()
+spiral_radius = df['radius'].to_numpy()
+spiral_temperature = df['temperature'].to_numpy()
+spiral_year = df['year'].to_numpy()
+
+loop_pause_ms = 3000  # pause on the finished spiral before starting over
+
 def animate():
     global current_index
     
     if current_index < len(df):
-        # Get data up to current point
-        current_data = df.iloc[:current_index + 1]
+        i = current_index
         
-        # Create line segments for color mapping
-        if len(current_data) > 1:
-            x0_vals = current_data['x'].iloc[:-1].tolist()
-            y0_vals = current_data['y'].iloc[:-1].tolist()
-            x1_vals = current_data['x'].iloc[1:].tolist()
-            y1_vals = current_data['y'].iloc[1:].tolist()
-            radius_vals = current_data['radius'].iloc[1:].tolist()  # Use radius for coloring
-            
-            # Update spiral segments
-            segment_source.data = {
-                'x0': x0_vals,
-                'y0': y0_vals,
-                'x1': x1_vals,
-                'y1': y1_vals,
-                'radius': radius_vals
-            }
+        # Append the segment ending at this point (colored by its end radius)
+        if i > 0:
+            segment_source.stream({
+                'x0': [spiral_x[i - 1]],
+                'y0': [spiral_y[i - 1]],
+                'x1': [spiral_x[i]],
+                'y1': [spiral_y[i]],
+                'radius': [spiral_radius[i]]
+            })
         
         # Update current position marker
-        current_point = df.iloc[current_index]
         current_point_source.data = {
-            'x': [current_point['x']],
-            'y': [current_point['y']],
-            'temperature': [current_point['temperature']]
+            'x': [spiral_x[i]],
+            'y': [spiral_y[i]],
+            'temperature': [spiral_temperature[i]]
         }
         
         # Update year display
-        current_year = current_point['year']
-        year_label.text = f"{int(current_year)}"
+        year_label.text = f"{int(spiral_year[i])}"
         current_index += 1
         
         # Reset animation when complete  <---- uncomment to enable automatic looping
         if current_index >= len(df):
-            time.sleep(3)
-            current_index = 0
+            # Pause without blocking the server: stop ticking and restart from a timeout
+            curdoc().remove_periodic_callback(animation_callback)
+            curdoc().add_timeout_callback(restart, loop_pause_ms)
+
+def restart():
+    global current_index, animation_callback
+    current_index = 0
+    segment_source.data = dict(x0=[], y0=[], x1=[], y1=[], radius=[])
+    animation_callback = curdoc().add_periodic_callback(animate, animation_speed)
 
 # Add animation callback
-curdoc().add_periodic_callback(animate, animation_speed)
+animation_callback = curdoc().add_periodic_callback(animate, animation_speed)
 gradient_text = """
 <div style="
     font-size: 28px;
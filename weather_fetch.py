@@ -0,0 +1,268 @@
+"""
+weather_fetch - Concurrent OpenWeatherMap fetcher for WM_app
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OWM_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+# Fields written into the ColumnDataSource, and the value used when a city fails
+READING_FIELDS = ("cloud", "temp", "humidity", "pressure")
+EMPTY_READING = dict.fromkeys(READING_FIELDS, 0)
+
+
+def parse_reading(data):
+    """Pick cloud/temp/humidity/pressure out of an OpenWeatherMap JSON reply."""
+    main = data.get("main", {})
+    return {
+        "cloud": data.get("clouds", {}).get("all", 0),
+        "temp": main.get("temp", 0),
+        "humidity": main.get("humidity", 0),
+        "pressure": main.get("pressure", 0),
+    }
+
+
+class RequestsTransport:
+    """
+    Default transport: one pooled ``requests.Session`` shared by every fetch.
+
+    A transport is any callable ``transport(params, timeout) -> dict``, so a
+    local stub server only needs a different ``url``:
+
+        RequestsTransport(url="http://127.0.0.1:8765/data/2.5/weather")
+    """
+
+    def __init__(self, url=OWM_URL, pool_size=16):
+        self.url = url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __call__(self, params, timeout):
+        response = self.session.get(self.url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+class WeatherFetcher:
+    """
+    Fetch current weather for many cities with bounded concurrency.
+
+    Args:
+        api_key: OpenWeatherMap API key
+        transport: Callable ``(params, timeout) -> dict`` (default: pooled requests session)
+        max_workers: Maximum number of requests in flight at once
+        timeout: Per-request timeout in seconds
+
+    Example:
+        fetcher = WeatherFetcher(API_KEY, max_workers=16, timeout=5)
+        readings = fetcher.fetch_all(cities)   # blocking, from a worker thread
+        fetcher.refresh(curdoc(), cities, apply_readings)   # non-blocking
+    """
+
+    def __init__(self, api_key, transport=None, max_workers=16, timeout=5.0):
+        self.api_key = api_key
+        self.transport = transport or RequestsTransport(pool_size=max_workers)
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix="weather-fetch")
+        self._lock = threading.Lock()
+        self._in_flight = False
+
+    def fetch_reading(self, city):
+        """Return the reading for one city; transport errors propagate."""
+        params = {
+            "lat": city["lat"],
+            "lon": city["lon"],
+            "appid": self.api_key,
+            "units": "metric",
+        }
+        return parse_reading(self.transport(params, self.timeout))
+
+    def fetch_one(self, city):
+        """Return the reading for one city, or ``EMPTY_READING`` on any error."""
+        try:
+            return self.fetch_reading(city)
+        except Exception:
+            return dict(EMPTY_READING)
+
+    def fetch_all(self, cities):
+        """Fetch every city through the pool; readings come back in ``cities`` order."""
+        return list(self.executor.map(self.fetch_one, cities))
+
+    def refresh(self, doc, cities, apply):
+        """
+        Fetch ``cities`` off the Bokeh server thread, then call ``apply(readings)``
+        once, inside a single ``next_tick`` callback on ``doc``.
+
+        Returns False (and does nothing) if the previous refresh is still running,
+        so a slow upstream never piles up overlapping refreshes.
+        """
+        with self._lock:
+            if self._in_flight:
+                return False
+            self._in_flight = True
+
+        def run():
+            try:
+                readings = self.fetch_all(cities)
+            finally:
+                with self._lock:
+                    self._in_flight = False
+            doc.add_next_tick_callback(partial(apply, readings))
+
+        threading.Thread(target=run, name="weather-refresh", daemon=True).start()
+        return True
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        if hasattr(self.transport, "close"):
+            self.transport.close()
+
+
+def city_key(city):
+    """Cache key for a city: its (lat, lon) rounded to ~10 m."""
+    return round(city["lat"], 4), round(city["lon"], 4)
+
+
+class WeatherCache:
+    """
+    Process-wide weather cache keyed by (lat, lon) with TTL eviction and
+    single-flight deduplication.
+
+    Every session reads through the same cache, so the upstream request rate
+    is one per city per ``ttl`` no matter how many viewers are connected.
+    When several sessions ask for a city that is already being fetched, they
+    all wait on the same in-flight request instead of issuing their own.
+    Failed fetches are returned as ``EMPTY_READING`` but never cached.
+
+    Args:
+        fetcher: WeatherFetcher used for cache misses
+        ttl: Seconds a reading stays fresh
+    """
+
+    def __init__(self, fetcher, ttl=60.0, clock=time.monotonic):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}   # key -> (expires_at, reading)
+        self._pending = {}   # key -> Future of an in-flight fetch
+        self._in_flight = set()   # docs with a refresh still running
+        self.hits = 0        # served from a fresh entry
+        self.misses = 0      # triggered an upstream request
+        self.coalesced = 0   # joined another caller's in-flight request
+
+    def _fetch(self, key, city, future):
+        try:
+            reading = self.fetcher.fetch_reading(city)
+        except Exception:
+            reading = None
+        with self._lock:
+            del self._pending[key]
+            if reading is not None:
+                self._entries[key] = (self.clock() + self.ttl, reading)
+        future.set_result(reading if reading is not None else dict(EMPTY_READING))
+
+    def _evict_expired(self, now):
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def get_many(self, cities):
+        """Return readings for ``cities`` (in order), fetching only stale or missing ones.
+
+        Blocks until every miss is resolved, so call it from a worker thread.
+        """
+        readings = [None] * len(cities)
+        waiting = {}
+        to_fetch = []
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            for i, city in enumerate(cities):
+                key = city_key(city)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    readings[i] = entry[1]
+                elif key in self._pending:
+                    self.coalesced += 1
+                    waiting[i] = self._pending[key]
+                else:
+                    self.misses += 1
+                    future = Future()
+                    self._pending[key] = future
+                    waiting[i] = future
+                    to_fetch.append((key, city, future))
+        for key, city, future in to_fetch:
+            self.fetcher.executor.submit(self._fetch, key, city, future)
+        wait(waiting.values())
+        for i, future in waiting.items():
+            readings[i] = future.result()
+        return readings
+
+    def refresh(self, doc, cities, apply):
+        """
+        Resolve ``cities`` through the cache off the server thread, then call
+        ``apply(readings)`` in one ``next_tick`` callback on ``doc``.
+
+        Returns False (and does nothing) if the previous refresh for ``doc`` is
+        still running, as ``WeatherFetcher.refresh`` does. The guard is per
+        document, so one session waiting on a slow upstream never skips
+        another session's refresh.
+        """
+        with self._lock:
+            if doc in self._in_flight:
+                return False
+            self._in_flight.add(doc)
+
+        def run():
+            try:
+                readings = self.get_many(cities)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(doc)
+            doc.add_next_tick_callback(partial(apply, readings))
+
+        threading.Thread(target=run, name="weather-cache-refresh", daemon=True).start()
+        return True
+
+    def stats(self):
+        """Snapshot of the hit/miss counters and current cache size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+                "in_flight": len(self._pending),
+            }
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_cache(api_key, ttl=60.0, max_workers=16, timeout=5.0):
+    """
+    Return the process-wide WeatherCache, creating it on first use.
+
+    ``bokeh serve`` re-runs the app script for every session but imports this
+    module only once per process, so all sessions share the same cache.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            fetcher = WeatherFetcher(api_key, max_workers=max_workers, timeout=timeout)
+            _shared_cache = WeatherCache(fetcher, ttl=ttl)
+        return _shared_cache